@@ -0,0 +1,33 @@
+"""Add composite indexes for job listing and cleanup
+Revision ID: b7e4c2a91d53
+Revises: a17b877b1ff5
+Create Date: 2026-10-19 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4c2a91d53'
+down_revision = 'a17b877b1ff5'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index(
+        'ix_jobs_user_id_created_at',
+        'jobs',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_jobs_status_completed_at',
+        'jobs',
+        ['status', 'completed_at'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_jobs_status_completed_at', table_name='jobs')
+    op.drop_index('ix_jobs_user_id_created_at', table_name='jobs')
@@ -0,0 +1,36 @@
+"""Add dedup_key and source_job_id to jobs for duplicate coalescing
+Revision ID: c3f1d8e2a6b4
+Revises: b7e4c2a91d53
+Create Date: 2026-10-19 10:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f1d8e2a6b4'
+down_revision = 'b7e4c2a91d53'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('dedup_key', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('source_job_id', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_jobs_dedup_key', ['dedup_key'], unique=False)
+        batch_op.create_index('ix_jobs_source_job_id', ['source_job_id'], unique=False)
+        batch_op.create_foreign_key(
+            'fk_jobs_source_job_id_jobs',
+            'jobs',
+            ['source_job_id'], ['id'],
+            ondelete='SET NULL',
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_jobs_source_job_id_jobs', type_='foreignkey')
+        batch_op.drop_index('ix_jobs_source_job_id')
+        batch_op.drop_index('ix_jobs_dedup_key')
+        batch_op.drop_column('source_job_id')
+        batch_op.drop_column('dedup_key')
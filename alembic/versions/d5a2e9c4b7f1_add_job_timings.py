@@ -0,0 +1,21 @@
+"""Add timings JSON column to jobs
+Revision ID: d5a2e9c4b7f1
+Revises: c3f1d8e2a6b4
+Create Date: 2026-10-19 11:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a2e9c4b7f1'
+down_revision = 'c3f1d8e2a6b4'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('jobs', sa.Column('timings', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('jobs', 'timings')
@@ -0,0 +1,21 @@
+"""Add tts_fallbacks JSON column to jobs
+Revision ID: e8b3f1a6c2d9
+Revises: d5a2e9c4b7f1
+Create Date: 2026-10-19 15:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b3f1a6c2d9'
+down_revision = 'd5a2e9c4b7f1'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('jobs', sa.Column('tts_fallbacks', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('jobs', 'tts_fallbacks')
@@ -0,0 +1,21 @@
+"""Add chapters JSON column to jobs
+Revision ID: f2c7a9d4e1b3
+Revises: e8b3f1a6c2d9
+Create Date: 2026-10-19 18:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c7a9d4e1b3'
+down_revision = 'e8b3f1a6c2d9'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('jobs', sa.Column('chapters', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('jobs', 'chapters')
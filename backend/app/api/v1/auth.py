@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.schemas import User, UserCreate, UserUpdate
 from app.services.auth import get_current_user, get_mock_user
-from app.services.user import UserService
+from app.services.user import AsyncUserService
 
 router = APIRouter()
 
@@ -35,14 +35,14 @@ async def get_current_user_info(
 async def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Allows the authenticated user to update their own profile information,
     such as first name and last name.
     """
-    user_service = UserService(db)
-    return user_service.update_user(current_user.id, user_update)
+    user_service = AsyncUserService(db)
+    return await user_service.update_user(current_user.id, user_update)
 
 
 @router.post(
@@ -51,7 +51,7 @@ async def update_current_user(
     description="Identifies or creates a user in the local database. For the base pipeline, this is a simplified mock authentication.",
 )
 async def verify_token(
-    token: str = Body(..., embed=True), db: Session = Depends(get_db)
+    token: str = Body(..., embed=True), db: AsyncSession = Depends(get_async_db)
 ):
     """
     Verifies a token and returns the corresponding user profile.
@@ -60,8 +60,8 @@ async def verify_token(
     """
     try:
         user_data = get_mock_user(token)
-        user_service = UserService(db)
-        user = user_service.get_or_create_user(user_data)
+        user_service = AsyncUserService(db)
+        user = await user_service.get_or_create_user(user_data)
         return {"user": user}
     except Exception as e:
         raise HTTPException(
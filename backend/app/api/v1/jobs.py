@@ -1,22 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from loguru import logger
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.config import settings
-from app.schemas import Job, JobCreate, JobUpdate, JobStatus, VoiceProvider, ConversionMode, User
+from app.core.metrics import record_cache_lookup
+from app.schemas import Job, JobCreate, JobUpdate, JobStatus, VoiceProvider, ConversionMode, TTSFallback, User
 from app.services.auth import get_current_user
-from app.services.job import JobService
+from app.services.cancellation import cancellation_store
+from app.services.job import AsyncJobService, job_dedup_key
+from app.services.job_sizing import estimate_job_size
+from app.services.progress import progress_store
 from app.services.storage import StorageService
 try:
-    from worker.tasks import process_pdf_task
+    # Sends tasks by name; does not import the worker's pipeline
+    from worker.producer import enqueue_pdf_processing, revoke_pdf_processing
 except ImportError:
     # Mock for testing
-    process_pdf_task = None
+    enqueue_pdf_processing = None
+    revoke_pdf_processing = None
 
 router = APIRouter()
 
 
+def _parse_fallback_voices(value: Optional[str]) -> Optional[List[TTSFallback]]:
+    """Parse "provider:voice,provider" into TTSFallback entries, in order."""
+    if not value or not value.strip():
+        return None
+    fallbacks = []
+    for entry in value.split(","):
+        provider, _, voice = entry.strip().partition(":")
+        try:
+            fallbacks.append(TTSFallback(provider=provider.strip(), voice_type=voice.strip() or "default"))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid fallback voice '{entry.strip()}'. Use provider:voice, e.g. azure:en-US-JennyNeural",
+            )
+    return fallbacks
+
+
+def _presign_audio(job, storage_service: StorageService) -> None:
+    """Replace a completed job's audio URLs, including each chapter's, with presigned ones."""
+    job.audio_s3_url = storage_service.generate_presigned_url(job.audio_s3_key)
+    if job.chapters:
+        job.chapters = [
+            dict(chapter, audio_s3_url=storage_service.generate_presigned_url(chapter["audio_s3_key"]))
+            for chapter in job.chapters
+        ]
+
+
+async def _stop_run(job_id: int) -> None:
+    """Raise a run's cancellation flag and revoke its queued task."""
+    # Redis and the broker are blocking clients: keep them off the event loop
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, cancellation_store.request, job_id)
+    if revoke_pdf_processing:
+        await loop.run_in_executor(None, revoke_pdf_processing, job_id)
+
+
+def _queue_handed_over_run(job_id: int, heir) -> None:
+    """Queue the job that took over `job_id`'s run, from the start."""
+    if enqueue_pdf_processing:
+        # The original's size tier is not stored; time slicing covers a long book on the default one
+        logger.info(f"Job {heir.id} takes over the run of job {job_id}")
+        enqueue_pdf_processing(heir.id)
+
+
 @router.post(
     "/",
     response_model=Job,
@@ -42,8 +95,12 @@ async def create_job(
     conversion_mode: ConversionMode = Form(
         ConversionMode.full, description="Conversion mode: 'full' for word-for-word or 'summary_explanation' for core concepts explanation."
     ),
+    fallback_voices: Optional[str] = Form(
+        None,
+        description="Comma-separated provider:voice pairs tried in order when the chosen provider fails (e.g. 'azure:en-US-JennyNeural,google').",
+    ),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # Security: Validate file upload
     if not file.filename:
@@ -78,6 +135,7 @@ async def create_job(
 
     # Reset file pointer for storage service
     await file.seek(0)
+
     """
     Creates a new job by uploading a PDF and specifying conversion options.
 
@@ -90,11 +148,7 @@ async def create_job(
     The endpoint first validates the user's credits, uploads the file to S3, creates a job record in the database, and finally queues a background task to perform the conversion.
     """
     # Job creation for base pipeline (no credit checks)
-    job_service = JobService(db)
-    storage_service = StorageService()
-    pdf_s3_key = f"pdfs/{current_user.id}/{file.filename}"
-    pdf_s3_url = await storage_service.upload_file(file, pdf_s3_key)
-
+    job_service = AsyncJobService(db)
     job_data = JobCreate(
         original_filename=file.filename or "unknown.pdf",
         voice_provider=voice_provider,
@@ -102,11 +156,39 @@ async def create_job(
         reading_speed=reading_speed,
         include_summary=include_summary,
         conversion_mode=conversion_mode,
+        tts_fallbacks=_parse_fallback_voices(fallback_voices),
     )
-    job = job_service.create_job(current_user.id, job_data, pdf_s3_key, pdf_s3_url)
 
-    if process_pdf_task and hasattr(process_pdf_task, 'delay'):
-        process_pdf_task.delay(job.id)
+    # Hashing and PDF parsing are CPU-bound, so keep them off the event loop
+    loop = asyncio.get_running_loop()
+
+    # An identical upload (same content and options) shares the existing run
+    dedup_key = None
+    if settings.JOB_DEDUP_ENABLED:
+        dedup_key = await loop.run_in_executor(None, job_dedup_key, file_content, job_data)
+        source_job = await job_service.find_reusable_job(dedup_key)
+        record_cache_lookup("job_dedup", hit=source_job is not None)
+        if source_job:
+            job = await job_service.create_coalesced_job(current_user.id, job_data, source_job)
+            logger.info(f"Job {job.id} coalesced onto identical job {source_job.id}")
+            return job
+
+    # Pick the worker queue from the estimated job size
+    size_tier = await loop.run_in_executor(
+        None, estimate_job_size, file_content, conversion_mode
+    )
+
+    storage_service = StorageService()
+    pdf_s3_key = f"pdfs/{current_user.id}/{file.filename}"
+    pdf_s3_url = await storage_service.upload_file(file, pdf_s3_key)
+
+    job = await job_service.create_job(
+        current_user.id, job_data, pdf_s3_key, pdf_s3_url, dedup_key=dedup_key
+    )
+
+    if enqueue_pdf_processing:
+        logger.info(f"Queueing job {job.id} as {size_tier}")
+        enqueue_pdf_processing(job.id, size_tier)
 
     return job
 
@@ -115,29 +197,46 @@ async def create_job(
     "/",
     response_model=List[Job],
     summary="List All Jobs for Current User",
-    description="Retrieves a paginated list of all PDF conversion jobs created by the currently authenticated user.",
+    description="Retrieves a paginated list of all PDF conversion jobs created by the currently authenticated user. Supports offset (`skip`) and keyset (`cursor`) pagination.",
 )
 async def get_user_jobs(
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
 ):
     """
     Fetches a list of jobs for the current user.
 
-    - **skip**: Number of jobs to skip for pagination.
+    - **skip**: Number of jobs to skip for pagination (offset mode).
     - **limit**: Maximum number of jobs to return.
+    - **cursor**: Opaque cursor from a previous page's `X-Next-Cursor` header (keyset mode, `skip` is ignored).
+
+    When more jobs are available, the cursor for the next page is returned in the `X-Next-Cursor` response header.
     """
-    job_service = JobService(db)
-    jobs = job_service.get_user_jobs(current_user.id, skip=skip, limit=limit)
+    job_service = AsyncJobService(db)
+    if cursor:
+        try:
+            jobs, next_cursor = await job_service.get_user_jobs_page(
+                current_user.id, cursor=cursor, limit=limit
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    else:
+        jobs = await job_service.get_user_jobs(current_user.id, skip=skip, limit=limit)
+        next_cursor = job_service.encode_cursor(jobs[-1]) if jobs and len(jobs) == limit else None
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     # Generate presigned URLs for completed jobs
     storage_service = StorageService()
     for job in jobs:
         
         if job.status == JobStatus.completed and job.audio_s3_key:
-            job.audio_s3_url = storage_service.generate_presigned_url(job.audio_s3_key)
+            _presign_audio(job, storage_service)
             
     return jobs
 
@@ -151,15 +250,15 @@ async def get_user_jobs(
 async def get_job(
     job_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Fetches a single job by its unique ID.
 
     - **job_id**: The ID of the job to retrieve.
     """
-    job_service = JobService(db)
-    job = job_service.get_user_job(current_user.id, job_id)
+    job_service = AsyncJobService(db)
+    job = await job_service.get_user_job(current_user.id, job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
@@ -167,8 +266,7 @@ async def get_job(
     
     # Generate presigned URL if completed
     if job.status == JobStatus.completed and job.audio_s3_key:
-        storage_service = StorageService()
-        job.audio_s3_url = storage_service.generate_presigned_url(job.audio_s3_key)
+        _presign_audio(job, StorageService())
         
     return job
 
@@ -183,7 +281,7 @@ async def update_job_manual(
     job_id: int,
     job_update: JobUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Manually updates a job's status, progress, or error message.
@@ -191,14 +289,56 @@ async def update_job_manual(
     - **job_id**: The ID of the job to update.
     - **job_update**: A JSON body with the fields to update.
     """
-    job_service = JobService(db)
-    job = job_service.get_user_job(current_user.id, job_id)
+    job_service = AsyncJobService(db)
+    job = await job_service.get_user_job(current_user.id, job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
         )
 
-    return job_service.update_job(job_id, job_update.model_dump(exclude_unset=True))
+    return await job_service.update_job(job_id, job_update.model_dump(exclude_unset=True))
+
+
+@router.post(
+    "/{job_id}/cancel",
+    response_model=Job,
+    summary="Cancel a Job",
+    description="Cancels a pending or processing job. A queued job is dropped; a running job stops at its next chunk, OCR page or LLM call.",
+)
+async def cancel_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Marks the job cancelled, raises its cancellation flag for the worker and
+    revokes its queued task.
+
+    Cancelling a job that shares another job's run (`source_job_id`) only
+    detaches it. Cancelling the original stops its run; jobs that were
+    sharing it, possibly other users', get a run of their own instead.
+    """
+    job_service = AsyncJobService(db)
+    job = await job_service.get_user_job(current_user.id, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    if job.status not in (JobStatus.pending, JobStatus.processing):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job cannot be cancelled in status '{getattr(job.status, 'value', job.status)}'",
+        )
+
+    heir = await job_service.cancel_job(job)
+
+    if job.source_job_id is None:
+        await _stop_run(job.id)
+        logger.info(f"Cancellation requested for job {job.id}")
+    if heir is not None:
+        _queue_handed_over_run(job.id, heir)
+
+    return job
 
 
 @router.get(
@@ -209,7 +349,7 @@ async def update_job_manual(
 async def get_job_status(
     job_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Provides a quick way to check the status of a job without fetching all its details.
@@ -218,8 +358,8 @@ async def get_job_status(
 
     Returns the status, progress percentage, and the final audio URL if completed.
     """
-    job_service = JobService(db)
-    job = job_service.get_user_job(current_user.id, job_id)
+    job_service = AsyncJobService(db)
+    job = await job_service.get_user_job(current_user.id, job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
@@ -230,10 +370,21 @@ async def get_job_status(
         storage_service = StorageService()
         audio_url = storage_service.generate_presigned_url(job.audio_s3_key)
 
+    # Progress is written behind to the DB; the fast store holds the latest tick
+    progress = job.progress_percentage
+    if job.status == JobStatus.processing:
+        # Coalesced jobs report the progress of the run they share
+        loop = asyncio.get_running_loop()
+        cached_progress = await loop.run_in_executor(
+            None, progress_store.get, job.source_job_id or job.id
+        )
+        if cached_progress is not None:
+            progress = max(cached_progress, progress or 0)
+
     return {
         "job_id": job.id,
         "status": job.status,
-        "progress_percentage": job.progress_percentage,
+        "progress_percentage": progress,
         "error_message": job.error_message,
         "audio_url": audio_url,
         "estimated_cost": job.estimated_cost,
@@ -247,14 +398,14 @@ async def get_job_status(
 )
 async def cleanup_failed_jobs(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Cleans up all failed jobs for the user.
     Returns the count of deleted jobs.
     """
-    job_service = JobService(db)
-    count = job_service.cleanup_failed_jobs(current_user.id)
+    job_service = AsyncJobService(db)
+    count = await job_service.cleanup_failed_jobs(current_user.id)
     return {"message": f"Successfully cleaned up {count} failed/cancelled jobs", "deleted_count": count}
 
 
@@ -267,19 +418,30 @@ async def cleanup_failed_jobs(
 async def delete_job(
     job_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Deletes a single job by ID.
+
+    Deleting an original job that others (possibly other users') share
+    hands its run over to them rather than failing them.
     """
-    job_service = JobService(db)
-    success = job_service.delete_job(current_user.id, job_id)
-    
-    if not success:
+    job_service = AsyncJobService(db)
+    job = await job_service.get_user_job(current_user.id, job_id)
+    if not job:
         # We return 404 if job not found or not owned by user
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
         )
-    
+
+    runs = job.source_job_id is None and job.status in (JobStatus.pending, JobStatus.processing)
+    heir = await job_service.hand_over_run(job) if job.source_job_id is None else None
+    await job_service.delete_job(current_user.id, job_id)
+
+    if runs:
+        await _stop_run(job_id)
+    if heir is not None:
+        _queue_handed_over_run(job_id, heir)
+
     return None  # 204 No Content
 
@@ -19,14 +19,92 @@ class Settings(BaseSettings):
 
 
     TESTING_MODE: bool = False
+    # Route every synthesis to the mock TTS provider regardless of the requested
+    # one (load tests against a real stack); implied by TESTING_MODE
+    MOCK_TTS_ENABLED: bool = False
+    # Simulated per-call latency of the mock TTS provider (benchmarks, load tests)
+    MOCK_TTS_LATENCY_SECONDS: float = 0.0
 
     # Database
     DATABASE_URL: str = "sqlite:///./dev.db"
+    # Optional override for the API's async engine; derived from DATABASE_URL when unset
+    # (postgresql:// -> postgresql+asyncpg://, sqlite:/// -> sqlite+aiosqlite:///)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 30
 
     # Redis/Celery
     REDIS_URL: str = "redis://localhost:6379/0"
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5
+
+    # Job progress (write-behind: progress lives in Redis, DB row is flushed periodically)
+    PROGRESS_FLUSH_INTERVAL_SECONDS: float = 10.0
+    PROGRESS_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+
+    # Worker warm-up: TTS providers whose SDKs are preloaded before fork and
+    # whose clients are built in each pool child at startup (comma-separated)
+    WORKER_WARM_TTS_PROVIDERS: Any = []
+
+    # Job size tiers (routes process_pdf_task to the small/medium/large queue).
+    # Pages are weighted by conversion mode; file size counts as one page per
+    # JOB_SIZE_BYTES_PER_PAGE so scanned documents are sized by OCR work.
+    JOB_SIZE_SMALL_MAX_PAGES: int = 50
+    JOB_SIZE_MEDIUM_MAX_PAGES: int = 300
+    JOB_SIZE_BYTES_PER_PAGE: int = 100 * 1024
+
+    # Time-sliced tasks: process_pdf_task checkpoints and queues a continuation
+    # this many seconds before its soft time limit, leaving time to upload the
+    # finished chunks (see worker/checkpoint.py)
+    TASK_CHECKPOINT_MARGIN_SECONDS: int = 120
+
+    # Split each job across two worker queues: extract/OCR/cleanup on pdf_cpu
+    # (prefork) and LLM/TTS/assembly/upload on pdf_io (threads), so network
+    # waits do not hold a CPU worker slot. Needs workers on both queues.
+    WORKER_STAGE_QUEUES: bool = False
+
+    # Stream plain full conversions page by page: extraction, cleanup, chunking
+    # and synthesis overlap, so the first chunk is synthesized while later
+    # pages are still being read. STREAMING_QUEUE_CHUNKS bounds how far
+    # extraction may run ahead of synthesis.
+    STREAMING_PIPELINE_ENABLED: bool = False
+    STREAMING_QUEUE_CHUNKS: int = 8
+
+    # Identical uploads (same PDF content and options) reuse an in-flight or
+    # completed job's run and audio instead of being processed again
+    JOB_DEDUP_ENABLED: bool = True
+
+    # Synthesize a job's chunks concurrently on an asyncio event loop using the
+    # providers' native async clients, instead of one blocking call at a time
+    TTS_ASYNC_SYNTHESIS: bool = False
+    TTS_ASYNC_CONCURRENCY: int = 16
+    # Hedged requests (async synthesis only): a chunk still running after the
+    # provider's recent p95 latency (at least TTS_HEDGE_MIN_DELAY_SECONDS, once
+    # TTS_HEDGE_MIN_SAMPLES are known) gets a duplicate request and the first
+    # response wins. At most TTS_HEDGE_MAX_FRACTION of a job's chunks (rounded
+    # down, across all its providers) are hedged.
+    TTS_HEDGE_ENABLED: bool = False
+    TTS_HEDGE_MAX_FRACTION: float = 0.05
+    TTS_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    TTS_HEDGE_MIN_SAMPLES: int = 20
+    # Pre-connected Azure synthesizers per worker process; unset means one per
+    # concurrent request (TTS_ASYNC_CONCURRENCY with async synthesis, else 1)
+    AZURE_SYNTHESIZER_POOL_SIZE: Optional[int] = None
+    # Per-provider circuit breaker (per worker process): opens when at least
+    # TTS_CIRCUIT_FAILURE_RATE of the last TTS_CIRCUIT_WINDOW requests failed
+    # (with TTS_CIRCUIT_MIN_REQUESTS recorded); chunks then go to the job's
+    # fallback voices until a trial request succeeds after the cooldown.
+    TTS_CIRCUIT_WINDOW: int = 20
+    TTS_CIRCUIT_MIN_REQUESTS: int = 10
+    TTS_CIRCUIT_FAILURE_RATE: float = 0.5
+    TTS_CIRCUIT_COOLDOWN_SECONDS: float = 30.0
+
+    # Prometheus metrics: /metrics on the API, and an HTTP exporter in the
+    # Celery worker (0 disables it). Prefork workers also need
+    # PROMETHEUS_MULTIPROC_DIR so child processes' metrics are aggregated.
+    METRICS_ENABLED: bool = True
+    WORKER_METRICS_PORT: int = 9808
 
     # Security
     SECRET_KEY: str = "dev-secret-key-change-in-production"
@@ -104,6 +182,14 @@ class Settings(BaseSettings):
     LLM_COST_INPUT_PER_1K: float = 0.0001
     LLM_COST_OUTPUT_PER_1K: float = 0.0004
 
+    # Current-user cache (auth identity -> User); "memory" or "redis"
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    USER_CACHE_BACKEND: str = "memory"
+
+    # Cleanup (batched, set-based deletes)
+    CLEANUP_BATCH_SIZE: int = 2000
+    S3_DELETE_CONCURRENCY: int = 4
+
     # File upload limits
     MAX_FILE_SIZE_MB: int = 50
     ALLOWED_FILE_TYPES: Any = ["application/pdf"]
@@ -117,7 +203,7 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
 
-    @field_validator("ALLOWED_HOSTS", "ALLOWED_FILE_TYPES", mode="before")
+    @field_validator("ALLOWED_HOSTS", "ALLOWED_FILE_TYPES", "WORKER_WARM_TTS_PROVIDERS", mode="before")
     @classmethod
     def parse_env_list(cls, v: Any) -> List[str]:
         """Parse comma-separated strings from environment variables into lists."""
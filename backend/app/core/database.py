@@ -1,8 +1,28 @@
+from typing import AsyncIterator, Optional
+
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
 
+
+def get_async_database_url(database_url: str) -> Optional[str]:
+    """
+    Map a sync DATABASE_URL onto its async driver (asyncpg for Postgres, aiosqlite for SQLite).
+    Returns None for databases without a supported async driver.
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    if database_url.startswith("postgresql+asyncpg://") or database_url.startswith("sqlite+aiosqlite://"):
+        return database_url
+    if database_url.startswith("postgresql://") or database_url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + database_url.split("://", 1)[1]
+    if database_url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + database_url.split("://", 1)[1]
+    return None
+
+
 # Create engine only if DATABASE_URL is available
 if settings.DATABASE_URL:
     connect_args = {}
@@ -14,16 +34,40 @@ if settings.DATABASE_URL:
         # Postgres or other engine settings
         engine = create_engine(
             settings.DATABASE_URL,
-            pool_size=20,
-            max_overflow=30,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
             pool_pre_ping=True,
             pool_recycle=3600
         )
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    # Async engine for the API routes; the Celery worker keeps using the sync engine.
+    async_database_url = get_async_database_url(settings.DATABASE_URL)
+    if async_database_url:
+        if async_database_url.startswith("sqlite"):
+            async_engine = create_async_engine(async_database_url)
+        else:
+            async_engine = create_async_engine(
+                async_database_url,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_pre_ping=True,
+                pool_recycle=3600
+            )
+        # expire_on_commit=False: attributes must stay loaded after commit, since
+        # lazy loads are not possible outside an awaited call.
+        AsyncSessionLocal = async_sessionmaker(
+            bind=async_engine, autoflush=False, expire_on_commit=False
+        )
+    else:
+        async_engine = None
+        AsyncSessionLocal = None
 else:
     # Placeholder for when DATABASE_URL is not available (e.g., during build)
     engine = None
     SessionLocal = None
+    async_engine = None
+    AsyncSessionLocal = None
 
 Base = declarative_base()
 
@@ -37,3 +81,10 @@ def get_db():
     finally:
         db.close()
 
+
+# Dependency to get an async DB session (used by the API routes)
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    if not AsyncSessionLocal:
+        raise RuntimeError("Async database not configured. Check DATABASE_URL environment variable.")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,56 @@
+"""
+Prometheus metrics for the API process, served at /metrics.
+
+Metric objects live at module level so any module can record into them;
+the DB pool gauges are read from the engines at scrape time.
+"""
+
+from typing import Dict, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.requests import Request
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (hit/miss)",
+    ["cache", "result"],
+)
+
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured connections in the pool", ["engine"])
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", ["engine"]
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size", ["engine"]
+)
+
+
+def route_label(request: Request) -> str:
+    """Route template (e.g. /api/v1/jobs/{job_id}) so labels stay low-cardinality."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def register_db_pool_metrics(engines: Dict[str, Optional[object]]) -> None:
+    """Expose pool usage for each engine; pools without counters (e.g. NullPool) are skipped."""
+    for name, engine in engines.items():
+        if engine is None:
+            continue
+        # AsyncEngine wraps a sync engine that owns the pool
+        pool = getattr(getattr(engine, "sync_engine", engine), "pool", None)
+        if pool is None or not hasattr(pool, "checkedout"):
+            continue
+        DB_POOL_SIZE.labels(name).set_function(pool.size)
+        DB_POOL_CHECKED_OUT.labels(name).set_function(pool.checkedout)
+        DB_POOL_OVERFLOW.labels(name).set_function(lambda pool=pool: max(pool.overflow(), 0))
@@ -0,0 +1,32 @@
+from typing import Optional
+
+import redis
+from loguru import logger
+
+from app.core.config import settings
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """
+    Return a shared Redis client for fast, non-durable state (progress, caches, flags).
+
+    Returns None in testing mode so callers fall back to their in-process store.
+    The client is created lazily and reused; each process (API worker, Celery child)
+    gets its own connection pool.
+    """
+    global _redis_client
+
+    if settings.TESTING_MODE:
+        return None
+
+    if _redis_client is None:
+        _redis_client = redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        )
+        logger.debug("Created shared Redis client")
+
+    return _redis_client
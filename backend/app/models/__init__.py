@@ -7,7 +7,9 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
+    JSON,
     Numeric,
     String,
     Text,
@@ -80,6 +82,8 @@ class Job(Base):
     audio_s3_key = Column(String(500))
     pdf_s3_url = Column(String(1000))
     audio_s3_url = Column(String(1000))
+    # Per-chapter audio [{"title", "audio_s3_key"}], when the PDF has chapters
+    chapters = Column(JSON)
 
     # Processing info
     status = Column(
@@ -101,9 +105,18 @@ class Job(Base):
         create_enum_type("conversionmode", ConversionMode, Base.metadata),
         default=ConversionMode.full,
     )
+    # Ordered [{"provider", "voice_type"}] used when voice_provider is failing
+    tts_fallbacks = Column(JSON)
     estimated_cost = Column(Numeric(10, 6), default=0.0)
     chars_processed = Column(Integer, default=0)
     tokens_used = Column(Integer, default=0)
+    # Per-stage wall/CPU time and bytes for the last run (see worker/timings.py)
+    timings = Column(JSON)
+
+    # Duplicate coalescing: hash of the PDF content and conversion options, and
+    # the earlier identical job whose run (and audio) this job shares, if any
+    dedup_key = Column(String(64), index=True)
+    source_job_id = Column(Integer, ForeignKey("jobs.id", ondelete="SET NULL"), index=True)
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -112,3 +125,9 @@ class Job(Base):
 
     # Relationships
     user = relationship("User", back_populates="jobs")
+
+
+# Composite indexes for the hot job queries: per-user listing (newest first)
+# and the nightly cleanup scan over finished jobs.
+Index("ix_jobs_user_id_created_at", Job.user_id, Job.created_at.desc())
+Index("ix_jobs_status_completed_at", Job.status, Job.completed_at)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -87,6 +87,31 @@ class User(UserBase):
 # --- Job Schemas ---
 
 
+class TTSFallback(BaseModel):
+    """A provider and voice to fall back to when the requested provider is failing."""
+
+    provider: VoiceProvider = Field(..., description="The fallback TTS provider.")
+    voice_type: str = Field(
+        "default",
+        json_schema_extra={"example": "en-US-JennyNeural"},
+        description="The voice to use from the fallback provider.",
+    )
+
+
+class JobChapter(BaseModel):
+    """Audio for one chapter of a completed job."""
+
+    title: str = Field(..., json_schema_extra={"example": "Chapter 1"}, description="The chapter title.")
+    audio_s3_key: str = Field(
+        ...,
+        json_schema_extra={"example": "audio/1/42/chapter_001.mp3"},
+        description="The S3 key for the chapter's audio file.",
+    )
+    audio_s3_url: Optional[str] = Field(
+        None, description="A temporary download URL for the chapter's audio file."
+    )
+
+
 class JobBase(BaseModel):
     """Base schema for job properties, used for creation."""
 
@@ -118,6 +143,10 @@ class JobBase(BaseModel):
         ConversionMode.full,
         description="Conversion mode: full word-for-word conversion or summary explanation of core concepts.",
     )
+    tts_fallbacks: Optional[List[TTSFallback]] = Field(
+        None,
+        description="Providers and voices tried in order for chunks the requested provider fails to synthesize.",
+    )
 
 
 class JobCreate(JobBase):
@@ -177,6 +206,10 @@ class Job(JobBase):
         json_schema_extra={"example": "https://bucket.s3.amazonaws.com/audio/1/42.mp3"},
         description="The public URL for the generated audio file.",
     )
+    chapters: Optional[List[JobChapter]] = Field(
+        None,
+        description="Audio per chapter, in order, when the PDF has an outline or chapter headings. The full audio covers every chapter.",
+    )
     status: JobStatus = Field(
         ..., json_schema_extra={"example": JobStatus.completed}, description="The current status of the job."
     )
@@ -189,6 +222,14 @@ class Job(JobBase):
     estimated_cost: float = Field(0.0, description="The estimated cost of the job.")
     chars_processed: int = Field(0, description="Total characters processed.")
     tokens_used: int = Field(0, description="Total LLM tokens used.")
+    source_job_id: Optional[int] = Field(
+        None,
+        description="Set when this job was an identical re-upload and shares the conversion (and audio) of this earlier job.",
+    )
+    timings: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Per-stage wall time, CPU time and bytes for the processing run (download, extract, ocr, cleanup, llm, chunking, tts, assembly, upload).",
+    )
     created_at: datetime = Field(..., description="Timestamp when the job was created.")
     started_at: Optional[datetime] = Field(
         None, description="Timestamp when processing started."
@@ -1,12 +1,13 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, Dict, Any
 from loguru import logger
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models import User
-from app.services.user import UserService
+from app.services.user import AsyncUserService
+from app.services.user_cache import user_cache
 
 security = HTTPBearer()
 
@@ -20,19 +21,26 @@ def get_mock_user(_token: str) -> dict:
         "last_name": "User"
     }
 
-def get_current_user(
+async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """
     Returns a default user for the base pipeline.
     """
-    user_service = UserService(db)
     user_data = {
         "email": "base@example.com",
         "first_name": "Base",
         "last_name": "User",
         "auth_provider_id": "local"
     }
-    user = user_service.get_or_create_user(user_data)
+
+    identity = user_cache.identity(user_data["auth_provider_id"], user_data["email"])
+    user = await user_cache.async_get(identity)
+    if user:
+        return user
+
+    user_service = AsyncUserService(db)
+    user = await user_service.get_or_create_user(user_data)
+    await user_cache.async_set(identity, user)
     return user
@@ -0,0 +1,68 @@
+import threading
+from typing import Set
+
+import redis
+from loguru import logger
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+
+class CancellationStore:
+    """
+    Cancellation flags shared between the API and the worker.
+
+    The API sets a job's flag; the running task polls it between chunks, OCR
+    pages and LLM calls and stops cooperatively. Redis carries the flag across
+    processes; without Redis it only works within one process (tests, dev).
+    """
+
+    KEY_PREFIX = "job_cancelled"
+
+    def __init__(self):
+        self._local: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def _key(self, job_id: int) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}"
+
+    def request(self, job_id: int) -> None:
+        with self._lock:
+            self._local.add(job_id)
+
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.set(self._key(job_id), 1, ex=settings.PROGRESS_CACHE_TTL_SECONDS)
+        except redis.RedisError as e:
+            logger.warning(f"Could not set cancellation flag for job {job_id} in Redis: {e}")
+
+    def is_requested(self, job_id: int) -> bool:
+        with self._lock:
+            if job_id in self._local:
+                return True
+
+        client = get_redis_client()
+        if client is None:
+            return False
+        try:
+            return bool(client.exists(self._key(job_id)))
+        except redis.RedisError as e:
+            logger.debug(f"Could not read cancellation flag for job {job_id} from Redis: {e}")
+            return False
+
+    def clear(self, job_id: int) -> None:
+        with self._lock:
+            self._local.discard(job_id)
+
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.delete(self._key(job_id))
+        except redis.RedisError as e:
+            logger.debug(f"Could not clear cancellation flag for job {job_id} in Redis: {e}")
+
+
+cancellation_store = CancellationStore()
@@ -1,6 +1,11 @@
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
+import asyncio
+import base64
+import hashlib
 
 from app.models import Job, User, JobStatus
 from app.schemas import JobCreate, JobUpdate
@@ -9,13 +14,83 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Statuses of a job whose run a new identical job can share
+REUSABLE_JOB_STATUSES = (JobStatus.pending, JobStatus.processing, JobStatus.completed)
+# Statuses of a job that is queued or running, or waiting on another job's run
+ACTIVE_JOB_STATUSES = (JobStatus.pending, JobStatus.processing)
+# Statuses of a job that may have left a time-slice checkpoint behind
+CHECKPOINT_JOB_STATUSES = (JobStatus.processing, JobStatus.failed, JobStatus.cancelled)
+
+
+def job_dedup_key(pdf_bytes: bytes, job_data: JobCreate) -> str:
+    """Hash of the PDF content and every option that changes the generated audio."""
+    options = (
+        getattr(job_data.voice_provider, "value", job_data.voice_provider),
+        job_data.voice_type,
+        f"{float(job_data.reading_speed):.2f}",
+        str(bool(job_data.include_summary)),
+        getattr(job_data.conversion_mode, "value", job_data.conversion_mode),
+    )
+    fallbacks = _fallbacks_json(job_data)
+    if fallbacks:
+        # Appended only when set, so keys of jobs without fallbacks are unchanged
+        options += tuple(f"{fallback['provider']}:{fallback['voice_type']}" for fallback in fallbacks)
+    digest = hashlib.sha256(pdf_bytes)
+    digest.update(b"\0" + "|".join(str(option) for option in options).encode())
+    return digest.hexdigest()
+
+
+def _fallbacks_json(job_data: JobCreate) -> Optional[List[dict]]:
+    if not job_data.tts_fallbacks:
+        return None
+    return [fallback.model_dump(mode="json") for fallback in job_data.tts_fallbacks]
+
+
+def _checkpoint_prefixes(jobs) -> List[str]:
+    """
+    Where time-sliced runs keep their state and chunk audio (see
+    worker/checkpoint.py), for the jobs that can still have a checkpoint: a
+    completed run deletes its own, and coalesced jobs never run.
+    """
+    return [
+        f"checkpoints/{job.id}/"
+        for job in jobs
+        if job.status in CHECKPOINT_JOB_STATUSES and job.source_job_id is None
+    ]
+
+
+def _promote(heir: Job, others: List[Job]) -> None:
+    """Make `heir` an original job with a run of its own, shared by `others`."""
+    heir.source_job_id = None
+    for job in [heir] + others:
+        job.status = JobStatus.pending
+        job.progress_percentage = 0
+        job.started_at = None
+    for job in others:
+        job.source_job_id = heir.id
+
+
+def _chapter_keys(chapters: Optional[List[dict]]) -> List[str]:
+    return [chapter["audio_s3_key"] for chapter in chapters or []]
+
+
+def _unshared_chapter_keys(rows, unshared_keys: List[str]) -> List[str]:
+    """Chapter files of the rows whose full audio is in `unshared_keys`; they are shared exactly when it is."""
+    unshared = set(unshared_keys)
+    return [key for row in rows if row.audio_s3_key in unshared for key in _chapter_keys(row.chapters)]
+
 
 class JobService:
     def __init__(self, db: Session):
         self.db = db
 
     def create_job(
-        self, user_id: int, job_data: JobCreate, pdf_s3_key: str, pdf_s3_url: str
+        self,
+        user_id: int,
+        job_data: JobCreate,
+        pdf_s3_key: str,
+        pdf_s3_url: str,
+        dedup_key: Optional[str] = None,
     ) -> Job:
         job = Job(
             user_id=user_id,
@@ -27,7 +102,9 @@ class JobService:
             reading_speed=job_data.reading_speed,
             include_summary=job_data.include_summary,
             conversion_mode=job_data.conversion_mode,
+            tts_fallbacks=_fallbacks_json(job_data),
             status=JobStatus.pending,
+            dedup_key=dedup_key,
         )
 
         self.db.add(job)
@@ -55,6 +132,56 @@ class JobService:
             .all()
         )
 
+    def get_user_jobs_page(
+        self, user_id: int, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Job], Optional[str]]:
+        """
+        Keyset pagination over a user's jobs, newest first.
+
+        Returns the page and an opaque cursor for the next page (None on the last page).
+        Unlike OFFSET, the cost of a page does not grow with its depth.
+        """
+        query = self.db.query(Job).filter(Job.user_id == user_id)
+
+        if cursor:
+            created_at, job_id = self.decode_cursor(cursor)
+            query = query.filter(
+                or_(
+                    Job.created_at < created_at,
+                    and_(Job.created_at == created_at, Job.id < job_id),
+                )
+            )
+
+        jobs = (
+            query.order_by(Job.created_at.desc(), Job.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        next_cursor = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            next_cursor = self.encode_cursor(jobs[-1])
+
+        return jobs, next_cursor
+
+    @staticmethod
+    def encode_cursor(job: Job) -> Optional[str]:
+        if job.created_at is None:
+            return None
+        raw = f"{job.created_at.isoformat()}|{job.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Decode a cursor produced by `encode_cursor`. Raises ValueError if it is malformed."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, job_id = raw.rsplit("|", 1)
+            return datetime.fromisoformat(created_at), int(job_id)
+        except Exception:
+            raise ValueError("Invalid pagination cursor")
+
     def update_job(self, job_id: int, job_update: dict) -> Optional[Job]:
         job = self.db.query(Job).filter(Job.id == job_id).first()
         if not job:
@@ -76,6 +203,7 @@ class JobService:
         estimated_cost: Optional[float] = None,
         chars_processed: Optional[int] = None,
         tokens_used: Optional[int] = None,
+        timings: Optional[dict] = None,
     ):
         job = self.db.query(Job).filter(Job.id == job_id).first()
         if not job:
@@ -98,42 +226,111 @@ class JobService:
         if tokens_used is not None:
             job.tokens_used = tokens_used
 
+        if timings is not None:
+            job.timings = timings
+
         if status == JobStatus.processing and not job.started_at:
             job.started_at = datetime.now()
         elif status == JobStatus.completed:
             job.completed_at = datetime.now()
             job.progress_percentage = 100
 
+        self._sync_coalesced_jobs(job)
+
         self.db.commit()
         self.db.refresh(job)
         return job
 
+    def update_job_progress(self, job_id: int, progress: int) -> None:
+        """
+        Write a running job's progress, and that of the jobs coalesced onto it,
+        without touching the status: a job cancelled or failed meanwhile is
+        left as it is.
+        """
+        self.db.query(Job).filter(
+            or_(Job.id == job_id, Job.source_job_id == job_id),
+            Job.status == JobStatus.processing,
+        ).update({Job.progress_percentage: progress}, synchronize_session=False)
+        self.db.commit()
+
+    def _sync_coalesced_jobs(self, job: Job) -> None:
+        """Mirror a job's state onto the identical jobs coalesced onto it."""
+        values = {
+            Job.status: job.status,
+            Job.progress_percentage: job.progress_percentage,
+            Job.error_message: job.error_message,
+            Job.started_at: job.started_at,
+        }
+        if job.status == JobStatus.completed:
+            values.update({
+                Job.audio_s3_key: job.audio_s3_key,
+                Job.audio_s3_url: job.audio_s3_url,
+                Job.chapters: job.chapters,
+                Job.chars_processed: job.chars_processed,
+                Job.completed_at: job.completed_at,
+            })
+
+        self.db.query(Job).filter(
+            Job.source_job_id == job.id,
+            Job.status.notin_([JobStatus.completed, JobStatus.cancelled]),
+        ).update(values, synchronize_session=False)
+
+    def _unshared_keys(self, keys: List[str], job_ids: List[int]) -> List[str]:
+        """Drop S3 keys still referenced by jobs outside `job_ids` (coalesced jobs share files)."""
+        if not keys:
+            return []
+        rows = (
+            self.db.query(Job.pdf_s3_key, Job.audio_s3_key)
+            .filter(
+                or_(Job.pdf_s3_key.in_(keys), Job.audio_s3_key.in_(keys)),
+                Job.id.notin_(job_ids),
+            )
+            .all()
+        )
+        shared = {key for row in rows for key in row if key}
+        return [key for key in keys if key not in shared]
+
+
+    def hand_over_run(self, job: Job) -> Optional[Job]:
+        """Sync version of AsyncJobService.hand_over_run."""
+        waiting = (
+            self.db.query(Job)
+            .filter(Job.source_job_id == job.id, Job.status.in_(ACTIVE_JOB_STATUSES))
+            .order_by(Job.id)
+            .all()
+        )
+        if not waiting:
+            return None
+        _promote(waiting[0], waiting[1:])
+        return waiting[0]
 
     def delete_job(self, user_id: int, job_id: int) -> bool:
         """
-        Permanently delete a job and its associated S3 files.
+        Permanently delete a job and its associated S3 files. Jobs still
+        waiting on its run should be handed it first (`hand_over_run`).
         """
         job = self.get_user_job(user_id, job_id)
         if not job:
             return False
 
-        # Delete from S3
+        # Delete from S3, keeping files still shared with coalesced jobs
         from app.services.storage import StorageService
         storage = StorageService()
-        
-        # Try to delete PDF
-        if job.pdf_s3_key:
-            try:
-                storage.delete_file(job.pdf_s3_key)
-            except Exception as e:
-                logger.warning(f"Could not delete PDF file {job.pdf_s3_key}: {e}")
+        keys = self._unshared_keys(
+            [key for key in (job.pdf_s3_key, job.audio_s3_key) if key], [job.id]
+        )
+        if job.audio_s3_key in keys:
+            # Chapter files are shared exactly when the full audio is
+            keys += _chapter_keys(job.chapters)
 
-        # Try to delete Audio
-        if job.audio_s3_key:
+        for key in keys:
             try:
-                storage.delete_file(job.audio_s3_key)
+                storage.delete_file(key)
             except Exception as e:
-                logger.warning(f"Could not delete audio file {job.audio_s3_key}: {e}")
+                logger.warning(f"Could not delete file {key}: {e}")
+        prefixes = _checkpoint_prefixes([job])
+        if prefixes:
+            storage.delete_prefixes(prefixes)
 
         # Delete database record
         self.db.delete(job)
@@ -145,36 +342,345 @@ class JobService:
         Delete all failed or cancelled jobs for a user.
         Returns the number of jobs deleted.
         """
-        failed_jobs = (
-            self.db.query(Job)
-            .filter(
-                Job.user_id == user_id,
-                Job.status.in_([JobStatus.failed, JobStatus.cancelled])
-            )
-            .all()
+        return self.purge_jobs(
+            Job.user_id == user_id,
+            Job.status.in_([JobStatus.failed, JobStatus.cancelled]),
         )
 
-        count = 0
+    def purge_jobs(self, *criteria, batch_size: Optional[int] = None) -> int:
+        """
+        Delete every job matching `criteria`, together with its S3 files and
+        any time-slice checkpoint it left behind.
+
+        Works through matching IDs in pages so memory stays flat regardless of
+        how many jobs match: each page issues batched S3 deletes and a single
+        set-based DELETE, then commits. Returns the number of jobs deleted.
+        """
+        from app.core.config import settings
         from app.services.storage import StorageService
+
+        batch_size = batch_size or settings.CLEANUP_BATCH_SIZE
         storage = StorageService()
+        deleted = 0
+        last_id = 0
 
-        for job in failed_jobs:
-            # S3 Cleanup
-            if job.pdf_s3_key:
-                try:
-                    storage.delete_file(job.pdf_s3_key)
-                except Exception as e:
-                    logger.warning(f"Could not delete PDF {job.pdf_s3_key} for job {job.id}: {e}")
-            if job.audio_s3_key:
-                try:
-                    storage.delete_file(job.audio_s3_key)
-                except Exception as e:
-                    logger.warning(f"Could not delete audio {job.audio_s3_key} for job {job.id}: {e}")
-            
-            self.db.delete(job)
-            count += 1
-        
-        if count > 0:
+        while True:
+            rows = (
+                self.db.query(
+                    Job.id, Job.pdf_s3_key, Job.audio_s3_key, Job.chapters, Job.status, Job.source_job_id
+                )
+                .filter(*criteria, Job.id > last_id)
+                .order_by(Job.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            job_ids = [row.id for row in rows]
+            keys = [
+                key
+                for row in rows
+                for key in (row.pdf_s3_key, row.audio_s3_key)
+                if key
+            ]
+            keys = self._unshared_keys(keys, job_ids)
+            storage.delete_files(keys + _unshared_chapter_keys(rows, keys))
+            prefixes = _checkpoint_prefixes(rows)
+            if prefixes:
+                storage.delete_prefixes(prefixes)
+
+            self.db.query(Job).filter(Job.id.in_(job_ids)).delete()
             self.db.commit()
-            
-        return count
+
+            deleted += len(job_ids)
+            last_id = job_ids[-1]
+            if len(rows) < batch_size:
+                break
+
+        return deleted
+
+
+class AsyncJobService:
+    """
+    Async counterpart of JobService for the API routes.
+
+    Queries run on the async engine so they never block the event loop; blocking
+    S3 calls are pushed to the default thread pool. The Celery worker keeps
+    using the sync JobService.
+    """
+
+    encode_cursor = staticmethod(JobService.encode_cursor)
+    decode_cursor = staticmethod(JobService.decode_cursor)
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_job(
+        self,
+        user_id: int,
+        job_data: JobCreate,
+        pdf_s3_key: str,
+        pdf_s3_url: str,
+        dedup_key: Optional[str] = None,
+    ) -> Job:
+        job = Job(
+            user_id=user_id,
+            original_filename=job_data.original_filename,
+            pdf_s3_key=pdf_s3_key,
+            pdf_s3_url=pdf_s3_url,
+            voice_provider=job_data.voice_provider,
+            voice_type=job_data.voice_type,
+            reading_speed=job_data.reading_speed,
+            include_summary=job_data.include_summary,
+            conversion_mode=job_data.conversion_mode,
+            tts_fallbacks=_fallbacks_json(job_data),
+            status=JobStatus.pending,
+            dedup_key=dedup_key,
+        )
+
+        self.db.add(job)
+        await self.db.commit()
+        # Load server-side defaults (id, created_at); no lazy loads after this point
+        await self.db.refresh(job)
+        return job
+
+    async def find_reusable_job(self, dedup_key: str) -> Optional[Job]:
+        """Latest pending, processing or completed original job with this dedup key."""
+        result = await self.db.execute(
+            select(Job)
+            .where(
+                Job.dedup_key == dedup_key,
+                Job.source_job_id.is_(None),
+                Job.status.in_(REUSABLE_JOB_STATUSES),
+            )
+            .order_by(Job.id.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    async def create_coalesced_job(
+        self, user_id: int, job_data: JobCreate, source: Job
+    ) -> Job:
+        """
+        Create a job that shares `source`'s run instead of being queued.
+
+        It reuses the source's PDF and, once available, its audio; the worker
+        mirrors the source's status onto it (see JobService.update_job_status).
+        """
+        completed = source.status == JobStatus.completed
+        job = Job(
+            user_id=user_id,
+            original_filename=job_data.original_filename,
+            pdf_s3_key=source.pdf_s3_key,
+            pdf_s3_url=source.pdf_s3_url,
+            audio_s3_key=source.audio_s3_key,
+            audio_s3_url=source.audio_s3_url,
+            chapters=source.chapters,
+            voice_provider=job_data.voice_provider,
+            voice_type=job_data.voice_type,
+            reading_speed=job_data.reading_speed,
+            include_summary=job_data.include_summary,
+            conversion_mode=job_data.conversion_mode,
+            tts_fallbacks=_fallbacks_json(job_data),
+            status=source.status,
+            progress_percentage=source.progress_percentage,
+            chars_processed=source.chars_processed if completed else 0,
+            estimated_cost=0.0,
+            dedup_key=source.dedup_key,
+            source_job_id=source.id,
+            started_at=source.started_at,
+            completed_at=datetime.now() if completed else None,
+        )
+
+        self.db.add(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def get_user_job(self, user_id: int, job_id: int) -> Optional[Job]:
+        result = await self.db.execute(
+            select(Job).where(Job.id == job_id, Job.user_id == user_id)
+        )
+        return result.scalars().first()
+
+    async def get_user_jobs(self, user_id: int, skip: int = 0, limit: int = 50) -> List[Job]:
+        result = await self.db.execute(
+            select(Job)
+            .where(Job.user_id == user_id)
+            .order_by(Job.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_user_jobs_page(
+        self, user_id: int, cursor: Optional[str] = None, limit: int = 50
+    ) -> Tuple[List[Job], Optional[str]]:
+        """Keyset pagination over a user's jobs; see JobService.get_user_jobs_page."""
+        query = select(Job).where(Job.user_id == user_id)
+
+        if cursor:
+            created_at, job_id = self.decode_cursor(cursor)
+            query = query.where(
+                or_(
+                    Job.created_at < created_at,
+                    and_(Job.created_at == created_at, Job.id < job_id),
+                )
+            )
+
+        result = await self.db.execute(
+            query.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit + 1)
+        )
+        jobs = list(result.scalars().all())
+
+        next_cursor = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            next_cursor = self.encode_cursor(jobs[-1])
+
+        return jobs, next_cursor
+
+    async def update_job(self, job_id: int, job_update: dict) -> Optional[Job]:
+        result = await self.db.execute(select(Job).where(Job.id == job_id))
+        job = result.scalars().first()
+        if not job:
+            return None
+
+        for field, value in job_update.items():
+            setattr(job, field, value)
+
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def cancel_job(self, job: Job) -> Optional[Job]:
+        """
+        Mark a job cancelled. Jobs coalesced onto it may belong to other
+        users, so they are not cancelled with it: its run is handed over to
+        them (see `hand_over_run`). Returns the job that took the run over,
+        which the caller has to queue, or None.
+        """
+        job.status = JobStatus.cancelled
+        heir = await self.hand_over_run(job) if job.source_job_id is None else None
+
+        await self.db.commit()
+        await self.db.refresh(job)
+        return heir
+
+    async def hand_over_run(self, job: Job) -> Optional[Job]:
+        """
+        Make the oldest job still waiting on `job`'s run the original of the
+        others, reset to pending so it can be queued on its own; the caller
+        stops `job`'s run and commits. Returns the new original, or None when
+        no job is waiting.
+        """
+        result = await self.db.execute(
+            select(Job)
+            .where(Job.source_job_id == job.id, Job.status.in_(ACTIVE_JOB_STATUSES))
+            .order_by(Job.id)
+        )
+        waiting = result.scalars().all()
+        if not waiting:
+            return None
+        _promote(waiting[0], waiting[1:])
+        return waiting[0]
+
+    async def delete_job(self, user_id: int, job_id: int) -> bool:
+        """
+        Permanently delete a job and its associated S3 files. Jobs still
+        waiting on its run should be handed it first (`hand_over_run`).
+        """
+        job = await self.get_user_job(user_id, job_id)
+        if not job:
+            return False
+
+        from app.services.storage import StorageService
+        storage = StorageService()
+        keys = await self._unshared_keys(
+            [key for key in (job.pdf_s3_key, job.audio_s3_key) if key], [job.id]
+        )
+        if job.audio_s3_key in keys:
+            # Chapter files are shared exactly when the full audio is
+            keys += _chapter_keys(job.chapters)
+        loop = asyncio.get_running_loop()
+        if keys:
+            await loop.run_in_executor(None, storage.delete_files, keys)
+        prefixes = _checkpoint_prefixes([job])
+        if prefixes:
+            await loop.run_in_executor(None, storage.delete_prefixes, prefixes)
+
+        await self.db.delete(job)
+        await self.db.commit()
+        return True
+
+    async def _unshared_keys(self, keys: List[str], job_ids: List[int]) -> List[str]:
+        """Drop S3 keys still referenced by jobs outside `job_ids` (coalesced jobs share files)."""
+        if not keys:
+            return []
+        result = await self.db.execute(
+            select(Job.pdf_s3_key, Job.audio_s3_key).where(
+                or_(Job.pdf_s3_key.in_(keys), Job.audio_s3_key.in_(keys)),
+                Job.id.notin_(job_ids),
+            )
+        )
+        shared = {key for row in result.all() for key in row if key}
+        return [key for key in keys if key not in shared]
+
+    async def cleanup_failed_jobs(self, user_id: int) -> int:
+        """
+        Delete all failed or cancelled jobs for a user.
+        Returns the number of jobs deleted.
+        """
+        return await self.purge_jobs(
+            Job.user_id == user_id,
+            Job.status.in_([JobStatus.failed, JobStatus.cancelled]),
+        )
+
+    async def purge_jobs(self, *criteria, batch_size: Optional[int] = None) -> int:
+        """Async version of JobService.purge_jobs (paged, batched S3 and set-based deletes)."""
+        from app.core.config import settings
+        from app.services.storage import StorageService
+
+        batch_size = batch_size or settings.CLEANUP_BATCH_SIZE
+        storage = StorageService()
+        loop = asyncio.get_running_loop()
+        deleted = 0
+        last_id = 0
+
+        while True:
+            result = await self.db.execute(
+                select(
+                    Job.id, Job.pdf_s3_key, Job.audio_s3_key, Job.chapters, Job.status, Job.source_job_id
+                )
+                .where(*criteria, Job.id > last_id)
+                .order_by(Job.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            job_ids = [row.id for row in rows]
+            keys = [
+                key
+                for row in rows
+                for key in (row.pdf_s3_key, row.audio_s3_key)
+                if key
+            ]
+            keys = await self._unshared_keys(keys, job_ids)
+            keys += _unshared_chapter_keys(rows, keys)
+            await loop.run_in_executor(None, storage.delete_files, keys)
+            prefixes = _checkpoint_prefixes(rows)
+            if prefixes:
+                await loop.run_in_executor(None, storage.delete_prefixes, prefixes)
+
+            await self.db.execute(delete(Job).where(Job.id.in_(job_ids)))
+            await self.db.commit()
+
+            deleted += len(job_ids)
+            last_id = job_ids[-1]
+            if len(rows) < batch_size:
+                break
+
+        return deleted
@@ -0,0 +1,51 @@
+from typing import Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+# Size tiers, each served by its own Celery queue (see worker/celery_app.py)
+SMALL = "small"
+MEDIUM = "medium"
+LARGE = "large"
+
+# Relative processing cost per page. Full modes synthesize every page;
+# summary/explanation modes run the LLM over the text and synthesize far less audio.
+_MODE_WEIGHTS = {
+    "full": 1.0,
+    "full_explanation": 1.3,
+    "summary": 0.25,
+    "explanation": 0.25,
+    "summary_explanation": 0.3,
+}
+
+
+def count_pdf_pages(pdf_bytes: bytes) -> Optional[int]:
+    """Page count from the PDF's page tree, or None if it cannot be parsed."""
+    try:
+        import fitz  # PyMuPDF
+
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            return doc.page_count
+    except Exception as e:
+        logger.debug(f"Could not read page count for sizing: {e}")
+        return None
+
+
+def estimate_job_size(pdf_bytes: bytes, conversion_mode: str) -> str:
+    """
+    Classify an upload as small, medium or large from its page count, file
+    size and conversion mode.
+
+    File size is converted to page-equivalents and the larger of the two
+    counts wins, so scanned PDFs (few pages, heavy OCR) are not undersized.
+    """
+    page_count = count_pdf_pages(pdf_bytes) or 0
+    size_pages = len(pdf_bytes) / (settings.JOB_SIZE_BYTES_PER_PAGE or 1)
+    weighted_pages = max(page_count, size_pages) * _MODE_WEIGHTS.get(getattr(conversion_mode, "value", conversion_mode), 1.0)
+
+    if weighted_pages <= settings.JOB_SIZE_SMALL_MAX_PAGES:
+        return SMALL
+    if weighted_pages <= settings.JOB_SIZE_MEDIUM_MAX_PAGES:
+        return MEDIUM
+    return LARGE
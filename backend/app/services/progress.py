@@ -0,0 +1,124 @@
+import threading
+import time
+from typing import Dict, Optional
+
+import redis
+from loguru import logger
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+
+class ProgressStore:
+    """
+    Fast store for in-flight job progress.
+
+    Progress ticks are written here instead of to the `jobs` row. Redis is used
+    when available so the API can read what the worker wrote; otherwise values
+    are kept in process memory.
+    """
+
+    KEY_PREFIX = "job_progress"
+
+    def __init__(self):
+        self._local: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, job_id: int) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}"
+
+    def set(self, job_id: int, progress: int) -> None:
+        with self._lock:
+            self._local[job_id] = progress
+
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.set(self._key(job_id), progress, ex=settings.PROGRESS_CACHE_TTL_SECONDS)
+        except redis.RedisError as e:
+            logger.debug(f"Could not write progress for job {job_id} to Redis: {e}")
+
+    def get(self, job_id: int) -> Optional[int]:
+        client = get_redis_client()
+        if client is not None:
+            try:
+                value = client.get(self._key(job_id))
+                if value is not None:
+                    return int(value)
+            except redis.RedisError as e:
+                logger.debug(f"Could not read progress for job {job_id} from Redis: {e}")
+
+        with self._lock:
+            return self._local.get(job_id)
+
+    def clear(self, job_id: int) -> None:
+        with self._lock:
+            self._local.pop(job_id, None)
+
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.delete(self._key(job_id))
+        except redis.RedisError as e:
+            logger.debug(f"Could not clear progress for job {job_id} in Redis: {e}")
+
+
+progress_store = ProgressStore()
+
+
+class ProgressTracker:
+    """
+    Progress callback for the pipeline that coalesces DB writes.
+
+    Every tick goes to the progress store; the `jobs` row is only updated when
+    `flush_interval` seconds have passed since the last write, and only while
+    the job is still processing. Status changes should still go through
+    `JobService.update_job_status` directly.
+    """
+
+    def __init__(
+        self,
+        job_service,
+        job_id: int,
+        store: Optional[ProgressStore] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self.job_service = job_service
+        self.job_id = job_id
+        self.store = store or progress_store
+        self.flush_interval = (
+            settings.PROGRESS_FLUSH_INTERVAL_SECONDS
+            if flush_interval is None
+            else flush_interval
+        )
+        self.last_progress: Optional[int] = None
+        self._last_flushed_progress: Optional[int] = None
+        self._last_flush_at = time.monotonic()
+
+    def __call__(self, progress: int) -> None:
+        self.last_progress = progress
+        self.store.set(self.job_id, progress)
+
+        if time.monotonic() - self._last_flush_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the latest progress to the database if it changed since the last flush."""
+        self._last_flush_at = time.monotonic()
+        if self.last_progress is None or self.last_progress == self._last_flushed_progress:
+            return
+
+        self.job_service.update_job_progress(self.job_id, self.last_progress)
+        self._last_flushed_progress = self.last_progress
+
+    def close(self, final: bool = True) -> None:
+        """
+        Write any progress not yet flushed, and drop the cached progress if
+        the job has reached a final status. A run handed to another task
+        (`final=False`) keeps it so the job shows its progress meanwhile.
+        """
+        self.flush()
+        if final:
+            self.store.clear(self.job_id)
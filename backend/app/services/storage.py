@@ -1,12 +1,16 @@
 import boto3
 import os
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import UploadFile
-from typing import Optional
+from typing import List, Optional
 from botocore.exceptions import NoCredentialsError, ClientError
 
 from app.core.config import settings
 
+# S3 DeleteObjects accepts at most 1,000 keys per request
+S3_DELETE_BATCH_LIMIT = 1000
+
 class StorageService:
     def __init__(self):
         from botocore.config import Config
@@ -122,6 +126,71 @@ class StorageService:
         except ClientError as e:
             raise Exception(f"S3 delete failed: {str(e)}")
     
+    def delete_files(self, keys: List[str]) -> int:
+        """
+        Delete many files using S3 batch deletes (up to 1,000 keys per request),
+        issuing the batches in parallel. Failures are logged, not raised, so one
+        bad key does not block a bulk cleanup. Returns the number of keys deleted.
+        """
+        keys = [key for key in keys if key]
+        if not keys:
+            return 0
+
+        batches = [
+            keys[i:i + S3_DELETE_BATCH_LIMIT]
+            for i in range(0, len(keys), S3_DELETE_BATCH_LIMIT)
+        ]
+
+        def delete_batch(batch: List[str]) -> int:
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except Exception as e:
+                self.logger.warning(f"S3 batch delete of {len(batch)} keys failed: {e}")
+                return 0
+
+            errors = response.get("Errors", [])
+            for error in errors:
+                self.logger.warning(
+                    f"Could not delete {error.get('Key')}: {error.get('Code')} {error.get('Message')}"
+                )
+            return len(batch) - len(errors)
+
+        if len(batches) == 1:
+            return delete_batch(batches[0])
+
+        max_workers = min(settings.S3_DELETE_CONCURRENCY, len(batches))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return sum(executor.map(delete_batch, batches))
+
+    def delete_prefixes(self, prefixes: List[str]) -> int:
+        """
+        Delete every file under each of `prefixes`, listing them in parallel.
+        Like `delete_files`, failures are logged rather than raised. Returns
+        the number of keys deleted.
+        """
+        if not prefixes:
+            return 0
+
+        def list_prefix(prefix: str) -> List[str]:
+            try:
+                paginator = self.s3_client.get_paginator("list_objects_v2")
+                return [
+                    item["Key"]
+                    for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+                    for item in page.get("Contents", [])
+                ]
+            except Exception as e:
+                self.logger.warning(f"Could not list files under {prefix}: {e}")
+                return []
+
+        max_workers = min(settings.S3_DELETE_CONCURRENCY, len(prefixes))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            keys = [key for listed in executor.map(list_prefix, prefixes) for key in listed]
+        return self.delete_files(keys) if keys else 0
+
     def generate_presigned_url(self, key: str, expiration: int = 3600) -> Optional[str]:
         """Generate a presigned URL for temporary access"""
         try:
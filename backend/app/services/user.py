@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -5,6 +7,7 @@ from loguru import logger
 
 from app.models import User
 from app.schemas import UserCreate, UserUpdate
+from app.services.user_cache import user_cache
 
 class UserService:
     def __init__(self, db: Session):
@@ -53,4 +56,60 @@ class UserService:
         
         self.db.commit()
         self.db.refresh(user)
-        return user
\ No newline at end of file
+        user_cache.invalidate(user)
+        return user
+
+
+class AsyncUserService:
+    """Async counterpart of UserService for the API routes."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        result = await self.db.execute(select(User).where(User.id == user_id))
+        return result.scalars().first()
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        result = await self.db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+
+    async def get_or_create_user(self, user_data: dict) -> User:
+        """Get or create user by email."""
+        user = await self.get_user_by_email(user_data["email"])
+
+        if user:
+            # Update user info if needed
+            if user_data.get("first_name") != user.first_name or \
+               user_data.get("last_name") != user.last_name:
+                user.first_name = user_data.get("first_name")
+                user.last_name = user_data.get("last_name")
+                await self.db.commit()
+                await self.db.refresh(user)
+            return user
+
+        # Create new user
+        user = User(
+            email=user_data["email"],
+            first_name=user_data.get("first_name"),
+            last_name=user_data.get("last_name"),
+            auth_provider_id=user_data.get("auth_provider_id")
+        )
+
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def update_user(self, user_id: int, user_update: UserUpdate) -> User:
+        user = await self.get_user_by_id(user_id)
+        if not user:
+            raise ValueError("User not found")
+
+        for field, value in user_update.model_dump(exclude_unset=True).items():
+            setattr(user, field, value)
+
+        await self.db.commit()
+        await self.db.refresh(user)
+        await user_cache.async_invalidate(user)
+        return user
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import redis
+from loguru import logger
+
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.core.redis_client import get_redis_client
+from app.models import User
+
+_USER_FIELDS = ("id", "email", "auth_provider_id", "first_name", "last_name")
+_USER_DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+def _user_to_dict(user: User) -> dict:
+    data = {field: getattr(user, field) for field in _USER_FIELDS}
+    for field in _USER_DATETIME_FIELDS:
+        value = getattr(user, field)
+        data[field] = value.isoformat() if value else None
+    return data
+
+
+def _user_from_dict(data: dict) -> User:
+    values = {field: data.get(field) for field in _USER_FIELDS}
+    for field in _USER_DATETIME_FIELDS:
+        value = data.get(field)
+        values[field] = datetime.fromisoformat(value) if value else None
+    # Transient instance: never attached to a session, only read by the routes
+    return User(**values)
+
+
+class UserCache:
+    """
+    TTL cache from auth identity to the resolved User.
+
+    Lets `get_current_user` skip the per-request SELECT (and occasional write)
+    in `get_or_create_user`. Entries live in process memory and, when
+    USER_CACHE_BACKEND is "redis", are shared through Redis as well.
+    Invalidation clears this process and Redis; other processes' in-memory
+    copies expire within USER_CACHE_TTL_SECONDS. The async_* variants are for
+    the event loop and run the Redis round-trips on the default executor.
+    """
+
+    KEY_PREFIX = "current_user"
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = settings.USER_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._local: Dict[str, Tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def identity(auth_provider_id: Optional[str], email: str) -> str:
+        return f"{auth_provider_id or ''}:{email}"
+
+    def _redis(self) -> Optional[redis.Redis]:
+        if settings.USER_CACHE_BACKEND.lower() != "redis":
+            return None
+        return get_redis_client()
+
+    def _get_local(self, identity: str) -> Optional[dict]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(identity)
+            if entry and entry[0] > now:
+                return entry[1]
+            if entry:
+                del self._local[identity]
+        return None
+
+    def _get_shared(self, identity: str) -> Optional[dict]:
+        client = self._redis()
+        if client is None:
+            return None
+        try:
+            raw = client.get(f"{self.KEY_PREFIX}:{identity}")
+        except redis.RedisError as e:
+            logger.debug(f"User cache read from Redis failed: {e}")
+            return None
+        if not raw:
+            return None
+        data = json.loads(raw)
+        with self._lock:
+            self._local[identity] = (time.monotonic() + self.ttl_seconds, data)
+        return data
+
+    def _set_shared(self, identity: str, data: dict) -> None:
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            client.set(
+                f"{self.KEY_PREFIX}:{identity}",
+                json.dumps(data),
+                ex=max(1, int(self.ttl_seconds)),
+            )
+        except redis.RedisError as e:
+            logger.debug(f"User cache write to Redis failed: {e}")
+
+    def _invalidate_shared(self, identity: str) -> None:
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            client.delete(f"{self.KEY_PREFIX}:{identity}")
+        except redis.RedisError as e:
+            logger.debug(f"User cache invalidation in Redis failed: {e}")
+
+    def _shared(self) -> bool:
+        return settings.USER_CACHE_BACKEND.lower() == "redis"
+
+    @staticmethod
+    def _lookup(data: Optional[dict]) -> Optional[User]:
+        record_cache_lookup("user", hit=data is not None)
+        return _user_from_dict(data) if data is not None else None
+
+    def get(self, identity: str) -> Optional[User]:
+        if self.ttl_seconds <= 0:
+            return None
+        data = self._get_local(identity)
+        if data is None:
+            data = self._get_shared(identity)
+        return self._lookup(data)
+
+    async def async_get(self, identity: str) -> Optional[User]:
+        """`get` for the event loop: a local hit is returned inline, the Redis read runs on a thread."""
+        if self.ttl_seconds <= 0:
+            return None
+        data = self._get_local(identity)
+        if data is None and self._shared():
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(None, self._get_shared, identity)
+        return self._lookup(data)
+
+    def _set_local(self, identity: str, user: User) -> dict:
+        data = _user_to_dict(user)
+        with self._lock:
+            self._local[identity] = (time.monotonic() + self.ttl_seconds, data)
+        return data
+
+    def set(self, identity: str, user: User) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._set_shared(identity, self._set_local(identity, user))
+
+    async def async_set(self, identity: str, user: User) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        data = self._set_local(identity, user)
+        if self._shared():
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._set_shared, identity, data)
+
+    def _invalidate_local(self, user: User) -> str:
+        identity = self.identity(user.auth_provider_id, user.email)
+        with self._lock:
+            self._local.pop(identity, None)
+        return identity
+
+    def invalidate(self, user: User) -> None:
+        """Drop the cached entry for `user`, e.g. after its profile changed."""
+        self._invalidate_shared(self._invalidate_local(user))
+
+    async def async_invalidate(self, user: User) -> None:
+        identity = self._invalidate_local(user)
+        if self._shared():
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._invalidate_shared, identity)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+
+user_cache = UserCache()
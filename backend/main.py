@@ -9,7 +9,8 @@ import boto3
 import redis
 from app.api.v1 import auth, jobs
 from app.core.config import settings
-from app.core.database import SessionLocal, get_db
+from app.core.database import SessionLocal, async_engine, engine, get_db
+from app.core.metrics import HTTP_REQUEST_DURATION, register_db_pool_metrics, route_label
 from app.core.exceptions import (
     AppException,
     app_exception_handler,
@@ -17,10 +18,11 @@ from app.core.exceptions import (
     http_exception_handler,
 )
 from app.core.logging import setup_logging
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from loguru import logger
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
@@ -127,6 +129,17 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    # The route is only known once routing has run
+    HTTP_REQUEST_DURATION.labels(
+        request.method, route_label(request), str(response.status_code)
+    ).observe(time.perf_counter() - start_time)
+    return response
+
+
 # --- Middleware ---
 
 # Rate Limiting
@@ -188,6 +201,7 @@ app.add_middleware(
         "*"
     ],  # Allow all methods; browser + route handlers will enforce specifics.
     allow_headers=["*"],  # Allow all headers, including Authorization & custom ones.
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor for GET /api/v1/jobs
 )
 
 # GZip Compression
@@ -334,6 +348,15 @@ async def health_check():
     }
 
 
+if settings.METRICS_ENABLED:
+    register_db_pool_metrics({"sync": engine, "async": async_engine})
+
+    @app.get("/metrics", tags=["System"], include_in_schema=False)
+    def metrics():
+        """Prometheus scrape endpoint."""
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/", tags=["System"])
 def read_root():
     return {"message": "Welcome to the PDF2AudioBook API"}
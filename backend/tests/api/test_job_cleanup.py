@@ -7,7 +7,7 @@ from datetime import datetime
 def get_test_user(db: Session):
     user = db.query(User).first()
     if not user:
-        user = User(id=1, email="dev@example.com")
+        user = User(id=1, email="dev@example.com", auth_provider_id="local")
         db.add(user)
         db.commit()
     return user
@@ -62,6 +62,7 @@ def test_cleanup_failed_jobs(client: TestClient, db_session: Session):
     )
     db_session.add_all([job1, job2, job3])
     db_session.commit()
+    job1_id, job2_id, job3_id = job1.id, job2.id, job3.id
 
     # Cleanup
     response = client.delete("/api/v1/jobs/cleanup")
@@ -70,6 +71,135 @@ def test_cleanup_failed_jobs(client: TestClient, db_session: Session):
     assert data["deleted_count"] == 2
 
     # Verify
-    assert db_session.query(Job).filter(Job.id == job1.id).first() is None
-    assert db_session.query(Job).filter(Job.id == job2.id).first() is None
-    assert db_session.query(Job).filter(Job.id == job3.id).first() is not None
+    assert db_session.query(Job).filter(Job.id == job1_id).first() is None
+    assert db_session.query(Job).filter(Job.id == job2_id).first() is None
+    assert db_session.query(Job).filter(Job.id == job3_id).first() is not None
+
+
+def test_purge_jobs_in_batches(db_session: Session):
+    from unittest.mock import patch
+    from app.services.job import JobService
+
+    user = get_test_user(db_session)
+    db_session.add_all([
+        Job(
+            user_id=user.id,
+            original_filename=f"failed{i}.pdf",
+            pdf_s3_key=f"pdf/failed{i}.pdf",
+            audio_s3_key=f"audio/failed{i}.mp3" if i % 2 else None,
+            status=JobStatus.failed,
+            created_at=datetime.now(),
+        )
+        for i in range(5)
+    ])
+    db_session.commit()
+
+    job_ids = [job_id for (job_id,) in db_session.query(Job.id).order_by(Job.id)]
+
+    with patch("app.services.storage.StorageService.delete_files") as mock_delete_files, \
+         patch("app.services.storage.StorageService.delete_prefixes") as mock_delete_prefixes:
+        deleted = JobService(db_session).purge_jobs(
+            Job.status == JobStatus.failed, batch_size=2
+        )
+
+    assert deleted == 5
+    assert mock_delete_files.call_count == 3
+    deleted_keys = [key for call in mock_delete_files.call_args_list for key in call.args[0]]
+    assert len(deleted_keys) == 7
+    deleted_prefixes = [prefix for call in mock_delete_prefixes.call_args_list for prefix in call.args[0]]
+    assert deleted_prefixes == [f"checkpoints/{job_id}/" for job_id in job_ids]
+    assert db_session.query(Job).count() == 0
+
+def test_purge_lists_checkpoints_only_for_jobs_that_can_have_one(db_session: Session):
+    from unittest.mock import patch
+    from app.services.job import JobService
+
+    user = get_test_user(db_session)
+    completed = Job(user_id=user.id, original_filename="done.pdf", pdf_s3_key="pdf/done.pdf", status=JobStatus.completed)
+    failed = Job(user_id=user.id, original_filename="failed.pdf", pdf_s3_key="pdf/failed.pdf", status=JobStatus.failed)
+    db_session.add_all([completed, failed])
+    db_session.commit()
+    follower = Job(user_id=user.id, original_filename="failed.pdf", pdf_s3_key="pdf/failed.pdf",
+                   status=JobStatus.failed, source_job_id=failed.id)
+    db_session.add(follower)
+    db_session.commit()
+    failed_id = failed.id
+
+    with patch("app.services.storage.StorageService.delete_files"), \
+         patch("app.services.storage.StorageService.delete_prefixes") as mock_delete_prefixes:
+        JobService(db_session).purge_jobs(Job.status == JobStatus.completed)
+        mock_delete_prefixes.assert_not_called()
+
+        JobService(db_session).purge_jobs(Job.status == JobStatus.failed)
+
+    mock_delete_prefixes.assert_called_once_with([f"checkpoints/{failed_id}/"])
+
+
+def test_delete_job_keeps_files_shared_with_coalesced_job(client: TestClient, db_session: Session):
+    from unittest.mock import patch
+    from app.services.storage import StorageService
+
+    user = get_test_user(db_session)
+    source = Job(
+        user_id=user.id,
+        original_filename="shared.pdf",
+        pdf_s3_key="pdfs/shared.pdf",
+        audio_s3_key="audio/shared.mp3",
+        status=JobStatus.completed,
+    )
+    db_session.add(source)
+    db_session.commit()
+    follower = Job(
+        user_id=user.id,
+        original_filename="shared.pdf",
+        pdf_s3_key="pdfs/shared.pdf",
+        audio_s3_key="audio/shared.mp3",
+        status=JobStatus.completed,
+        source_job_id=source.id,
+    )
+    db_session.add(follower)
+    db_session.commit()
+    source_id, follower_id = source.id, follower.id
+
+    with patch.object(StorageService, "delete_files") as mock_delete_files:
+        response = client.delete(f"/api/v1/jobs/{source_id}")
+
+    assert response.status_code == 204
+    mock_delete_files.assert_not_called()
+    assert db_session.query(Job).filter(Job.id == follower_id).first() is not None
+
+
+def test_deleting_a_shared_run_hands_it_to_the_other_owners_jobs(client: TestClient, db_session: Session):
+    from unittest.mock import patch
+    from app.services.storage import StorageService
+
+    user = get_test_user(db_session)
+    source = Job(user_id=user.id, original_filename="shared.pdf", pdf_s3_key="pdfs/shared.pdf", status=JobStatus.processing)
+    db_session.add(source)
+    db_session.commit()
+    follower = Job(user_id=user.id + 1, original_filename="shared.pdf", pdf_s3_key="pdfs/shared.pdf",
+                   status=JobStatus.processing, source_job_id=source.id)
+    db_session.add(follower)
+    db_session.commit()
+    source_id, follower_id = source.id, follower.id
+
+    from app.services.cancellation import cancellation_store
+
+    try:
+        with patch.object(StorageService, "delete_files") as mock_delete_files, \
+             patch.object(StorageService, "delete_prefixes"), \
+             patch("app.api.v1.jobs.revoke_pdf_processing") as mock_revoke, \
+             patch("app.api.v1.jobs.enqueue_pdf_processing") as mock_enqueue:
+            response = client.delete(f"/api/v1/jobs/{source_id}")
+        assert cancellation_store.is_requested(source_id)
+    finally:
+        cancellation_store.clear(source_id)
+
+    assert response.status_code == 204
+    # The PDF is still the other owner's input
+    mock_delete_files.assert_not_called()
+    mock_revoke.assert_called_once_with(source_id)
+    mock_enqueue.assert_called_once_with(follower_id)
+    db_session.expire_all()
+    follower = db_session.query(Job).filter(Job.id == follower_id).first()
+    assert (follower.status, follower.source_job_id, follower.error_message) == (JobStatus.pending, None, None)
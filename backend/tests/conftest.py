@@ -3,7 +3,9 @@ import sys
 import os
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 # Set testing mode
 os.environ["TESTING_MODE"] = "true"
@@ -13,7 +15,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
 
 from main import app
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models import Base, User
 from app.services.auth import get_current_user
 
@@ -24,6 +26,15 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The API routes use the async engine; point it at the same SQLite file.
+# NullPool because TestClient may run each request on a fresh event loop.
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test.db", poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -44,15 +55,20 @@ def client(db_session):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     def override_get_current_user():
         user = db_session.query(User).first()
         if not user:
-            user = User(id=1, email="dev@example.com")
+            user = User(id=1, email="dev@example.com", auth_provider_id="local")
             db_session.add(user)
             db_session.commit()
         return user
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     app.dependency_overrides[get_current_user] = override_get_current_user
 
     yield TestClient(app)
@@ -17,11 +17,11 @@ from worker.tasks import process_pdf_task
 @patch("worker.tasks.JobService")
 @patch("worker.tasks.SessionLocal")
 @patch("app.api.v1.jobs.get_current_user")
-@patch("app.api.v1.jobs.JobService")
+@patch("app.api.v1.jobs.AsyncJobService")
 @patch("app.api.v1.jobs.StorageService")
-@patch("app.api.v1.jobs.process_pdf_task")
+@patch("app.api.v1.jobs.enqueue_pdf_processing")
 async def test_full_pdf_to_audiobook_journey(
-    mock_api_process_task,
+    mock_api_enqueue,
     MockStorageServiceAPI,
     MockJobServiceAPI,
     mock_get_current_user,
@@ -74,7 +74,8 @@ async def test_full_pdf_to_audiobook_journey(
         tokens_used=0,
         created_at=datetime.now()
     )
-    mock_job_service_api.create_job.return_value = mock_job
+    mock_job_service_api.create_job = AsyncMock(return_value=mock_job)
+    mock_job_service_api.find_reusable_job = AsyncMock(return_value=None)
 
     # Mock file upload
     mock_storage_service_api.upload_file = AsyncMock(return_value="https://s3.amazonaws.com/bucket/pdfs/1/test.pdf")
@@ -167,7 +168,7 @@ async def test_full_pdf_to_audiobook_journey(
         tokens_used=50,
         created_at=datetime.now()
     )
-    mock_job_service_api.get_user_job.return_value = completed_job
+    mock_job_service_api.get_user_job = AsyncMock(return_value=completed_job)
 
     # Check final job status via API
     response = client.get("/api/v1/jobs/1")
@@ -192,11 +193,11 @@ async def test_full_pdf_to_audiobook_journey(
 @patch("worker.tasks.JobService")
 @patch("worker.tasks.SessionLocal")
 @patch("app.api.v1.jobs.get_current_user")
-@patch("app.api.v1.jobs.JobService")
+@patch("app.api.v1.jobs.AsyncJobService")
 @patch("app.api.v1.jobs.StorageService")
-@patch("app.api.v1.jobs.process_pdf_task")
+@patch("app.api.v1.jobs.enqueue_pdf_processing")
 async def test_pdf_processing_with_summary_explanation_mode(
-    mock_api_process_task,
+    mock_api_enqueue,
     MockStorageServiceAPI,
     MockJobServiceAPI,
     mock_get_current_user,
@@ -242,7 +243,8 @@ async def test_pdf_processing_with_summary_explanation_mode(
         tokens_used=0,
         created_at=datetime.now()
     )
-    mock_job_service_api.create_job.return_value = mock_job
+    mock_job_service_api.create_job = AsyncMock(return_value=mock_job)
+    mock_job_service_api.find_reusable_job = AsyncMock(return_value=None)
 
     # Mock file upload
     mock_storage_service_api.upload_file = AsyncMock(return_value="https://s3.amazonaws.com/bucket/pdfs/2/science_paper.pdf")
@@ -0,0 +1,26 @@
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from main import app
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def test_request_latency_is_recorded_per_route(client):
+    """Test requests are observed under their route template and exposed at /metrics"""
+    # Arrange
+    labels = {"method": "GET", "route": "/", "status": "200"}
+    before = REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0
+
+    # Act
+    client.get("/")
+    response = client.get("/metrics")
+
+    # Assert
+    assert response.status_code == 200
+    assert "http_request_duration_seconds" in response.text
+    assert REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) == before + 1
@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock, patch
+
+from app.services.cancellation import CancellationStore
+
+
+class TestCancellationStore:
+    def setup_method(self):
+        self.store = CancellationStore()
+
+    def test_request_and_clear_in_memory(self):
+        """Test the flag round-trips through the in-process store when Redis is disabled"""
+        # Act
+        self.store.request(3)
+
+        # Assert
+        assert self.store.is_requested(3)
+        assert not self.store.is_requested(4)
+
+        self.store.clear(3)
+        assert not self.store.is_requested(3)
+
+    @patch("app.services.cancellation.get_redis_client")
+    def test_flag_set_by_another_process(self, mock_get_redis_client):
+        """Test a flag written by the API process is seen through Redis"""
+        # Arrange
+        mock_redis = MagicMock()
+        mock_redis.exists.return_value = 1
+        mock_get_redis_client.return_value = mock_redis
+
+        # Act
+        result = self.store.is_requested(9)
+
+        # Assert
+        assert result is True
+        mock_redis.exists.assert_called_once_with("job_cancelled:9")
@@ -1,10 +1,10 @@
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta
 
-from app.services.job import JobService
+from app.services.job import AsyncJobService, JobService
 from app.models import Job, User, JobStatus, ConversionMode
-from app.schemas import JobCreate, VoiceProvider
+from app.schemas import JobCreate, TTSFallback, VoiceProvider
 
 class TestJobService:
     def setup_method(self):
@@ -189,4 +189,197 @@ class TestJobService:
         assert mock_job.status == status
         assert mock_job.error_message == error_message
         self.db.commit.assert_called_once()
-        self.db.refresh.assert_called_once_with(mock_job)
\ No newline at end of file
+        self.db.refresh.assert_called_once_with(mock_job)
+
+    def test_cursor_round_trip(self):
+        """Test a pagination cursor decodes back to the job's sort key"""
+        # Arrange
+        job = Job(id=42, created_at=datetime(2024, 1, 1, 12, 0, 0))
+
+        # Act
+        cursor = JobService.encode_cursor(job)
+        created_at, job_id = JobService.decode_cursor(cursor)
+
+        # Assert
+        assert created_at == datetime(2024, 1, 1, 12, 0, 0)
+        assert job_id == 42
+
+    def test_decode_cursor_invalid(self):
+        """Test a malformed cursor is rejected"""
+        with pytest.raises(ValueError):
+            JobService.decode_cursor("garbage")
+
+    def test_get_user_jobs_page_has_next(self):
+        """Test keyset pagination fetches one extra row to detect a next page"""
+        # Arrange
+        jobs = [Job(id=i, created_at=datetime(2024, 1, 1, 12, i)) for i in (3, 2, 1)]
+        query_chain = self.db.query.return_value.filter.return_value.order_by.return_value.limit
+        query_chain.return_value.all.return_value = jobs
+
+        # Act
+        page, next_cursor = self.job_service.get_user_jobs_page(1, limit=2)
+
+        # Assert
+        query_chain.assert_called_once_with(3)
+        assert page == jobs[:2]
+        assert JobService.decode_cursor(next_cursor) == (datetime(2024, 1, 1, 12, 2), 2)
+
+
+class TestAsyncJobService:
+    def setup_method(self):
+        self.db = MagicMock()
+        self.db.execute = AsyncMock(return_value=MagicMock())
+        self.db.commit = AsyncMock()
+        self.db.refresh = AsyncMock()
+        self.db.delete = AsyncMock()
+        self.job_service = AsyncJobService(self.db)
+
+    @pytest.mark.asyncio
+    async def test_create_job(self):
+        """Test creating a new job"""
+        # Arrange
+        job_data = JobCreate(
+            original_filename="test.pdf",
+            voice_provider=VoiceProvider.openai,
+            conversion_mode=ConversionMode.full
+        )
+
+        # Act
+        job = await self.job_service.create_job(1, job_data, "pdfs/test.pdf", "https://s3/test.pdf")
+
+        # Assert
+        assert job.user_id == 1
+        assert job.status == JobStatus.pending
+        self.db.add.assert_called_once_with(job)
+        self.db.commit.assert_awaited_once()
+        self.db.refresh.assert_awaited_once_with(job)
+
+    @pytest.mark.asyncio
+    async def test_get_user_job_found(self):
+        """Test getting a user's job when it exists"""
+        # Arrange
+        mock_job = MagicMock()
+        self.db.execute.return_value.scalars.return_value.first.return_value = mock_job
+
+        # Act
+        result = await self.job_service.get_user_job(1, 123)
+
+        # Assert
+        assert result == mock_job
+        self.db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_job_not_found(self):
+        """Test deleting a job that doesn't exist"""
+        # Arrange
+        self.db.execute.return_value.scalars.return_value.first.return_value = None
+
+        # Act
+        result = await self.job_service.delete_job(1, 123)
+
+        # Assert
+        assert result is False
+        self.db.delete.assert_not_awaited()
+        self.db.commit.assert_not_awaited()
+
+
+class TestJobCoalescing:
+    def setup_method(self):
+        self.job_data = JobCreate(
+            original_filename="book.pdf",
+            voice_provider=VoiceProvider.openai,
+            voice_type="default",
+            reading_speed=1.0,
+            include_summary=False,
+            conversion_mode=ConversionMode.full,
+        )
+
+    def test_dedup_key_depends_on_content_and_options(self):
+        """Test the dedup key changes with the PDF bytes or any audio-affecting option"""
+        from app.services.job import job_dedup_key
+
+        key = job_dedup_key(b"pdf", self.job_data)
+
+        assert key == job_dedup_key(b"pdf", self.job_data.model_copy(update={"original_filename": "other.pdf"}))
+        assert key != job_dedup_key(b"other pdf", self.job_data)
+        assert key != job_dedup_key(b"pdf", self.job_data.model_copy(update={"voice_type": "nova"}))
+        assert key != job_dedup_key(b"pdf", self.job_data.model_copy(update={"include_summary": True}))
+        assert key != job_dedup_key(
+            b"pdf", self.job_data.model_copy(update={"tts_fallbacks": [TTSFallback(provider=VoiceProvider.azure)]})
+        )
+
+    def test_completion_is_mirrored_to_coalesced_jobs(self, db_session):
+        """Test completing a job completes the jobs coalesced onto it, with its audio"""
+        # Arrange
+        user = User(email="coalesce@example.com", auth_provider_id="local")
+        db_session.add(user)
+        db_session.commit()
+        source = Job(user_id=user.id, original_filename="a.pdf", pdf_s3_key="pdfs/a.pdf", status=JobStatus.processing)
+        db_session.add(source)
+        db_session.commit()
+        follower = Job(user_id=user.id, original_filename="a.pdf", pdf_s3_key="pdfs/a.pdf", status=JobStatus.pending, source_job_id=source.id)
+        db_session.add(follower)
+        db_session.commit()
+
+        # Act
+        source.audio_s3_key = "audio/1/a.mp3"
+        source.chapters = [{"title": "One", "audio_s3_key": "audio/1/a/chapter_001.mp3"}]
+        JobService(db_session).update_job_status(source.id, JobStatus.completed, 100)
+
+        # Assert
+        db_session.refresh(follower)
+        assert follower.status == JobStatus.completed
+        assert follower.progress_percentage == 100
+        assert follower.audio_s3_key == "audio/1/a.mp3"
+        assert follower.chapters == source.chapters
+
+    def test_progress_flush_leaves_a_cancelled_job_cancelled(self, db_session):
+        """Test a progress write after a cancel keeps the status and progress the cancel left"""
+        # Arrange
+        user = User(email="progress@example.com", auth_provider_id="local")
+        db_session.add(user)
+        db_session.commit()
+        running = Job(user_id=user.id, original_filename="a.pdf", pdf_s3_key="pdfs/a.pdf", status=JobStatus.processing)
+        cancelled = Job(user_id=user.id, original_filename="b.pdf", pdf_s3_key="pdfs/b.pdf", status=JobStatus.cancelled, progress_percentage=30)
+        db_session.add_all([running, cancelled])
+        db_session.commit()
+        service = JobService(db_session)
+
+        # Act
+        service.update_job_progress(running.id, 40)
+        service.update_job_progress(cancelled.id, 40)
+
+        # Assert
+        db_session.refresh(running)
+        db_session.refresh(cancelled)
+        assert (running.status, running.progress_percentage) == (JobStatus.processing, 40)
+        assert (cancelled.status, cancelled.progress_percentage) == (JobStatus.cancelled, 30)
+
+    def test_delete_job_removes_chapter_audio_unless_shared(self, db_session):
+        """Test chapter files are deleted with the job's audio, and kept while a coalesced job shares it"""
+        # Arrange
+        user = User(email="chapters@example.com", auth_provider_id="local")
+        db_session.add(user)
+        db_session.commit()
+        chapters = [{"title": "One", "audio_s3_key": "audio/1/b/chapter_001.mp3"}]
+        source = Job(user_id=user.id, original_filename="b.pdf", pdf_s3_key="pdfs/b.pdf",
+                     audio_s3_key="audio/1/b.mp3", chapters=chapters, status=JobStatus.completed)
+        db_session.add(source)
+        db_session.commit()
+        follower = Job(user_id=user.id, original_filename="b.pdf", pdf_s3_key="pdfs/b.pdf",
+                       audio_s3_key="audio/1/b.mp3", chapters=chapters, status=JobStatus.completed,
+                       source_job_id=source.id)
+        db_session.add(follower)
+        db_session.commit()
+        service = JobService(db_session)
+
+        # Act / Assert
+        with patch("app.services.storage.StorageService") as MockStorage:
+            assert service.delete_job(user.id, follower.id)
+            MockStorage.return_value.delete_file.assert_not_called()
+
+            assert service.delete_job(user.id, source.id)
+            deleted = [c.args[0] for c in MockStorage.return_value.delete_file.call_args_list]
+            assert deleted == ["pdfs/b.pdf", "audio/1/b.mp3", "audio/1/b/chapter_001.mp3"]
+            # A completed run already deleted its checkpoint
+            MockStorage.return_value.delete_prefixes.assert_not_called()
@@ -0,0 +1,52 @@
+import fitz
+import pytest
+from unittest.mock import patch
+
+from app.models import ConversionMode
+from app.services.job_sizing import (
+    LARGE,
+    MEDIUM,
+    SMALL,
+    count_pdf_pages,
+    estimate_job_size,
+)
+
+
+def make_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page()
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class TestJobSizing:
+    def test_count_pdf_pages(self):
+        """Test the page count is read from the PDF"""
+        assert count_pdf_pages(make_pdf(3)) == 3
+
+    def test_count_pdf_pages_unparseable(self):
+        """Test bytes that are not a PDF have no page count"""
+        assert count_pdf_pages(b"not a pdf") is None
+
+    @pytest.mark.parametrize(
+        "page_count, conversion_mode, expected",
+        [
+            (10, ConversionMode.full, SMALL),
+            (120, ConversionMode.full, MEDIUM),
+            (1000, ConversionMode.full, LARGE),
+            (1000, ConversionMode.summary, MEDIUM),
+            (120, ConversionMode.summary_explanation, SMALL),
+        ],
+    )
+    def test_tier_by_weighted_pages(self, page_count, conversion_mode, expected):
+        """Test page count weighted by conversion mode picks the tier"""
+        with patch("app.services.job_sizing.count_pdf_pages", return_value=page_count):
+            assert estimate_job_size(b"%PDF", conversion_mode) == expected
+
+    def test_large_scan_is_sized_by_bytes(self):
+        """Test a few-page PDF with a large file size is not routed as small"""
+        scanned = b"0" * (20 * 1024 * 1024)
+        with patch("app.services.job_sizing.count_pdf_pages", return_value=5):
+            assert estimate_job_size(scanned, ConversionMode.full) == MEDIUM
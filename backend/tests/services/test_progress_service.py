@@ -0,0 +1,112 @@
+from unittest.mock import MagicMock, patch
+
+from app.services.progress import ProgressStore, ProgressTracker
+
+
+class TestProgressStore:
+    def setup_method(self):
+        self.store = ProgressStore()
+
+    def test_set_and_get_in_memory(self):
+        """Test progress round-trips through the in-process store when Redis is disabled"""
+        # Act
+        self.store.set(1, 42)
+
+        # Assert
+        assert self.store.get(1) == 42
+        assert self.store.get(2) is None
+
+    def test_clear(self):
+        """Test clearing a job's cached progress"""
+        # Arrange
+        self.store.set(1, 42)
+
+        # Act
+        self.store.clear(1)
+
+        # Assert
+        assert self.store.get(1) is None
+
+    @patch("app.services.progress.get_redis_client")
+    def test_get_prefers_redis(self, mock_get_redis_client):
+        """Test progress written by another process is read from Redis"""
+        # Arrange
+        mock_redis = MagicMock()
+        mock_redis.get.return_value = b"77"
+        mock_get_redis_client.return_value = mock_redis
+
+        # Act
+        result = self.store.get(5)
+
+        # Assert
+        assert result == 77
+        mock_redis.get.assert_called_once_with("job_progress:5")
+
+
+class TestProgressTracker:
+    def setup_method(self):
+        self.job_service = MagicMock()
+        self.store = ProgressStore()
+
+    def test_ticks_are_coalesced(self):
+        """Test progress ticks inside the flush interval do not hit the database"""
+        # Arrange
+        tracker = ProgressTracker(self.job_service, 1, store=self.store, flush_interval=3600)
+
+        # Act
+        for progress in range(40, 95):
+            tracker(progress)
+
+        # Assert
+        self.job_service.update_job_progress.assert_not_called()
+        assert self.store.get(1) == 94
+
+    def test_flush_after_interval(self):
+        """Test the latest progress is written once the flush interval has elapsed"""
+        # Arrange
+        tracker = ProgressTracker(self.job_service, 1, store=self.store, flush_interval=0)
+
+        # Act
+        tracker(50)
+
+        # Assert
+        self.job_service.update_job_progress.assert_called_once_with(1, 50)
+
+    def test_flush_skips_unchanged_progress(self):
+        """Test flushing twice with the same progress only writes once"""
+        # Arrange
+        tracker = ProgressTracker(self.job_service, 1, store=self.store, flush_interval=3600)
+        tracker(60)
+
+        # Act
+        tracker.flush()
+        tracker.flush()
+
+        # Assert
+        self.job_service.update_job_progress.assert_called_once_with(1, 60)
+
+    def test_close_flushes_and_clears_store(self):
+        """Test closing the tracker writes the unflushed progress and drops the cached progress"""
+        # Arrange
+        tracker = ProgressTracker(self.job_service, 1, store=self.store, flush_interval=3600)
+        tracker(60)
+
+        # Act
+        tracker.close()
+
+        # Assert
+        self.job_service.update_job_progress.assert_called_once_with(1, 60)
+        assert self.store.get(1) is None
+
+    def test_close_before_handoff_keeps_store(self):
+        """Test closing a tracker whose run continues in another task keeps the cached progress"""
+        # Arrange
+        tracker = ProgressTracker(self.job_service, 1, store=self.store, flush_interval=3600)
+        tracker(60)
+
+        # Act
+        tracker.close(final=False)
+
+        # Assert
+        self.job_service.update_job_progress.assert_called_once_with(1, 60)
+        assert self.store.get(1) == 60
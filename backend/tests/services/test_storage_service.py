@@ -254,4 +254,63 @@ class TestStorageService:
         with pytest.raises(Exception) as exc_info:
             self.storage_service.generate_presigned_url(key)
 
-        assert "Failed to generate presigned URL" in str(exc_info.value)
\ No newline at end of file
+        assert "Failed to generate presigned URL" in str(exc_info.value)
+
+    def test_delete_files_batches_keys(self):
+        """Test bulk delete splits keys into DeleteObjects batches of at most 1,000"""
+        # Arrange
+        keys = [f"audio/{i}.mp3" for i in range(2500)]
+        self.storage_service.s3_client.delete_objects.return_value = {}
+
+        # Act
+        result = self.storage_service.delete_files(keys)
+
+        # Assert
+        assert result == 2500
+        calls = self.storage_service.s3_client.delete_objects.call_args_list
+        batch_sizes = sorted(len(c.kwargs["Delete"]["Objects"]) for c in calls)
+        assert batch_sizes == [500, 1000, 1000]
+
+    def test_delete_files_reports_errors(self):
+        """Test per-key errors from DeleteObjects are excluded from the deleted count"""
+        # Arrange
+        self.storage_service.s3_client.delete_objects.return_value = {
+            "Errors": [{"Key": "b.pdf", "Code": "AccessDenied", "Message": "Access Denied"}]
+        }
+
+        # Act
+        result = self.storage_service.delete_files(["a.pdf", "b.pdf", None])
+
+        # Assert
+        assert result == 1
+        self.storage_service.s3_client.delete_objects.assert_called_once_with(
+            Bucket=self.storage_service.bucket_name,
+            Delete={"Objects": [{"Key": "a.pdf"}, {"Key": "b.pdf"}], "Quiet": True},
+        )
+
+    def test_delete_files_empty(self):
+        """Test bulk delete with no keys makes no S3 calls"""
+        assert self.storage_service.delete_files([]) == 0
+        self.storage_service.s3_client.delete_objects.assert_not_called()
+
+    def test_delete_prefixes_deletes_every_listed_key(self):
+        """Test prefix delete lists each prefix page by page and batch-deletes what it found"""
+        # Arrange
+        pages = {
+            "checkpoints/1/": [{"Contents": [{"Key": "checkpoints/1/state.json"}]},
+                               {"Contents": [{"Key": "checkpoints/1/chunk_0000.mp3"}]}],
+            "checkpoints/2/": [{}],
+        }
+        paginator = self.storage_service.s3_client.get_paginator.return_value
+        paginator.paginate.side_effect = lambda Bucket, Prefix: pages[Prefix]
+        self.storage_service.s3_client.delete_objects.return_value = {}
+
+        # Act
+        result = self.storage_service.delete_prefixes(["checkpoints/1/", "checkpoints/2/"])
+
+        # Assert
+        assert result == 2
+        self.storage_service.s3_client.delete_objects.assert_called_once_with(
+            Bucket=self.storage_service.bucket_name,
+            Delete={"Objects": [{"Key": "checkpoints/1/state.json"}, {"Key": "checkpoints/1/chunk_0000.mp3"}], "Quiet": True},
+        )
@@ -0,0 +1,111 @@
+import json
+import threading
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import datetime
+
+from app.models import User
+from app.services.auth import get_current_user
+from app.services.user_cache import UserCache
+
+
+class TestUserCache:
+    def setup_method(self):
+        self.cache = UserCache(ttl_seconds=60)
+        self.user = User(
+            id=7,
+            email="base@example.com",
+            auth_provider_id="local",
+            first_name="Base",
+            last_name="User",
+            created_at=datetime(2024, 1, 1, 12, 0, 0),
+        )
+        self.identity = UserCache.identity("local", "base@example.com")
+
+    def test_miss(self):
+        """Test an unknown identity is a cache miss"""
+        assert self.cache.get(self.identity) is None
+
+    def test_set_and_get(self):
+        """Test a cached user is returned as a detached copy with the same identity"""
+        # Act
+        self.cache.set(self.identity, self.user)
+        result = self.cache.get(self.identity)
+
+        # Assert
+        assert result is not self.user
+        assert result.id == 7
+        assert result.email == "base@example.com"
+        assert result.created_at == datetime(2024, 1, 1, 12, 0, 0)
+
+    def test_expired_entry(self):
+        """Test entries are not served once the TTL has elapsed"""
+        # Arrange
+        self.cache.set(self.identity, self.user)
+
+        # Act
+        with patch("app.services.user_cache.time.monotonic", return_value=10**9):
+            result = self.cache.get(self.identity)
+
+        # Assert
+        assert result is None
+
+    def test_invalidate(self):
+        """Test invalidating a user drops its entry"""
+        # Arrange
+        self.cache.set(self.identity, self.user)
+
+        # Act
+        self.cache.invalidate(self.user)
+
+        # Assert
+        assert self.cache.get(self.identity) is None
+
+    def test_disabled_with_zero_ttl(self):
+        """Test a zero TTL disables caching"""
+        cache = UserCache(ttl_seconds=0)
+        cache.set(self.identity, self.user)
+        assert cache.get(self.identity) is None
+
+    @pytest.mark.asyncio
+    async def test_async_get_reads_redis_off_the_event_loop(self):
+        """Test async_get serves a Redis entry but makes the call on another thread"""
+        # Arrange
+        loop_thread = threading.get_ident()
+        calls = []
+        client = MagicMock()
+        client.get.side_effect = lambda key: calls.append(threading.get_ident()) or json.dumps(
+            {"id": 7, "email": "base@example.com", "auth_provider_id": "local"}
+        )
+
+        with patch("app.services.user_cache.settings.USER_CACHE_BACKEND", "redis"), \
+             patch("app.services.user_cache.get_redis_client", return_value=client):
+            # Act
+            result = await self.cache.async_get(self.identity)
+            cached = await self.cache.async_get(self.identity)
+
+        # Assert
+        assert result.id == cached.id == 7
+        assert len(calls) == 1
+        assert calls[0] != loop_thread
+
+
+class TestGetCurrentUserCaching:
+    @pytest.mark.asyncio
+    async def test_second_call_skips_database(self):
+        """Test get_current_user only resolves the user once while cached"""
+        # Arrange
+        user = User(id=1, email="base@example.com", auth_provider_id="local")
+        mock_service = MagicMock()
+        mock_service.get_or_create_user = AsyncMock(return_value=user)
+
+        with patch("app.services.auth.user_cache", UserCache(ttl_seconds=60)), \
+             patch("app.services.auth.AsyncUserService", return_value=mock_service):
+            # Act
+            first = await get_current_user(credentials=None, db=MagicMock())
+            second = await get_current_user(credentials=None, db=MagicMock())
+
+        # Assert
+        assert first.id == second.id == 1
+        mock_service.get_or_create_user.assert_awaited_once()
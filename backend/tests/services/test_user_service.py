@@ -1,8 +1,8 @@
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 
-from app.services.user import UserService
+from app.services.user import AsyncUserService, UserService
 from app.schemas import UserUpdate
 
 
@@ -143,4 +143,57 @@ class TestUserService:
             assert mock_user.first_name == "Jane"
             assert mock_user.last_name == "Smith"
             self.db.commit.assert_called_once()
-            self.db.refresh.assert_called_once_with(mock_user)
\ No newline at end of file
+            self.db.refresh.assert_called_once_with(mock_user)
+
+
+class TestAsyncUserService:
+    def setup_method(self):
+        self.db = MagicMock()
+        self.db.execute = AsyncMock(return_value=MagicMock())
+        self.db.commit = AsyncMock()
+        self.db.refresh = AsyncMock()
+        self.user_service = AsyncUserService(self.db)
+
+    @pytest.mark.asyncio
+    async def test_get_user_by_email_found(self):
+        """Test getting user by email when user exists"""
+        # Arrange
+        mock_user = MagicMock()
+        self.db.execute.return_value.scalars.return_value.first.return_value = mock_user
+
+        # Act
+        result = await self.user_service.get_user_by_email("test@example.com")
+
+        # Assert
+        assert result == mock_user
+        self.db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_or_create_user_new_user(self):
+        """Test get_or_create_user when creating new user"""
+        # Arrange
+        user_data = {
+            "email": "test@example.com",
+            "first_name": "John",
+            "last_name": "Doe",
+            "auth_provider_id": "local"
+        }
+        mock_user = MagicMock()
+
+        with patch.object(self.user_service, 'get_user_by_email', AsyncMock(return_value=None)), \
+             patch('app.services.user.User', return_value=mock_user):
+            # Act
+            result = await self.user_service.get_or_create_user(user_data)
+
+            # Assert
+            assert result == mock_user
+            self.db.add.assert_called_once_with(mock_user)
+            self.db.commit.assert_awaited_once()
+            self.db.refresh.assert_awaited_once_with(mock_user)
+
+    @pytest.mark.asyncio
+    async def test_update_user_not_found(self):
+        """Test updating a user that doesn't exist"""
+        with patch.object(self.user_service, 'get_user_by_id', AsyncMock(return_value=None)):
+            with pytest.raises(ValueError):
+                await self.user_service.update_user(1, UserUpdate(first_name="Jane"))
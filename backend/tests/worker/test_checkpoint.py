@@ -0,0 +1,82 @@
+from worker.checkpoint import JobCheckpoint
+
+
+class _MemoryStorage:
+    def __init__(self):
+        self.objects = {}
+
+    def upload_large_file(self, file_path, key, content_type):
+        with open(file_path, "rb") as f:
+            self.objects[key] = f.read()
+
+    def upload_file_data(self, file_data, key, content_type):
+        self.objects[key] = file_data
+
+    def download_file(self, key):
+        return self.objects[key]
+
+    def delete_files(self, keys):
+        for key in keys:
+            self.objects.pop(key, None)
+        return len(keys)
+
+
+def test_save_load_round_trip_uploads_only_new_chunks(tmp_path):
+    """Test a checkpoint restores chunks and state in a fresh work dir, uploading each chunk once"""
+    storage = _MemoryStorage()
+    first_dir, second_dir = tmp_path / "first", tmp_path / "second"
+    first_dir.mkdir()
+    second_dir.mkdir()
+
+    checkpoint = JobCheckpoint(9)
+    checkpoint.chunks, checkpoint.tokens = ["a", "b", "c"], 12
+    (first_dir / "chunk_0000.mp3").write_bytes(b"A")
+    checkpoint.chunk_done(0, "openai", "alloy", 1)
+    checkpoint.save(storage, str(first_dir))
+    (first_dir / "chunk_0001.mp3").write_bytes(b"B")
+    checkpoint.chunk_done(1, "azure", "jenny", 1)
+    storage.objects["checkpoints/9/chunk_0000.mp3"] = b"A (already uploaded)"
+    checkpoint.save(storage, str(first_dir))
+
+    restored = JobCheckpoint.load(storage, 9, str(second_dir))
+
+    assert (restored.chunks, restored.completed, restored.tokens, restored.slices) == (["a", "b", "c"], {0, 1}, 12, 2)
+    assert restored.served_chars == {("openai", "alloy"): 1, ("azure", "jenny"): 1}
+    assert (second_dir / "chunk_0001.mp3").read_bytes() == b"B"
+    assert storage.objects["checkpoints/9/chunk_0000.mp3"] == b"A (already uploaded)"
+
+    restored.delete(storage)
+    assert storage.objects == {}
+
+
+def test_unsaved_checkpoint_deletes_nothing():
+    """Test a run that never checkpointed does not touch storage on cleanup"""
+    storage = _MemoryStorage()
+    storage.objects["checkpoints/9/state.json"] = b"{}"
+
+    JobCheckpoint(9).delete(storage)
+
+    assert storage.objects == {"checkpoints/9/state.json": b"{}"}
+
+
+def test_segments_are_saved_as_offsets_into_one_copy_of_the_text():
+    """Test handed-off segments are restored as slices of the saved text"""
+    import json
+
+    from worker.segments import TEXT, Segment
+
+    storage = _MemoryStorage()
+    text = "Chapter one. Chapter two."
+    checkpoint = JobCheckpoint(9)
+    checkpoint.text = text
+    checkpoint.segments = [Segment(TEXT, text, 0, 12, "One"), Segment(TEXT, text, 13, 25, "Two")]
+    checkpoint.save(storage, "unused")
+
+    state = json.loads(storage.objects["checkpoints/9/state.json"])
+    restored = JobCheckpoint.load(storage, 9)
+
+    assert state["text"] == text and "text" not in state["segments"][0]
+    assert [(segment.title, segment.text) for segment in restored.segments] == [
+        ("One", "Chapter one."), ("Two", "Chapter two."),
+    ]
+    assert all(segment.source is restored.text for segment in restored.segments)
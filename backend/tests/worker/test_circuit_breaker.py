@@ -0,0 +1,68 @@
+import pytest
+
+from worker.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("worker.circuit_breaker.time.monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture(autouse=True)
+def breaker_settings(monkeypatch):
+    from worker.circuit_breaker import settings
+
+    monkeypatch.setattr(settings, "TTS_CIRCUIT_WINDOW", 4)
+    monkeypatch.setattr(settings, "TTS_CIRCUIT_MIN_REQUESTS", 4)
+    monkeypatch.setattr(settings, "TTS_CIRCUIT_FAILURE_RATE", 0.5)
+    monkeypatch.setattr(settings, "TTS_CIRCUIT_COOLDOWN_SECONDS", 30.0)
+
+
+def test_opens_once_failure_rate_is_reached_over_enough_requests(clock):
+    """Test the circuit stays closed until the window has enough requests at the failure rate"""
+    breaker = CircuitBreaker("openai")
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+
+def test_half_open_allows_one_trial_and_success_closes(clock):
+    """Test after the cooldown a single trial is let through and its success closes the circuit"""
+    breaker = CircuitBreaker("openai")
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock[0] += 31
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_trial_reopens_and_stale_trial_is_replaced(clock):
+    """Test a failed trial restarts the cooldown, and a trial that never reports back is replaced"""
+    breaker = CircuitBreaker("openai")
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock[0] += 31
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+    clock[0] += 31
+    assert breaker.allow_request()
+    clock[0] += 31
+    assert breaker.allow_request()
@@ -0,0 +1,110 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from worker.hedging import HedgeBudget, LatencyTracker, hedged
+
+
+def _tracker_with(latency, samples=30):
+    tracker = LatencyTracker()
+    for _ in range(samples):
+        tracker.record("google", latency)
+    return tracker
+
+
+@pytest.fixture
+def hedge_settings(monkeypatch):
+    from worker.hedging import settings
+
+    monkeypatch.setattr(settings, "TTS_HEDGE_MAX_FRACTION", 0.1)
+    monkeypatch.setattr(settings, "TTS_HEDGE_MIN_DELAY_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "TTS_HEDGE_MIN_SAMPLES", 20)
+    return settings
+
+
+def test_no_hedge_without_enough_latency_history(hedge_settings):
+    """Test requests are not hedged until the provider's p95 is known"""
+    budget = HedgeBudget(100, tracker=_tracker_with(0.01, samples=5))
+    calls = []
+
+    async def attempt(n):
+        calls.append(n)
+        await asyncio.sleep(0.05)
+        return n
+
+    assert asyncio.run(hedged(attempt, budget, "google")) == 0
+    assert calls == [0]
+    assert not budget.sent
+
+
+def test_slow_request_is_hedged_and_first_response_wins(hedge_settings):
+    """Test a request outliving p95 gets a duplicate whose result is used"""
+    budget = HedgeBudget(100, tracker=_tracker_with(0.01))
+    cancelled = []
+
+    async def attempt(n):
+        try:
+            await asyncio.sleep(5 if n == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        return n
+
+    assert asyncio.run(hedged(attempt, budget, "google")) == 1
+    assert (budget.sent["google"], budget.won["google"]) == (1, 1)
+    assert cancelled == [0]
+
+
+def test_hedges_are_capped_per_job(hedge_settings):
+    """Test the number of duplicate requests is capped as a fraction of the job, across providers"""
+    budget = HedgeBudget(30, tracker=_tracker_with(0.01))
+
+    assert budget.remaining == 3
+    assert [budget.spend(provider) for provider in ("google", "google", "azure", "azure")] == [True, True, True, False]
+    assert dict(budget.sent) == {"google": 2, "azure": 1}
+    assert budget.delay("google") is None
+
+
+def test_small_job_gets_no_hedges(hedge_settings):
+    """Test the cap rounds down, so a job too small for one hedge gets none"""
+    budget = HedgeBudget(9, tracker=_tracker_with(0.01))
+
+    assert budget.remaining == 0
+    assert budget.delay("google") is None
+
+
+def test_async_synthesis_hedges_a_hanging_chunk(tmp_path, hedge_settings, monkeypatch):
+    """Test the async scheduler replaces a hanging chunk with its hedge and reports it"""
+    from worker import pdf_pipeline
+    from worker.pdf_pipeline import PDFToAudioPipeline
+    from worker.timings import StageTimings
+
+    monkeypatch.setattr(hedge_settings, "TTS_HEDGE_ENABLED", True)
+    monkeypatch.setattr(hedge_settings, "TTS_HEDGE_MAX_FRACTION", 0.5)
+    monkeypatch.setattr(pdf_pipeline, "latency_tracker", _tracker_with(0.01))
+    monkeypatch.setattr("worker.hedging.latency_tracker", pdf_pipeline.latency_tracker)
+    calls = {}
+
+    class Provider:
+        async def async_text_to_file(self, text, voice_id, speed, sink):
+            calls[text] = calls.get(text, 0) + 1
+            if text == "slow" and calls[text] == 1:
+                await asyncio.sleep(5)
+            return sink.write(text.encode())
+
+        async def aclose(self):
+            pass
+
+    timings = StageTimings()
+    pipeline = PDFToAudioPipeline()
+    with patch.object(pipeline.tts_manager, "get_provider", return_value=Provider()):
+        files = pipeline._synthesize_chunks_async(
+            [("google", "default")], ["a", "slow", "b"], 1.0,
+            str(tmp_path), None, None, timings,
+        )
+
+    assert [open(path, "rb").read() for path in files] == [b"a", b"slow", b"b"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["chunk_0000.mp3", "chunk_0001.mp3", "chunk_0002.mp3"]
+    chunks = timings.as_dict()["tts_chunks"]
+    assert (chunks["hedges_sent"], chunks["hedges_won"]) == (1, 1)
@@ -0,0 +1,939 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+def test_import_does_not_load_provider_sdks():
+    """Test importing the pipeline module leaves the TTS/OCR/LLM SDKs unloaded"""
+    code = (
+        "import sys\n"
+        f"sys.path.insert(0, {REPO_ROOT!r})\n"
+        "import worker.pdf_pipeline\n"
+        "heavy = ['fitz', 'pytesseract', 'pdf2image', 'openai', 'google.cloud.texttospeech',\n"
+        "         'boto3', 'azure.cognitiveservices.speech', 'elevenlabs']\n"
+        "print('loaded=' + ','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    env = dict(os.environ, TESTING_MODE="true")
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, cwd=REPO_ROOT
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "loaded="
+
+
+def test_warm_up_instantiates_providers_and_tolerates_failures():
+    """Test warm-up caches working providers and logs, rather than raises, failures"""
+    from unittest.mock import MagicMock, patch
+
+    from worker.pdf_pipeline import TTSManager
+
+    manager = TTSManager()
+    provider = MagicMock()
+
+    def fake_get_provider(name):
+        if name == "azure":
+            raise RuntimeError("missing credentials")
+        manager._instances[name] = provider
+        return provider
+
+    with patch.object(manager, "get_provider", side_effect=fake_get_provider):
+        manager.warm_up(["google", "azure"])
+
+    assert manager._instances == {"google": provider}
+    provider.prewarm.assert_called_once()
+
+    manager.reset()
+    assert manager._instances == {}
+
+
+def test_process_pdf_stops_between_chunks_when_cancelled():
+    """Test a cancellation seen mid-synthesis stops before the next TTS call"""
+    from unittest.mock import MagicMock, patch
+
+    import pytest
+
+    from worker.pdf_pipeline import JobCancelledError, PDFToAudioPipeline
+
+    pipeline = PDFToAudioPipeline()
+    provider = MagicMock()
+    provider.text_to_file.side_effect = lambda text, voice, speed, sink: sink.write(b"mp3")
+    checks = iter([False, False, True])
+
+    with patch.object(pipeline, "_extract_text", return_value="text " * 100), \
+         patch.object(pipeline, "_chunk_text_for_tts", return_value=["one", "two", "three"]), \
+         patch.object(pipeline.tts_manager, "get_provider", return_value=provider), \
+         patch("time.sleep"), \
+         patch.object(pipeline, "_assemble_audio_chapters") as mock_assemble:
+        with pytest.raises(JobCancelledError):
+            pipeline.process_pdf("in.pdf", cancel_check=lambda: next(checks), work_dir="/tmp")
+
+    assert provider.text_to_file.call_count == 2
+    mock_assemble.assert_not_called()
+
+
+def test_process_pdf_records_stage_timings(tmp_path):
+    """Test each pipeline stage and every TTS chunk is timed"""
+    from unittest.mock import MagicMock, patch
+
+    from worker.pdf_pipeline import PDFToAudioPipeline
+    from worker.timings import StageTimings
+
+    pipeline = PDFToAudioPipeline()
+    provider = MagicMock()
+    provider.text_to_file.side_effect = lambda text, voice, speed, sink: sink.write(b"mp3-bytes")
+    final_audio = tmp_path / "final_output.mp3"
+    final_audio.write_bytes(b"0" * 64)
+    timings = StageTimings()
+
+    with patch.object(pipeline, "_extract_text", return_value="text " * 100), \
+         patch.object(pipeline, "_chunk_text_for_tts", return_value=["one", "two"]), \
+         patch.object(pipeline.tts_manager, "get_provider", return_value=provider), \
+         patch("time.sleep"), \
+         patch.object(pipeline, "_assemble_audio_chapters", return_value=str(final_audio)):
+        pipeline.process_pdf("in.pdf", work_dir=str(tmp_path), timings=timings)
+
+    result = timings.as_dict()
+    assert set(result["stages"]) >= {"cleanup", "llm", "chunking", "tts", "assembly"}
+    assert result["stages"]["tts"]["count"] == 2
+    assert result["stages"]["tts"]["bytes"] == 2 * len(b"mp3-bytes")
+    assert result["stages"]["assembly"]["bytes"] == 64
+    assert result["tts_chunks"]["count"] == 2
+
+
+def test_mock_tts_returns_mp3_frames_after_configured_latency():
+    """Test MockTTS yields decodable MP3 frame data and simulates provider latency"""
+    from unittest.mock import patch
+
+    from worker.pdf_pipeline import MockTTS
+
+    with patch("time.sleep") as mock_sleep:
+        audio = MockTTS(latency_s=0.25).text_to_audio("hello", "voice", 1.0)
+
+    mock_sleep.assert_called_once_with(0.25)
+    assert audio[:2] == b"\xff\xfb"
+    assert len(audio) % 417 == 0
+
+
+def test_mock_tts_enabled_overrides_requested_provider(monkeypatch):
+    """Test MOCK_TTS_ENABLED routes any provider to MockTTS outside testing mode"""
+    from worker.pdf_pipeline import MockTTS, TTSManager, settings
+
+    monkeypatch.setenv("TESTING_MODE", "false")
+    monkeypatch.setattr(settings, "MOCK_TTS_ENABLED", True)
+
+    assert isinstance(TTSManager().get_provider("openai"), MockTTS)
+
+
+class _ConcurrentFakeTTS:
+    """Async provider that records how many requests were in flight at once."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.in_flight = 0
+        self.peak = 0
+        self.closed = False
+
+    async def async_text_to_file(self, text, voice_id, speed, sink):
+        import asyncio
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delays[text])
+        self.in_flight -= 1
+        return sink.write(text.encode())
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_async_synthesis_bounds_concurrency_and_keeps_chunk_order(tmp_path, monkeypatch):
+    """Test the async scheduler caps in-flight requests and returns files in chunk order"""
+    from unittest.mock import patch
+
+    from worker.pdf_pipeline import PDFToAudioPipeline, settings
+    from worker.timings import StageTimings
+
+    monkeypatch.setattr(settings, "TTS_ASYNC_CONCURRENCY", 2)
+    provider = _ConcurrentFakeTTS({"a": 0.03, "b": 0.01, "c": 0.0, "d": 0.02})
+    timings = StageTimings()
+    progress = []
+
+    pipeline = PDFToAudioPipeline()
+    with patch.object(pipeline.tts_manager, "get_provider", return_value=provider):
+        files = pipeline._synthesize_chunks_async(
+            [("mock", "default")], ["a", "b", "c", "d"], 1.0,
+            str(tmp_path), progress.append, None, timings,
+        )
+
+    assert [open(path, "rb").read() for path in files] == [b"a", b"b", b"c", b"d"]
+    assert provider.peak == 2
+    assert provider.closed
+    assert progress[-1] == 95
+    assert timings.as_dict()["tts_chunks"]["count"] == 4
+
+
+def test_async_synthesis_stops_when_cancelled(tmp_path, monkeypatch):
+    """Test a cancellation stops the async scheduler and still closes the provider"""
+    from unittest.mock import patch
+
+    import pytest
+
+    from worker.pdf_pipeline import JobCancelledError, PDFToAudioPipeline, settings
+    from worker.timings import StageTimings
+
+    monkeypatch.setattr(settings, "TTS_ASYNC_CONCURRENCY", 1)
+    provider = _ConcurrentFakeTTS({"a": 0.0, "b": 0.0, "c": 0.0})
+    checks = iter([False, True, True])
+
+    pipeline = PDFToAudioPipeline()
+    with patch.object(pipeline.tts_manager, "get_provider", return_value=provider), \
+         pytest.raises(JobCancelledError):
+        pipeline._synthesize_chunks_async(
+            [("mock", "default")], ["a", "b", "c"], 1.0,
+            str(tmp_path), None, lambda: next(checks), StageTimings(),
+        )
+
+    assert provider.closed
+    assert not (tmp_path / "chunk_0002.mp3").exists()
+
+
+def test_openai_streams_audio_into_sink_and_discards_partial_stream_on_fallback():
+    """Test OpenAI audio is copied to the sink piecewise, and a failed stream is replaced whole"""
+    import io
+    from unittest.mock import MagicMock
+
+    from worker.pdf_pipeline import OpenAITTS
+
+    provider = object.__new__(OpenAITTS)
+    provider.model = "tts-1"
+    provider.voice_mapping = {"default": "alloy"}
+    provider.client = MagicMock()
+    streaming = provider.client.audio.speech.with_streaming_response.create.return_value.__enter__.return_value
+    streaming.iter_bytes.return_value = iter([b"ab", b"cd"])
+
+    sink = io.BytesIO()
+    assert provider.text_to_file("hi", "default", 1.0, sink) == 4
+    assert sink.getvalue() == b"abcd"
+
+    def broken_stream(_size):
+        yield b"partial"
+        raise ConnectionError("reset")
+
+    streaming.iter_bytes.side_effect = broken_stream
+    provider.client.audio.speech.create.return_value.content = b"full"
+    sink = io.BytesIO()
+    assert provider.text_to_file("hi", "default", 1.0, sink) == 4
+    assert sink.getvalue() == b"full"
+
+
+class _FakeSynthesizer:
+    instances = []
+
+    def __init__(self, speech_config):
+        self.spoken = []
+        self.closed = False
+        _FakeSynthesizer.instances.append(self)
+
+    def _result(self, ssml):
+        from types import SimpleNamespace
+
+        from azure.cognitiveservices.speech import ResultReason
+
+        self.spoken.append(ssml)
+        if "FAIL" in ssml:
+            return SimpleNamespace(reason=ResultReason.Canceled)
+        return SimpleNamespace(reason=ResultReason.SynthesizingAudioCompleted, audio_data=b"wav")
+
+    def speak(self, ssml):
+        return self._result(ssml)
+
+    async def async_speak(self, ssml):
+        import asyncio
+
+        await asyncio.sleep(0.01)
+        return self._result(ssml)
+
+    def close(self):
+        self.closed = True
+
+
+def _azure_with_fake_pool(size):
+    from worker.pdf_pipeline import AzureTTS, _AzureSynthesizerPool
+
+    provider = object.__new__(AzureTTS)
+    provider.speech_config = object()
+    provider._pool = _AzureSynthesizerPool(provider.speech_config, size)
+    return provider
+
+
+def test_async_clients_are_per_run_and_closing_one_leaves_the_others_open(monkeypatch):
+    """Test concurrent runs on their own event loops share a provider but not its async client"""
+    import asyncio
+    import threading
+
+    from worker.pdf_pipeline import OpenAITTS
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    provider = OpenAITTS()
+    opened = threading.Barrier(2)
+    clients = {}
+
+    async def run(name):
+        clients[name] = provider._get_async_client()
+        assert provider._get_async_client() is clients[name]
+        await asyncio.get_running_loop().run_in_executor(None, opened.wait)
+        if name == "first":
+            await provider.aclose()
+        else:
+            await asyncio.get_running_loop().run_in_executor(None, first_closed.wait)
+            assert not clients[name].is_closed()
+            await provider.aclose()
+
+    first_closed = threading.Event()
+
+    def first():
+        asyncio.run(run("first"))
+        first_closed.set()
+
+    threads = [threading.Thread(target=first), threading.Thread(target=lambda: asyncio.run(run("second")))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert clients["first"] is not clients["second"]
+    assert clients["first"].is_closed() and clients["second"].is_closed()
+
+
+def test_azure_reuses_pooled_synthesizers_and_replaces_failed_ones():
+    """Test Azure requests share pre-connected synthesizers, voice only in SSML"""
+    from unittest.mock import patch
+
+    import pytest
+
+    _FakeSynthesizer.instances = []
+    with patch("worker.pdf_pipeline._PooledSynthesizer", _FakeSynthesizer):
+        provider = _azure_with_fake_pool(size=2)
+        assert provider.text_to_audio("one", "en-GB-RyanNeural", 1.0) == b"wav"
+        assert provider.text_to_audio("two", "en-US-AriaNeural", 1.0) == b"wav"
+        assert len(_FakeSynthesizer.instances) == 1
+        assert 'voice name="en-GB-RyanNeural"' in _FakeSynthesizer.instances[0].spoken[0]
+
+        with pytest.raises(Exception, match="Azure TTS failed"):
+            provider.text_to_audio("FAIL", "en-US-AriaNeural", 1.0)
+        assert _FakeSynthesizer.instances[0].closed
+
+        provider.text_to_audio("three", "en-US-AriaNeural", 1.0)
+        assert len(_FakeSynthesizer.instances) == 2
+
+
+def test_azure_async_requests_never_exceed_pool_size():
+    """Test concurrent async Azure requests wait for a free pooled synthesizer"""
+    import asyncio
+    from unittest.mock import patch
+
+    _FakeSynthesizer.instances = []
+    with patch("worker.pdf_pipeline._PooledSynthesizer", _FakeSynthesizer):
+        provider = _azure_with_fake_pool(size=2)
+
+        async def run():
+            return await asyncio.gather(
+                *(provider.async_text_to_audio(f"chunk {i}", "", 1.0) for i in range(6))
+            )
+
+        assert asyncio.run(run()) == [b"wav"] * 6
+
+    assert len(_FakeSynthesizer.instances) == 2
+    assert sum(len(s.spoken) for s in _FakeSynthesizer.instances) == 6
+
+
+def test_azure_pool_waiter_gets_the_slot_a_failed_synthesizer_frees():
+    """Test a thread waiting on a full pool wakes up when the in-flight synthesizer fails"""
+    import threading
+    from unittest.mock import patch
+
+    from worker.pdf_pipeline import _AzureSynthesizerPool
+
+    _FakeSynthesizer.instances = []
+    with patch("worker.pdf_pipeline._PooledSynthesizer", _FakeSynthesizer):
+        pool = _AzureSynthesizerPool(object(), 1)
+        in_flight = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()), daemon=True)
+        waiter.start()
+
+        pool.release(in_flight, healthy=False)
+        waiter.join(timeout=5)
+
+    assert not waiter.is_alive()
+    assert acquired[0] is _FakeSynthesizer.instances[1]
+    assert in_flight.closed
+
+
+def test_failed_chunk_falls_back_to_next_provider_and_open_circuit_is_skipped(tmp_path, monkeypatch):
+    """Test a chunk the primary fails goes to the fallback, and an open primary is not called again"""
+    from unittest.mock import MagicMock, patch
+
+    from worker.pdf_pipeline import PDFToAudioPipeline, settings
+    from worker.timings import StageTimings
+
+    monkeypatch.setattr(settings, "TTS_CIRCUIT_MIN_REQUESTS", 1)
+    monkeypatch.setattr(settings, "TTS_CIRCUIT_FAILURE_RATE", 1.0)
+    primary = MagicMock()
+    primary.text_to_file.side_effect = RuntimeError("503 from provider")
+    fallback = MagicMock()
+    fallback.text_to_file.side_effect = lambda text, voice, speed, sink: sink.write(voice.encode())
+    pipeline = PDFToAudioPipeline()
+    providers = {"openai": primary, "azure": fallback}
+    timings = StageTimings()
+
+    with patch.object(pipeline.tts_manager, "get_provider", side_effect=providers.get), \
+         patch("time.sleep"):
+        files = pipeline._synthesize_chunks(
+            [("openai", "alloy"), ("azure", "jenny")], ["a", "b"], 1.0,
+            str(tmp_path), None, None, timings,
+        )
+
+    assert [open(path, "rb").read() for path in files] == [b"jenny", b"jenny"]
+    assert primary.text_to_file.call_count == 1
+    assert timings.as_dict()["tts_chunks"]["providers"] == {"azure": 2}
+
+
+def test_chunks_a_fallback_served_are_priced_at_the_fallback_rate(tmp_path, monkeypatch):
+    """Test the estimated cost bills each chunk to the provider and voice that synthesized it"""
+    from unittest.mock import MagicMock, patch
+
+    from worker.checkpoint import JobCheckpoint
+    from worker.pdf_pipeline import PDFToAudioPipeline, settings
+
+    monkeypatch.setattr(settings, "TTS_ASYNC_SYNTHESIS", False)
+    monkeypatch.setattr(settings, "GOOGLE_TTS_COST_STANDARD", 4.0)
+    monkeypatch.setattr(settings, "GOOGLE_TTS_COST_PREMIUM", 16.0)
+    primary = MagicMock()
+    primary.text_to_file.side_effect = RuntimeError("503 from provider")
+    fallback = MagicMock()
+    fallback.text_to_file.side_effect = lambda text, voice, speed, sink: sink.write(b"mp3")
+    checkpoint = JobCheckpoint(1)
+    checkpoint.chunks = ["x" * 1000, "y" * 1000]
+    final_audio = tmp_path / "final.mp3"
+    final_audio.write_bytes(b"mp3")
+    pipeline = PDFToAudioPipeline()
+    providers = {"azure": primary, "google": fallback}
+
+    with patch.object(pipeline.tts_manager, "get_provider", side_effect=providers.get), \
+         patch("time.sleep"), \
+         patch.object(pipeline, "_assemble_audio_chapters", return_value=str(final_audio)):
+        _, cost, usage = pipeline.process_pdf(
+            "unused.pdf", voice_provider="azure", voice_type="jenny", work_dir=str(tmp_path),
+            tts_fallbacks=[{"provider": "google", "voice_type": "en-US-Premium-A"}], checkpoint=checkpoint,
+        )
+
+    assert usage["chars"] == 2000
+    assert checkpoint.served_chars == {("google", "en-US-Premium-A"): 2000}
+    assert cost == pytest.approx(2000 / 1_000_000 * 16.0)
+
+
+def test_section_voice_replaces_the_requested_voice_for_its_chunks(tmp_path):
+    """Test chunks of a section with its own voice are read in it, and the rest in the job's voice"""
+    from unittest.mock import MagicMock, patch
+
+    from worker.checkpoint import JobCheckpoint
+    from worker.pdf_pipeline import PDFToAudioPipeline
+    from worker.timings import StageTimings
+
+    provider = MagicMock()
+    provider.text_to_file.side_effect = lambda text, voice, speed, sink: sink.write(voice.encode())
+    pipeline = PDFToAudioPipeline()
+    checkpoint = JobCheckpoint(1)
+    checkpoint.sections = [
+        {"kind": "summary", "title": "Summary", "voice": "nova", "first_chunk": 0},
+        {"kind": "text", "title": None, "voice": None, "first_chunk": 1},
+    ]
+
+    with patch.object(pipeline.tts_manager, "get_provider", return_value=provider), \
+         patch("time.sleep"):
+        files = pipeline._synthesize_chunks(
+            [("openai", "alloy")], ["a", "b", "c"], 1.0,
+            str(tmp_path), None, None, StageTimings(), checkpoint,
+        )
+
+    assert [open(path, "rb").read() for path in files] == [b"nova", b"alloy", b"alloy"]
+
+
+def test_async_synthesis_raises_when_every_route_fails(tmp_path):
+    """Test the async scheduler tries each route for a chunk and raises the last error"""
+    from unittest.mock import patch
+
+    import pytest
+
+    from worker.pdf_pipeline import PDFToAudioPipeline
+    from worker.timings import StageTimings
+
+    class FailingTTS(_ConcurrentFakeTTS):
+        async def async_text_to_file(self, text, voice_id, speed, sink):
+            raise RuntimeError(f"{voice_id} down")
+
+    primary, fallback = FailingTTS({}), FailingTTS({})
+    pipeline = PDFToAudioPipeline()
+
+    with patch.object(pipeline.tts_manager, "get_provider", side_effect={"openai": primary, "google": fallback}.get), \
+         pytest.raises(RuntimeError, match="g-voice down"):
+        pipeline._synthesize_chunks_async(
+            [("openai", "o-voice"), ("google", "g-voice")], ["a"], 1.0,
+            str(tmp_path), None, None, StageTimings(),
+        )
+
+    assert primary.closed and fallback.closed
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_soft_time_limit_during_synthesis_checkpoints_without_failing_over(tmp_path, monkeypatch, use_async):
+    """Test a soft limit raised inside a provider call reaches the checkpoint path, not the fallback"""
+    from unittest.mock import MagicMock, patch
+
+    from celery.exceptions import SoftTimeLimitExceeded
+
+    from worker.checkpoint import CheckpointReached, JobCheckpoint
+    from worker.pdf_pipeline import PDFToAudioPipeline, settings
+
+    monkeypatch.setattr(settings, "TTS_ASYNC_SYNTHESIS", use_async)
+
+    class SlowTTS(_ConcurrentFakeTTS):
+        def text_to_file(self, text, voice_id, speed, sink):
+            raise SoftTimeLimitExceeded()
+
+        async def async_text_to_file(self, text, voice_id, speed, sink):
+            raise SoftTimeLimitExceeded()
+
+    fallback = MagicMock()
+    pipeline = PDFToAudioPipeline()
+    checkpoint = JobCheckpoint(1)
+    checkpoint.chunks = ["a", "b"]
+
+    with patch.object(pipeline.tts_manager, "get_provider", side_effect={"openai": SlowTTS({}), "google": fallback}.get), \
+         patch("time.sleep"), \
+         pytest.raises(CheckpointReached):
+        pipeline.process_pdf(
+            "unused.pdf", work_dir=str(tmp_path), checkpoint=checkpoint,
+            tts_fallbacks=[{"provider": "google"}],
+        )
+
+    fallback.text_to_file.assert_not_called()
+    fallback.async_text_to_file.assert_not_called()
+    assert pipeline.tts_manager.breaker("openai")._outcomes.count(False) == 0
+    assert checkpoint.completed == set()
+
+
+def test_synthesis_skips_checkpointed_chunks_and_stops_at_the_deadline(tmp_path):
+    """Test chunks already in the checkpoint are not resynthesized and an expired slice stops early"""
+    import time
+    from unittest.mock import MagicMock, patch
+
+    import pytest
+
+    from worker.checkpoint import CheckpointReached, JobCheckpoint
+    from worker.pdf_pipeline import PDFToAudioPipeline
+    from worker.timings import StageTimings
+
+    provider = MagicMock()
+    provider.text_to_file.side_effect = lambda text, voice, speed, sink: sink.write(text.encode())
+    pipeline = PDFToAudioPipeline()
+    checkpoint = JobCheckpoint(1)
+    checkpoint.completed = {0}
+
+    with patch.object(pipeline.tts_manager, "get_provider", return_value=provider), patch("time.sleep"):
+        files = pipeline._synthesize_chunks(
+            [("openai", "default")], ["a", "b", "c"], 1.0, str(tmp_path), None, None, StageTimings(), checkpoint,
+        )
+        assert [c.args[0] for c in provider.text_to_file.call_args_list] == ["b", "c"]
+        assert files == [str(tmp_path / f"chunk_{i:04d}.mp3") for i in range(3)]
+
+        checkpoint = JobCheckpoint(1, deadline=time.monotonic() - 1)
+        with pytest.raises(CheckpointReached, match="0/2"):
+            pipeline._synthesize_chunks(
+                [("openai", "default")], ["d", "e"], 1.0, str(tmp_path), None, None, StageTimings(), checkpoint,
+            )
+    assert provider.text_to_file.call_count == 2
+
+
+def test_async_synthesis_lets_in_flight_chunks_finish_past_the_deadline(tmp_path, monkeypatch):
+    """Test the async scheduler starts no chunk after the deadline but keeps the ones already running"""
+    import time
+    from unittest.mock import patch
+
+    import pytest
+
+    from worker.checkpoint import CheckpointReached, JobCheckpoint
+    from worker.pdf_pipeline import PDFToAudioPipeline, settings
+    from worker.timings import StageTimings
+
+    monkeypatch.setattr(settings, "TTS_ASYNC_CONCURRENCY", 2)
+    provider = _ConcurrentFakeTTS({"a": 0.3, "b": 0.3, "c": 0.0})
+    checkpoint = JobCheckpoint(1, deadline=time.monotonic() + 0.1)
+    pipeline = PDFToAudioPipeline()
+
+    with patch.object(pipeline.tts_manager, "get_provider", return_value=provider), \
+         pytest.raises(CheckpointReached, match="2/3"):
+        pipeline._synthesize_chunks_async(
+            [("mock", "default")], ["a", "b", "c"], 1.0,
+            str(tmp_path), None, None, StageTimings(), checkpoint,
+        )
+
+    assert checkpoint.completed == {0, 1}
+    assert not (tmp_path / "chunk_0002.mp3").exists()
+
+
+def test_process_pdf_resumes_from_handed_off_text_without_extracting(tmp_path):
+    """Test a checkpoint carrying cleaned text skips extraction and goes straight to the LLM step"""
+    from unittest.mock import MagicMock, patch
+
+    from worker.checkpoint import JobCheckpoint
+    from worker.pdf_pipeline import PDFToAudioPipeline
+    from worker.segments import TEXT, Segment
+
+    pipeline = PDFToAudioPipeline()
+    provider = MagicMock()
+    provider.text_to_file.side_effect = lambda text, voice, speed, sink: sink.write(b"mp3")
+    checkpoint = JobCheckpoint(1)
+    checkpoint.text = "Cleaned text."
+    final_audio = tmp_path / "final.mp3"
+    final_audio.write_bytes(b"mp3")
+
+    with patch.object(pipeline, "_extract_text") as mock_extract, \
+         patch.object(pipeline, "_get_final_text", return_value=([Segment(TEXT, "Cleaned text.")], 0)) as mock_llm, \
+         patch.object(pipeline.tts_manager, "get_provider", return_value=provider), \
+         patch("time.sleep"), \
+         patch.object(pipeline, "_assemble_audio_chapters", return_value=str(final_audio)):
+        pipeline.process_pdf("unused.pdf", work_dir=str(tmp_path), checkpoint=checkpoint)
+
+    mock_extract.assert_not_called()
+    assert [segment.text for segment in mock_llm.call_args.args[0]] == ["Cleaned text."]
+    assert (checkpoint.text, checkpoint.chunks) == (None, ["Cleaned text."])
+
+
+def _fake_pages(pages):
+    """Stand-in for `_stream_pages` over a list of already-cleaned page texts."""
+
+    def stream_pages(pdf_path, start_page=0, cancel_check=None, timings=None, chapter_starts=None, body_size=None):
+        for index in range(start_page, len(pages)):
+            yield index, len(pages), pages[index]
+
+    return stream_pages
+
+
+def test_page_stream_chunks_match_batch_chunking():
+    """Test chunking page by page yields the same chunks as chunking the whole text"""
+    from worker.checkpoint import JobCheckpoint
+    from worker.pdf_pipeline import PDFToAudioPipeline, _PageChunkStream
+    from worker.timings import StageTimings
+
+    pipeline = PDFToAudioPipeline()
+    pages = [
+        "First sentence here. Second one follows",
+        "and ends on this page. A third",
+        "",
+        "sentence spans a blank page. " * 3 + "Unbrokenwordthatislongerthanthelimitallows",
+    ]
+    checkpoint = JobCheckpoint(1)
+    checkpoint.chunks, checkpoint.pages_done = [], 0
+
+    stream = _PageChunkStream(
+        _fake_pages(pages)(None), checkpoint,
+        lambda text: pipeline._split_complete_chunks(text, 40), StageTimings(), 2,
+    )
+    streamed = list(stream)
+    stream.close()
+
+    assert streamed == pipeline._chunk_text_for_tts(" ".join(p for p in pages if p), 40)
+    assert checkpoint.chunks == streamed
+    assert (checkpoint.pages_done, checkpoint.pending_text, stream.exhausted) == (None, "", True)
+
+
+def test_streamed_process_pdf_synthesizes_before_the_pdf_is_read(tmp_path, monkeypatch):
+    """Test the first chunk is synthesized while later pages are still being extracted"""
+    import threading
+    from unittest.mock import MagicMock, patch
+
+    from worker.checkpoint import JobCheckpoint
+    from worker.pdf_pipeline import PDFToAudioPipeline, settings
+
+    monkeypatch.setattr(settings, "STREAMING_PIPELINE_ENABLED", True)
+    first_chunk_done = threading.Event()
+    read_after_first_chunk = []
+
+    def stream_pages(pdf_path, start_page=0, cancel_check=None, timings=None, chapter_starts=None, body_size=None):
+        yield 0, 2, "Page one."
+        read_after_first_chunk.append(first_chunk_done.wait(timeout=5))
+        yield 1, 2, "Page two."
+
+    def synthesize(text, voice, speed, sink):
+        first_chunk_done.set()
+        return sink.write(text.encode())
+
+    pipeline = PDFToAudioPipeline()
+    provider = MagicMock()
+    provider.text_to_file.side_effect = synthesize
+    checkpoint = JobCheckpoint(1)
+    final_audio = tmp_path / "final.mp3"
+    final_audio.write_bytes(b"mp3")
+
+    with patch.object(pipeline, "_stream_pages", side_effect=stream_pages), \
+         patch.object(pipeline, "_split_complete_chunks", side_effect=lambda text: ([text], "")), \
+         patch.object(pipeline, "_get_final_text") as mock_llm, \
+         patch.object(pipeline.tts_manager, "get_provider", return_value=provider), \
+         patch("time.sleep"), \
+         patch.object(pipeline, "_assemble_audio_chapters", return_value=str(final_audio)) as mock_assemble:
+        _, _, usage = pipeline.process_pdf(
+            "book.pdf", conversion_mode="full", work_dir=str(tmp_path), checkpoint=checkpoint
+        )
+
+    assert read_after_first_chunk == [True]
+    mock_llm.assert_not_called()
+    assert [c.args[0] for c in provider.text_to_file.call_args_list] == ["Page one.", "Page two."]
+    assert len(mock_assemble.call_args.args[0]) == 2
+    assert usage["chars"] == len("Page one.") + len("Page two.")
+
+
+def test_streamed_run_checkpoints_mid_pdf_and_resumes_from_the_next_page(tmp_path, monkeypatch):
+    """Test a deadline hit while pages remain saves the read position and the continuation reads on"""
+    import time
+    from unittest.mock import patch
+
+    import pytest
+
+    from worker.checkpoint import CheckpointReached, JobCheckpoint
+    from worker.pdf_pipeline import PDFToAudioPipeline, settings
+
+    monkeypatch.setattr(settings, "STREAMING_PIPELINE_ENABLED", True)
+    monkeypatch.setattr(settings, "TTS_ASYNC_SYNTHESIS", True)
+    monkeypatch.setattr(settings, "TTS_ASYNC_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "STREAMING_QUEUE_CHUNKS", 1)
+    pages = [f"Page {n} alpha. Page {n} beta." for n in range(8)]
+    pipeline = PDFToAudioPipeline()
+    checkpoint = JobCheckpoint(1)
+    final_audio = tmp_path / "final.mp3"
+    final_audio.write_bytes(b"mp3")
+
+    class ExpiringTTS(_ConcurrentFakeTTS):
+        async def async_text_to_file(self, text, voice_id, speed, sink):
+            # The first slice runs out as soon as its first chunk is done
+            if not self.closed:
+                checkpoint.deadline = time.monotonic() - 1
+            return sink.write(text.encode())
+
+    split_complete_chunks = pipeline._split_complete_chunks
+    with patch.object(pipeline, "_stream_pages", side_effect=_fake_pages(pages)), \
+         patch.object(pipeline, "_split_complete_chunks", side_effect=lambda text: split_complete_chunks(text, 16)), \
+         patch.object(pipeline.tts_manager, "get_provider", return_value=ExpiringTTS({})), \
+         patch.object(pipeline, "_assemble_audio_chapters", return_value=str(final_audio)) as mock_assemble:
+        with pytest.raises(CheckpointReached):
+            pipeline.process_pdf("book.pdf", work_dir=str(tmp_path), checkpoint=checkpoint)
+
+        assert checkpoint.completed == {0}
+        assert checkpoint.pages_done is not None and checkpoint.pages_done < len(pages)
+
+        checkpoint.deadline = None
+        pipeline.process_pdf("book.pdf", work_dir=str(tmp_path), checkpoint=checkpoint)
+
+    expected = pipeline._chunk_text_for_tts(" ".join(pages), 16)
+    assert checkpoint.chunks == expected
+    assert checkpoint.pages_done is None
+    assert [open(path).read() for path in mock_assemble.call_args.args[0]] == expected
+
+
+def test_stream_pages_reads_and_cleans_each_page(tmp_path):
+    """Test pages are extracted and cleaned one at a time, starting from the requested page"""
+    import fitz
+
+    from worker.pdf_pipeline import PDFToAudioPipeline
+    from worker.timings import StageTimings
+
+    pdf_path = str(tmp_path / "book.pdf")
+    with fitz.open() as doc:
+        for text in ["Page   one has enough text to skip OCR.", "Page two has enough text as well."]:
+            doc.new_page().insert_text((72, 72), text)
+        doc.save(pdf_path)
+    timings = StageTimings()
+
+    pages = list(PDFToAudioPipeline()._stream_pages(pdf_path, 1, None, timings))
+
+    assert pages == [(1, 2, "Page two has enough text as well.")]
+    assert set(timings.as_dict()["stages"]) == {"extract", "cleanup"}
+
+
+def _write_pdf(path, pages, toc=None):
+    """Write a PDF whose pages hold (text, font size) lines, top to bottom."""
+    import fitz
+
+    with fitz.open() as doc:
+        for lines in pages:
+            page = doc.new_page()
+            y = 72
+            for text, size in lines:
+                page.insert_text((72, y), text, fontsize=size)
+                y += size * 2
+        if toc:
+            doc.set_toc(toc)
+        doc.save(str(path))
+    return str(path)
+
+
+def test_outline_chapters_use_its_top_level_and_skip_the_heading_scan(tmp_path):
+    """Test outline entries at the top level become chapters and front matter joins the first"""
+    from unittest.mock import patch
+
+    from worker.pdf_pipeline import PDFToAudioPipeline
+
+    body = [("Some body text on this page.", 11)]
+    pdf_path = _write_pdf(
+        tmp_path / "book.pdf", [body] * 4,
+        toc=[[1, "Part A", 2], [2, "Section", 3], [1, "Part B", 4]],
+    )
+    pipeline = PDFToAudioPipeline()
+
+    with patch("worker.pdf_pipeline._text_lines") as mock_lines:
+        assert pipeline._chapter_plan(pdf_path) == ({1: "Part A", 3: "Part B"}, None)
+        _, segments = pipeline.extract_clean_text(pdf_path)
+
+    mock_lines.assert_not_called()
+    assert [segment.title for segment in segments] == ["Part A", "Part B"]
+    assert segments[0].text.count("Some body text") == 3
+
+
+def test_chapters_from_headings_are_chunked_separately(tmp_path):
+    """Test heading-sized first lines split the text into chapters no chunk spans"""
+    from worker.checkpoint import JobCheckpoint
+    from worker.pdf_pipeline import PDFToAudioPipeline
+    from worker.timings import StageTimings
+
+    body = "Body text set in the regular size for this book."
+    pdf_path = _write_pdf(tmp_path / "book.pdf", [
+        [("Chapter One", 24), (body, 11), (body, 11)],
+        [(body, 11), (body, 11)],
+        [("Chapter Two", 24), (body, 11)],
+    ])
+    pipeline = PDFToAudioPipeline()
+
+    text, segments = pipeline.extract_clean_text(pdf_path)
+
+    assert [segment.title for segment in segments] == ["Chapter One", "Chapter Two"]
+    assert all(segment.source is text for segment in segments)
+    assert segments[1].text.startswith("Chapter Two")
+
+    checkpoint = JobCheckpoint(1)
+    checkpoint.text, checkpoint.segments = text, segments
+    pipeline._prepare_chunks(False, "full", None, None, StageTimings(), checkpoint)
+
+    second = checkpoint.sections[1]["first_chunk"]
+    assert checkpoint.chunks[second].startswith("Chapter Two")
+    assert "Chapter Two" not in " ".join(checkpoint.chunks[:second])
+
+
+def test_headings_are_found_as_each_page_is_read(tmp_path, monkeypatch):
+    """Test only a sample of pages is scanned up front and each page's heading is found when it is read"""
+    from worker import pdf_pipeline
+    from worker.pdf_pipeline import PDFToAudioPipeline
+
+    monkeypatch.setattr(pdf_pipeline, "_HEADING_SAMPLE_PAGES", 1)
+    body = "Body text set in the regular size for this book."
+    pdf_path = _write_pdf(tmp_path / "book.pdf", [
+        [(body, 11), (body, 11)],
+        [("Chapter One", 24), (body, 11)],
+        [(body, 11)],
+        [("Chapter Two", 24), (body, 11)],
+    ])
+    pipeline = PDFToAudioPipeline()
+
+    starts, body_size = pipeline._chapter_plan(pdf_path)
+    assert (starts, body_size) == ({}, 11)
+
+    pages = pipeline._stream_pages(pdf_path, 0, None, None, starts, body_size)
+    assert next(pages) == (0, 4, f"{body} {body}")
+    assert starts == {}
+    assert next(pages)[2] == f"Chapter One {body}"
+    assert starts == {1: "Chapter One"}
+    list(pages)
+    assert starts == {1: "Chapter One", 3: "Chapter Two"}
+
+    text, segments = pipeline.extract_clean_text(pdf_path)
+    assert [segment.title for segment in segments] == ["Chapter One", "Chapter Two"]
+    assert segments[0].text.startswith(body)
+    assert segments[1].text == f"Chapter Two {body}"
+
+
+def test_summary_is_its_own_segment_in_front_of_the_chapters():
+    """Test a summary is prepended without copying the text, and chapters keep their own chunks"""
+    from unittest.mock import patch
+
+    from app.models import ConversionMode
+    from worker.pdf_pipeline import PDFToAudioPipeline
+    from worker.segments import TEXT, Segment, chapter_sections
+
+    text = "Chapter one text. Chapter two text."
+    chapters = [Segment(TEXT, text, 0, 17, "One"), Segment(TEXT, text, 18, 35, "Two")]
+    pipeline = PDFToAudioPipeline()
+
+    with patch.object(pipeline, "_generate_summary", return_value=("Short.", 7)) as mock_summary:
+        segments, tokens = pipeline._get_final_text(chapters, True, ConversionMode.full, None)
+
+    assert mock_summary.call_args.args[0] is text
+    assert tokens == 7
+    assert segments[1:] == chapters
+    chunks, sections = pipeline._chunk_segments(segments)
+    assert chunks == ["Summary of the document: Short.", "Chapter one text.", "Chapter two text."]
+    assert [(s["kind"], s["title"], s["first_chunk"]) for s in chapter_sections(sections)] == [
+        ("summary", "Summary", 0), ("text", "One", 1), ("text", "Two", 2),
+    ]
+
+
+def test_page_stream_starts_a_chunk_at_each_chapter():
+    """Test a streamed chapter start flushes the carried-over text and empty chapters are dropped"""
+    from worker.checkpoint import JobCheckpoint
+    from worker.pdf_pipeline import PDFToAudioPipeline, _PageChunkStream
+    from worker.timings import StageTimings
+
+    pipeline = PDFToAudioPipeline()
+    pages = ["One a.", "One b.", "", "Three a."]
+    checkpoint = JobCheckpoint(1)
+    checkpoint.chunks, checkpoint.pages_done = [], 0
+    checkpoint.sections = [{"kind": "text", "title": None, "voice": None, "first_chunk": 0}]
+
+    stream = _PageChunkStream(
+        _fake_pages(pages)(None), checkpoint,
+        lambda text: pipeline._split_complete_chunks(text, 100), StageTimings(), 4,
+        {0: "One", 2: "Two", 3: "Three"},
+    )
+    streamed = list(stream)
+    stream.close()
+
+    assert streamed == ["One a. One b.", "Three a."]
+    assert checkpoint.sections == [
+        {"kind": "text", "title": "One", "voice": None, "first_chunk": 0},
+        {"kind": "text", "title": "Three", "voice": None, "first_chunk": 1},
+    ]
+
+
+def test_assemble_writes_chapter_files_alongside_the_full_audio(tmp_path):
+    """Test each chapter's chunk range is joined into its own file as well as the combined one"""
+    from unittest.mock import patch
+
+    from worker.pdf_pipeline import PDFToAudioPipeline
+
+    chunk_files = [f"chunk_{i}.mp3" for i in range(5)]
+    chapters = [{"title": "One", "first_chunk": 0}, {"title": "Two", "first_chunk": 2}]
+
+    with patch.object(PDFToAudioPipeline, "_concat_audio", side_effect=lambda files, path: path) as mock_concat:
+        output = PDFToAudioPipeline()._assemble_audio_chapters(chunk_files, str(tmp_path), chapters)
+
+    assert output == str(tmp_path / "final_output.mp3")
+    assert [(c.args[0], os.path.basename(c.args[1])) for c in mock_concat.call_args_list] == [
+        (chunk_files, "final_output.mp3"),
+        (chunk_files[:2], "chapter_001.mp3"),
+        (chunk_files[2:], "chapter_002.mp3"),
+    ]
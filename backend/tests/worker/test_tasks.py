@@ -41,7 +41,7 @@ def test_process_pdf_task_success(
     assert result["status"] == "completed"
     # final_cost = 0.05 + (50 / 1_000_000) * 2.0 = 0.0501
     mock_job_service.update_job_status.assert_any_call(1, JobStatus.processing, 0)
-    mock_job_service.update_job_status.assert_any_call(1, JobStatus.completed, 100, estimated_cost=ANY, chars_processed=1000, tokens_used=50)
+    mock_job_service.update_job_status.assert_any_call(1, JobStatus.completed, 100, estimated_cost=ANY, chars_processed=1000, tokens_used=50, timings=ANY)
     mock_storage_service.download_file.assert_called_with("test.pdf")
     mock_pipeline.process_pdf.assert_called_once_with(
         pdf_path=ANY,
@@ -51,7 +51,11 @@ def test_process_pdf_task_success(
         include_summary=False,
         conversion_mode=ConversionMode.full,
         progress_callback=ANY,
-        work_dir=ANY
+        work_dir=ANY,
+        cancel_check=ANY,
+        timings=ANY,
+        tts_fallbacks=None,
+        checkpoint=ANY,
     )
     mock_storage_service.upload_large_file.assert_called_with(
         "audio_path", "audio/1/1.mp3", "audio/mpeg"
@@ -94,7 +98,7 @@ def test_process_pdf_task_success_summary_explanation(
     assert result["status"] == "completed"
     # final_cost = 0.12 + (500 / 1_000_000) * 2.0 = 0.121
     mock_job_service.update_job_status.assert_any_call(2, JobStatus.processing, 0)
-    mock_job_service.update_job_status.assert_any_call(2, JobStatus.completed, 100, estimated_cost=ANY, chars_processed=8000, tokens_used=500)
+    mock_job_service.update_job_status.assert_any_call(2, JobStatus.completed, 100, estimated_cost=ANY, chars_processed=8000, tokens_used=500, timings=ANY)
     mock_storage_service.download_file.assert_called_with("science.pdf")
     mock_pipeline.process_pdf.assert_called_once_with(
         pdf_path=ANY,
@@ -104,47 +108,519 @@ def test_process_pdf_task_success_summary_explanation(
         include_summary=False,
         conversion_mode=ConversionMode.summary_explanation,
         progress_callback=ANY,
-        work_dir=ANY
+        work_dir=ANY,
+        cancel_check=ANY,
+        timings=ANY,
+        tts_fallbacks=None,
+        checkpoint=ANY,
     )
     mock_storage_service.upload_large_file.assert_called_with(
         "audio_path", "audio/1/2.mp3", "audio/mpeg"
     )
 
 
-from datetime import datetime, timedelta
 from worker.tasks import cleanup_old_files
 
 
+def _checkpoint_job(job_id):
+    return Job(
+        id=job_id,
+        pdf_s3_key="book.pdf",
+        voice_provider=VoiceProvider.openai,
+        voice_type="default",
+        reading_speed=1.0,
+        include_summary=False,
+        conversion_mode=ConversionMode.full,
+        user_id=1,
+    )
+
+
+@patch("worker.tasks.enqueue_pdf_processing")
 @patch("worker.tasks.StorageService")
+@patch("worker.tasks.JobService")
 @patch("worker.tasks.SessionLocal")
-def test_cleanup_old_files(MockSessionLocal, MockStorageService):
-    # Arrange
-    mock_db = MagicMock()
-    MockSessionLocal.return_value = mock_db
+@patch("worker.tasks.pipeline")
+def test_process_pdf_task_checkpoints_and_queues_continuation(
+    mock_pipeline, MockSessionLocal, MockJobService, MockStorageService, mock_enqueue
+):
+    import json
+    import os
+
+    from worker.checkpoint import CheckpointReached
+
+    mock_db = MockSessionLocal.return_value
+    mock_db.query.return_value.filter.return_value.first.return_value = _checkpoint_job(3)
     mock_storage_service = MockStorageService.return_value
+    mock_storage_service.download_file.return_value = b"%PDF"
 
-    old_job = Job(
-        id=1,
-        pdf_s3_key="old.pdf",
-        audio_s3_key="old.mp3",
-        status=JobStatus.completed,
-        completed_at=datetime.now() - timedelta(days=31),
+    def run_out_of_time(**kwargs):
+        checkpoint = kwargs["checkpoint"]
+        checkpoint.chunks, checkpoint.tokens = ["one", "two", "three"], 40
+        for index in (0, 1):
+            with open(os.path.join(kwargs["work_dir"], f"chunk_{index:04d}.mp3"), "wb") as f:
+                f.write(b"audio")
+            checkpoint.completed.add(index)
+        raise CheckpointReached(2, 3)
+
+    mock_pipeline.process_pdf.side_effect = run_out_of_time
+
+    result = process_pdf_task(3)
+
+    assert result == {"status": "checkpointed", "job_id": 3, "completed": 2, "total": 3}
+    uploaded_chunks = [c.args[1] for c in mock_storage_service.upload_large_file.call_args_list]
+    assert uploaded_chunks == ["checkpoints/3/chunk_0000.mp3", "checkpoints/3/chunk_0001.mp3"]
+    state, key, _ = mock_storage_service.upload_file_data.call_args.args
+    assert key == "checkpoints/3/state.json"
+    state = json.loads(state)
+    assert list(state.pop("timings")["stages"]) == ["download"]
+    assert state == {
+        "text": None, "chunks": ["one", "two", "three"], "pages_done": None, "pending_text": "",
+        "segments": [], "sections": [], "completed": [0, 1], "served_chars": [], "tokens": 40, "slices": 1,
+    }
+    mock_enqueue.assert_called_once_with(3, "medium", resume=True)
+    assert JobStatus.failed not in [c.args[1] for c in MockJobService.return_value.update_job_status.call_args_list]
+
+
+@patch("worker.tasks.enqueue_pdf_processing")
+@patch("worker.tasks.StorageService")
+@patch("worker.tasks.JobService")
+@patch("worker.tasks.SessionLocal")
+@patch("worker.tasks.pipeline")
+def test_process_pdf_task_continuation_resumes_and_cleans_up_checkpoint(
+    mock_pipeline, MockSessionLocal, MockJobService, MockStorageService, mock_enqueue
+):
+    import json
+
+    mock_db = MockSessionLocal.return_value
+    mock_db.query.return_value.filter.return_value.first.return_value = _checkpoint_job(4)
+    mock_storage_service = MockStorageService.return_value
+    earlier_timings = {
+        "stages": {
+            "download": {"wall_s": 0.5, "cpu_s": 0.1, "bytes": 100, "count": 1},
+            "extract": {"wall_s": 2.0, "cpu_s": 1.5, "bytes": 50, "count": 1},
+            "tts": {"wall_s": 30.0, "cpu_s": 1.0, "bytes": 900, "count": 1},
+        },
+        "tts_latencies": [1.0], "tts_chars": 3, "tts_providers": {"openai": 1}, "first_chunk_s": 3.5,
+    }
+    state = {"chunks": ["one", "two"], "completed": [0], "tokens": 40, "slices": 1, "timings": earlier_timings}
+    mock_storage_service.download_file.side_effect = lambda key: (
+        json.dumps(state).encode() if key.endswith("state.json") else b"audio"
     )
-    new_job = Job(
-        id=2,
-        pdf_s3_key="new.pdf",
-        audio_s3_key="new.mp3",
-        status=JobStatus.completed,
-        completed_at=datetime.now() - timedelta(days=1),
+    mock_pipeline.process_pdf.return_value = ("audio_path", 0.05, {"chars": 6, "tokens": 40})
+
+    result = process_pdf_task(4, resume=True)
+
+    assert result["status"] == "completed"
+    # The job keeps the earlier slice's stages, added to this slice's
+    timings = next(
+        c.kwargs["timings"] for c in MockJobService.return_value.update_job_status.call_args_list
+        if c.args[1] == JobStatus.completed
+    )
+    assert list(timings["stages"]) == ["download", "extract", "tts", "upload"]
+    assert timings["stages"]["download"]["count"] == 2
+    assert timings["stages"]["extract"] == earlier_timings["stages"]["extract"]
+    assert (timings["tts_chunks"]["count"], timings["tts_chunks"]["first_chunk_s"]) == (1, 3.5)
+    checkpoint = mock_pipeline.process_pdf.call_args.kwargs["checkpoint"]
+    assert (checkpoint.chunks, checkpoint.completed, checkpoint.slices) == (["one", "two"], {0}, 1)
+    downloaded = [c.args[0] for c in mock_storage_service.download_file.call_args_list]
+    assert "book.pdf" not in downloaded
+    mock_storage_service.delete_files.assert_called_once_with(
+        ["checkpoints/4/state.json", "checkpoints/4/chunk_0000.mp3"]
+    )
+    mock_enqueue.assert_not_called()
+
+
+@patch("worker.tasks.enqueue_pdf_processing")
+@patch("worker.tasks.StorageService")
+@patch("worker.tasks.JobService")
+@patch("worker.tasks.SessionLocal")
+@patch("worker.tasks.pipeline")
+def test_process_pdf_task_continuation_of_streamed_slice_downloads_pdf(
+    mock_pipeline, MockSessionLocal, MockJobService, MockStorageService, mock_enqueue
+):
+    import json
+    from worker.checkpoint import CheckpointReached
+
+    mock_db = MockSessionLocal.return_value
+    mock_db.query.return_value.filter.return_value.first.return_value = _checkpoint_job(6)
+    mock_storage_service = MockStorageService.return_value
+    state = {
+        "chunks": ["one"], "pages_done": 3, "pending_text": "two",
+        "completed": [0], "tokens": 0, "slices": 1,
+    }
+    mock_storage_service.download_file.side_effect = lambda key: (
+        json.dumps(state).encode() if key.endswith("state.json") else b"data"
     )
-    mock_db.query.return_value.filter.return_value.all.return_value = [old_job]
+
+    def read_one_more_page(**kwargs):
+        assert open(kwargs["pdf_path"], "rb").read() == b"data"
+        kwargs["checkpoint"].pages_done = 4
+        raise CheckpointReached(1, 2)
+
+    mock_pipeline.process_pdf.side_effect = read_one_more_page
+
+    result = process_pdf_task(6, resume=True)
+
+    # Reading a page counts as progress even without a new chunk
+    assert result["status"] == "checkpointed"
+    checkpoint = mock_pipeline.process_pdf.call_args.kwargs["checkpoint"]
+    assert checkpoint.pending_text == "two"
+    downloaded = [c.args[0] for c in mock_storage_service.download_file.call_args_list]
+    assert "book.pdf" in downloaded
+    mock_enqueue.assert_called_once_with(6, "medium", resume=True)
+
+
+@patch("worker.tasks.enqueue_pdf_processing")
+@patch("worker.tasks.StorageService")
+@patch("worker.tasks.JobService")
+@patch("worker.tasks.SessionLocal")
+@patch("worker.tasks.pipeline")
+def test_process_pdf_task_fails_when_a_slice_makes_no_progress(
+    mock_pipeline, MockSessionLocal, MockJobService, MockStorageService, mock_enqueue
+):
+    from celery.exceptions import SoftTimeLimitExceeded
+
+    mock_db = MockSessionLocal.return_value
+    mock_db.query.return_value.filter.return_value.first.return_value = _checkpoint_job(5)
+    MockStorageService.return_value.download_file.return_value = b"%PDF"
+
+    def stuck(**kwargs):
+        kwargs["checkpoint"].chunks = ["one"]
+        raise SoftTimeLimitExceeded()
+
+    mock_pipeline.process_pdf.side_effect = stuck
+
+    result = process_pdf_task(5)
+
+    assert result == {"status": "failed", "job_id": 5}
+    mock_enqueue.assert_not_called()
+    MockJobService.return_value.update_job_status.assert_called_with(
+        5, JobStatus.failed, error_message="The job made no progress within the task time limit.", timings=ANY
+    )
+
+
+@patch("worker.tasks.enqueue_pdf_processing")
+@patch("worker.tasks.StorageService")
+@patch("worker.tasks.JobService")
+@patch("worker.tasks.SessionLocal")
+@patch("worker.tasks.pipeline")
+def test_process_pdf_task_fails_when_the_time_limit_fires_during_the_resume_download(
+    mock_pipeline, MockSessionLocal, MockJobService, MockStorageService, mock_enqueue
+):
+    import json
+    from celery.exceptions import SoftTimeLimitExceeded
+
+    mock_db = MockSessionLocal.return_value
+    mock_db.query.return_value.filter.return_value.first.return_value = _checkpoint_job(6)
+    state = {
+        "chunks": ["one"], "pages_done": 3, "pending_text": "two",
+        "completed": [0], "tokens": 0, "slices": 1,
+    }
+
+    def download(key):
+        if key == "book.pdf":
+            raise SoftTimeLimitExceeded()
+        return json.dumps(state).encode() if key.endswith("state.json") else b"data"
+
+    MockStorageService.return_value.download_file.side_effect = download
+
+    result = process_pdf_task(6, resume=True)
+
+    assert result == {"status": "failed", "job_id": 6}
+    mock_pipeline.process_pdf.assert_not_called()
+    mock_enqueue.assert_not_called()
+    MockJobService.return_value.update_job_status.assert_called_with(
+        6, JobStatus.failed, error_message="The job made no progress within the task time limit.", timings=ANY
+    )
+
+
+@patch("worker.tasks.JobService")
+@patch("worker.tasks.SessionLocal")
+def test_cleanup_old_files(MockSessionLocal, MockJobService):
+    # Arrange
+    mock_db = MagicMock()
+    MockSessionLocal.return_value = mock_db
+    mock_job_service = MockJobService.return_value
+    mock_job_service.purge_jobs.return_value = 1
 
     # Act
     result = cleanup_old_files()
 
     # Assert
     assert result == "Cleaned up 1 old jobs"
-    mock_storage_service.delete_file.assert_any_call("old.pdf")
-    mock_storage_service.delete_file.assert_any_call("old.mp3")
-    mock_db.delete.assert_called_with(old_job)
-    mock_db.commit.assert_called_once()
+    MockJobService.assert_called_once_with(mock_db)
+    mock_job_service.purge_jobs.assert_called_once()
+    mock_db.close.assert_called_once()
+
+
+@patch("worker.tasks.JobService")
+@patch("worker.tasks.SessionLocal")
+def test_cleanup_old_files_nothing_to_do(MockSessionLocal, MockJobService):
+    # Arrange
+    MockJobService.return_value.purge_jobs.return_value = 0
+
+    # Act
+    result = cleanup_old_files()
+
+    # Assert
+    assert result == "No old jobs to clean up."
+
+
+@patch("worker.producer.celery_app")
+def test_enqueue_pdf_processing_sends_task_by_name(mock_celery_app):
+    from worker.producer import PROCESS_PDF_TASK, enqueue_pdf_processing
+
+    # Act
+    enqueue_pdf_processing(7)
+
+    # Assert
+    assert PROCESS_PDF_TASK == process_pdf_task.name
+    mock_celery_app.send_task.assert_called_once_with(
+        PROCESS_PDF_TASK,
+        args=[7],
+        task_id="process_pdf-7",
+        queue="pdf_medium",
+        soft_time_limit=25 * 60,
+        time_limit=30 * 60,
+    )
+
+
+@patch("worker.producer.celery_app")
+def test_enqueue_pdf_processing_routes_by_size_tier(mock_celery_app):
+    from worker.celery_app import PDF_QUEUE_TIERS
+    from worker.producer import enqueue_pdf_processing
+
+    # Act
+    enqueue_pdf_processing(7, "small")
+    enqueue_pdf_processing(8, "large")
+
+    # Assert
+    small_call, large_call = mock_celery_app.send_task.call_args_list
+    assert small_call.kwargs["queue"] == "pdf_small"
+    assert small_call.kwargs["time_limit"] == PDF_QUEUE_TIERS["small"]["time_limit"]
+    assert large_call.kwargs["queue"] == "pdf_large"
+    assert large_call.kwargs["time_limit"] > PDF_QUEUE_TIERS["medium"]["time_limit"]
+
+
+@patch("worker.producer.settings")
+@patch("worker.producer.celery_app")
+def test_enqueue_pdf_processing_uses_stage_queues_when_enabled(mock_celery_app, mock_settings):
+    from worker.producer import EXTRACT_PDF_TASK, PROCESS_PDF_TASK, enqueue_pdf_processing
+
+    mock_settings.WORKER_STAGE_QUEUES = True
+
+    # Act
+    enqueue_pdf_processing(7, "large")
+    enqueue_pdf_processing(7, "large", resume=True)
+
+    # Assert
+    extract_call, synthesis_call = mock_celery_app.send_task.call_args_list
+    assert extract_call.args == (EXTRACT_PDF_TASK,)
+    assert extract_call.kwargs["queue"] == "pdf_cpu"
+    assert extract_call.kwargs["kwargs"] == {"size_tier": "large"}
+    assert synthesis_call.args == (PROCESS_PDF_TASK,)
+    assert synthesis_call.kwargs["queue"] == "pdf_io"
+    assert synthesis_call.kwargs["kwargs"] == {"resume": True, "size_tier": "large"}
+    assert extract_call.kwargs["task_id"] == synthesis_call.kwargs["task_id"] == "process_pdf-7"
+
+
+@patch("worker.tasks.enqueue_pdf_processing")
+@patch("worker.tasks.StorageService")
+@patch("worker.tasks.JobService")
+@patch("worker.tasks.SessionLocal")
+@patch("worker.tasks.pipeline")
+def test_extract_pdf_task_saves_text_and_hands_off_to_io_stage(
+    mock_pipeline, MockSessionLocal, MockJobService, MockStorageService, mock_enqueue
+):
+    import json
+
+    from worker.tasks import extract_pdf_task
+
+    mock_db = MockSessionLocal.return_value
+    mock_db.query.return_value.filter.return_value.first.return_value = _checkpoint_job(6)
+    mock_storage_service = MockStorageService.return_value
+    mock_storage_service.download_file.return_value = b"%PDF"
+    from worker.segments import TEXT, Segment
+
+    segments = [Segment(TEXT, "Cleaned text.", 0, 7, "One"), Segment(TEXT, "Cleaned text.", 8, 13, "Two")]
+
+    def extract(pdf_path, progress_callback, cancel_check, timings):
+        with timings.stage("extract"):
+            return "Cleaned text.", segments
+
+    mock_pipeline.extract_clean_text.side_effect = extract
+
+    result = extract_pdf_task(6, size_tier="small")
+
+    assert result == {"status": "extracted", "job_id": 6}
+    state, key, _ = mock_storage_service.upload_file_data.call_args.args
+    assert key == "checkpoints/6/state.json"
+    assert json.loads(state)["text"] == "Cleaned text."
+    assert json.loads(state)["segments"] == [segment.to_dict() for segment in segments]
+    # Handed to the I/O stage, which merges them into the job's timings
+    assert list(json.loads(state)["timings"]["stages"]) == ["download", "extract"]
+    mock_enqueue.assert_called_once_with(6, "small", resume=True)
+    mock_pipeline.process_pdf.assert_not_called()
+
+
+@patch("worker.tasks.StorageService")
+@patch("worker.tasks.JobService")
+@patch("worker.tasks.SessionLocal")
+@patch("worker.tasks.pipeline")
+def test_process_pdf_task_uploads_chapter_audio(
+    mock_pipeline, MockSessionLocal, MockJobService, MockStorageService
+):
+    import os
+
+    job = _checkpoint_job(7)
+    MockSessionLocal.return_value.query.return_value.filter.return_value.first.return_value = job
+    mock_storage_service = MockStorageService.return_value
+    mock_storage_service.download_file.return_value = b"%PDF"
+
+    def convert_with_chapters(**kwargs):
+        kwargs["checkpoint"].sections = [
+            {"kind": "text", "title": "One", "voice": None, "first_chunk": 0},
+            {"kind": "text", "title": "Two", "voice": None, "first_chunk": 3},
+        ]
+        for number in (1, 2):
+            with open(os.path.join(kwargs["work_dir"], f"chapter_{number:03d}.mp3"), "wb") as f:
+                f.write(b"audio")
+        return "audio_path", 0.0, {"chars": 10, "tokens": 0}
+
+    mock_pipeline.process_pdf.side_effect = convert_with_chapters
+
+    result = process_pdf_task(7)
+
+    assert result["status"] == "completed"
+    uploaded = [c.args[1] for c in mock_storage_service.upload_large_file.call_args_list]
+    assert uploaded == ["audio/1/7.mp3", "audio/1/7/chapter_001.mp3", "audio/1/7/chapter_002.mp3"]
+    assert job.chapters == [
+        {"title": "One", "audio_s3_key": "audio/1/7/chapter_001.mp3"},
+        {"title": "Two", "audio_s3_key": "audio/1/7/chapter_002.mp3"},
+    ]
+
+
+@patch("worker.tasks.StorageService")
+@patch("worker.tasks.JobService")
+@patch("worker.tasks.SessionLocal")
+@patch("worker.tasks.pipeline")
+def test_process_pdf_task_system_error_retries_from_checkpoint(
+    mock_pipeline, MockSessionLocal, MockJobService, MockStorageService
+):
+    import os
+
+    MockSessionLocal.return_value.query.return_value.filter.return_value.first.return_value = _checkpoint_job(8)
+    mock_storage_service = MockStorageService.return_value
+    mock_storage_service.download_file.return_value = b"%PDF"
+
+    def fail_after_two_chunks(**kwargs):
+        checkpoint = kwargs["checkpoint"]
+        checkpoint.chunks = ["one", "two", "three"]
+        for index in (0, 1):
+            with open(os.path.join(kwargs["work_dir"], f"chunk_{index:04d}.mp3"), "wb") as f:
+                f.write(b"audio")
+            checkpoint.completed.add(index)
+        raise RuntimeError("provider outage")
+
+    mock_pipeline.process_pdf.side_effect = fail_after_two_chunks
+
+    with patch.object(process_pdf_task, "retry", side_effect=RuntimeError("retrying")) as mock_retry, \
+         pytest.raises(RuntimeError, match="retrying"):
+        process_pdf_task(8)
+
+    assert mock_retry.call_args.kwargs["kwargs"] == {"resume": True}
+    uploaded = [c.args[1] for c in mock_storage_service.upload_large_file.call_args_list]
+    assert uploaded == ["checkpoints/8/chunk_0000.mp3", "checkpoints/8/chunk_0001.mp3"]
+    mock_storage_service.delete_files.assert_not_called()
+
+
+@patch("worker.tasks.settings")
+@patch("worker.tasks.engine")
+@patch("worker.tasks.pipeline")
+def test_warm_worker_process_rebuilds_clients_after_fork(mock_pipeline, mock_engine, mock_settings):
+    from worker.tasks import warm_worker_process
+
+    # Arrange
+    mock_settings.WORKER_WARM_TTS_PROVIDERS = ["google"]
+
+    # Act
+    warm_worker_process()
+
+    # Assert
+    mock_engine.dispose.assert_called_once_with(close=False)
+    mock_pipeline.tts_manager.reset.assert_called_once()
+    mock_pipeline.tts_manager.warm_up.assert_called_once_with(["google"])
+
+
+@patch("worker.tasks.cancellation_store")
+@patch("worker.tasks.StorageService")
+@patch("worker.tasks.JobService")
+@patch("worker.tasks.SessionLocal")
+@patch("worker.tasks.pipeline")
+def test_process_pdf_task_cancelled_mid_run(
+    mock_pipeline, MockSessionLocal, MockJobService, MockStorageService, mock_cancellation_store
+):
+    from worker.pdf_pipeline import JobCancelledError
+
+    # Arrange
+    mock_db = MagicMock()
+    MockSessionLocal.return_value = mock_db
+    mock_job_service = MockJobService.return_value
+    job = Job(id=4, pdf_s3_key="test.pdf", voice_provider=VoiceProvider.openai, voice_type="default",
+              reading_speed=1.0, include_summary=False, conversion_mode=ConversionMode.full, user_id=1)
+    mock_db.query.return_value.filter.return_value.first.return_value = job
+    MockStorageService.return_value.download_file.return_value = b"%PDF"
+    mock_cancellation_store.is_requested.return_value = False
+    mock_pipeline.process_pdf.side_effect = JobCancelledError("Job was cancelled")
+
+    # Act
+    result = process_pdf_task(4)
+
+    # Assert
+    assert result == {"status": "cancelled", "job_id": 4}
+    mock_job_service.update_job_status.assert_called_with(4, JobStatus.cancelled, timings=ANY)
+    MockStorageService.return_value.upload_large_file.assert_not_called()
+    mock_cancellation_store.clear.assert_called_once_with(4)
+
+
+@patch("worker.tasks.cancellation_store")
+@patch("worker.tasks.StorageService")
+@patch("worker.tasks.JobService")
+@patch("worker.tasks.SessionLocal")
+@patch("worker.tasks.pipeline")
+def test_process_pdf_task_skips_job_cancelled_while_queued(
+    mock_pipeline, MockSessionLocal, MockJobService, MockStorageService, mock_cancellation_store
+):
+    # Arrange
+    mock_db = MagicMock()
+    MockSessionLocal.return_value = mock_db
+    job = Job(id=5, pdf_s3_key="test.pdf", status=JobStatus.cancelled, user_id=1)
+    mock_db.query.return_value.filter.return_value.first.return_value = job
+
+    # Act
+    result = process_pdf_task(5)
+
+    # Assert
+    assert result == {"status": "cancelled", "job_id": 5}
+    mock_pipeline.process_pdf.assert_not_called()
+    MockJobService.return_value.update_job_status.assert_not_called()
+
+
+@pytest.mark.parametrize("pool, concurrency, expected", [("threads", 32, 32), ("prefork", 4, 1)])
+def test_azure_pool_is_sized_to_the_tasks_one_process_runs(monkeypatch, pool, concurrency, expected):
+    """Test a threads worker gives Azure one synthesizer per concurrent task, a prefork child just one"""
+    from types import SimpleNamespace
+
+    from worker.pdf_pipeline import AzureTTS, set_tasks_per_process, settings
+    from worker.tasks import preload_provider_sdks
+
+    monkeypatch.setenv("AZURE_SPEECH_KEY", "key")
+    monkeypatch.setenv("AZURE_SPEECH_REGION", "westus")
+    monkeypatch.setattr(settings, "AZURE_SYNTHESIZER_POOL_SIZE", None)
+    monkeypatch.setattr(settings, "TTS_ASYNC_SYNTHESIS", False)
+    monkeypatch.setattr(settings, "WORKER_WARM_TTS_PROVIDERS", [])
+    try:
+        preload_provider_sdks(sender=SimpleNamespace(pool_cls=pool, concurrency=concurrency))
+        assert AzureTTS()._pool.size == expected
+    finally:
+        set_tasks_per_process(1)
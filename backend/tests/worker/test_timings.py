@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from worker.timings import StageTimings
+
+
+def test_stage_records_wall_cpu_and_bytes():
+    timings = StageTimings()
+
+    with patch("worker.timings.time.perf_counter", side_effect=[10.0, 12.5]), \
+         patch("worker.timings.time.process_time", side_effect=[1.0, 1.5]):
+        with timings.stage("extract") as stage:
+            stage["bytes"] = 2048
+
+    assert timings.as_dict()["stages"]["extract"] == {
+        "wall_s": 2.5, "cpu_s": 0.5, "bytes": 2048, "count": 1
+    }
+
+
+def test_repeated_stages_accumulate_in_pipeline_order():
+    timings = StageTimings()
+
+    for _ in range(3):
+        with timings.stage("tts") as stage:
+            stage["bytes"] = 100
+    with timings.stage("download"):
+        pass
+
+    result = timings.as_dict()
+    assert list(result["stages"]) == ["download", "tts"]
+    assert result["stages"]["tts"]["count"] == 3
+    assert result["stages"]["tts"]["bytes"] == 300
+
+
+def test_tts_chunk_summary():
+    timings = StageTimings()
+    for seconds in [0.1, 0.2, 0.3, 0.4, 2.0]:
+        timings.record_tts_chunk(seconds, 1000)
+
+    summary = timings.as_dict()["tts_chunks"]
+
+    assert summary["count"] == 5
+    assert summary["chars"] == 5000
+    assert summary["p50_s"] == 0.3
+    assert summary["max_s"] == 2.0
+    assert summary["first_chunk_s"] >= 0
+
+
+def test_merged_adds_earlier_slices_and_offsets_the_first_chunk():
+    earlier = StageTimings()
+    with earlier.stage("extract") as stage:
+        stage["bytes"] = 10
+    earlier.stages["extract"]["wall_s"] = 2.0
+    timings = StageTimings()
+    with timings.stage("extract") as stage:
+        stage["bytes"] = 5
+    timings.first_chunk_s = 1.0
+    timings.record_tts_chunk(0.5, 100, "google")
+
+    merged = timings.merged(earlier.state()).as_dict()
+
+    assert merged["stages"]["extract"]["count"] == 2
+    assert merged["stages"]["extract"]["bytes"] == 15
+    # No chunk in the earlier slice: the first one came after its work
+    assert merged["tts_chunks"]["first_chunk_s"] >= 3.0
+    assert merged["tts_chunks"]["providers"] == {"google": 1}
+    assert timings.merged(None) is timings
@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock, patch
+
+import redis
+from prometheus_client import REGISTRY
+
+from worker.metrics import (
+    QueueDepthCollector,
+    observe_timings,
+    observe_tts_request,
+    record_tts_error,
+)
+from worker.timings import StageTimings
+
+
+def _sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_tts_request_and_error_counters_are_labelled_by_provider():
+    """Test TTS latency, characters and errors are recorded per provider"""
+    before_chars = _sample("tts_characters_total", {"provider": "metrics-test"})
+    before_errors = _sample("tts_errors_total", {"provider": "metrics-test"})
+
+    observe_tts_request("metrics-test", 0.4, 120)
+    record_tts_error("metrics-test")
+
+    assert _sample("tts_characters_total", {"provider": "metrics-test"}) == before_chars + 120
+    assert _sample("tts_errors_total", {"provider": "metrics-test"}) == before_errors + 1
+    assert _sample("tts_request_duration_seconds_count", {"provider": "metrics-test"}) >= 1
+
+
+def test_observe_timings_records_each_stage():
+    """Test every timed stage of a job lands in the stage histogram"""
+    timings = StageTimings()
+    with timings.stage("assembly"):
+        pass
+    before = _sample("pipeline_stage_duration_seconds_count", {"stage": "assembly"})
+
+    observe_timings(timings)
+
+    assert _sample("pipeline_stage_duration_seconds_count", {"stage": "assembly"}) == before + 1
+
+
+def test_queue_depth_collector_reads_queue_lengths():
+    """Test the collector reports LLEN per queue and tolerates an unreachable broker"""
+    client = MagicMock()
+    client.llen.side_effect = lambda queue: {"pdf_small": 3, "pdf_large": 1}[queue]
+    collector = QueueDepthCollector("redis://broker:6379/0", ["pdf_small", "pdf_large"])
+
+    with patch("worker.metrics.redis.from_url", return_value=client):
+        family = next(collector.collect())
+
+    assert {s.labels["queue"]: s.value for s in family.samples} == {"pdf_small": 3, "pdf_large": 1}
+
+    client.llen.side_effect = redis.ConnectionError("down")
+    assert next(collector.collect()).samples == []
+
+
+def test_worker_start_prepares_multiproc_dir_with_the_exporter_off(tmp_path, monkeypatch):
+    """Test the sample directory exists (and is emptied) even when WORKER_METRICS_PORT is 0"""
+    from app.core.config import settings
+    from worker.metrics import _start_exporter
+
+    multiproc_dir = tmp_path / "prometheus"
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(multiproc_dir))
+    monkeypatch.setattr(settings, "WORKER_METRICS_PORT", 0)
+
+    with patch("worker.metrics.start_metrics_server") as mock_start:
+        _start_exporter()
+        (multiproc_dir / "histogram_1.db").write_bytes(b"stale")
+        _start_exporter()
+
+    assert multiproc_dir.is_dir()
+    assert list(multiproc_dir.iterdir()) == []
+    mock_start.assert_not_called()
@@ -0,0 +1,90 @@
+"""
+Cold import cost of the API and worker entry modules.
+
+Each module is imported in a fresh interpreter so nothing is shared between
+measurements. Reports wall time, peak RSS and which heavy SDKs ended up in
+sys.modules, as JSON on stdout.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 3] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BACKEND_DIR = os.path.join(REPO_ROOT, "backend")
+
+MODULES = ["worker.pdf_pipeline", "worker.tasks", "worker.producer", "main"]
+
+HEAVY_MODULES = [
+    "fitz",
+    "pytesseract",
+    "pdf2image",
+    "openai",
+    "google.cloud.texttospeech",
+    "boto3",
+    "azure.cognitiveservices.speech",
+    "elevenlabs",
+]
+
+_PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, {repo_root!r})
+sys.path.insert(0, {backend_dir!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(module: str) -> dict:
+    code = _PROBE.format(
+        repo_root=REPO_ROOT, backend_dir=BACKEND_DIR, module=module, heavy=HEAVY_MODULES
+    )
+    env = dict(os.environ, TESTING_MODE="true")
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, cwd=REPO_ROOT
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr else "failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = {}
+    for module in MODULES:
+        runs = [measure(module) for _ in range(args.repeat)]
+        ok = [r for r in runs if "error" not in r]
+        if not ok:
+            report[module] = runs[0]
+            continue
+        report[module] = {
+            "median_seconds": round(statistics.median(r["seconds"] for r in ok), 4),
+            "max_rss_mb": round(max(r["max_rss_mb"] for r in ok), 1),
+            "heavy_modules_loaded": ok[-1]["loaded"],
+        }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Offline benchmark of the PDF-to-audio pipeline stages.
+
+Generates synthetic PDFs (digital, scanned, mixed) of several sizes and times
+text extraction/OCR, cleanup, the LLM step (against a local stub with a fixed
+latency), chunking, synthesis through MockTTS at several concurrency levels,
+and ffmpeg assembly. Nothing leaves the machine. Stages whose system binaries
+are missing (tesseract/poppler for OCR, ffmpeg for assembly) are reported as
+errors or skipped rather than aborting the run. Results are JSON on stdout.
+
+Usage:
+    python benchmarks/pipeline.py [--kinds digital,mixed] [--pages 5,50] \
+        [--mode full] [--tts-latency 0.2] [--llm-latency 1.0] \
+        [--concurrency 1,4,8] [--max-chunks 40] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "backend"))
+
+# No Redis, S3 or real providers: the worker modules fall back to local stand-ins
+os.environ.setdefault("TESTING_MODE", "true")
+
+from benchmarks.synthetic import KINDS, make_pdf  # noqa: E402
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class StubLLM:
+    """Stands in for `_call_llm_with_retry`: waits `latency_s`, echoes a prefix of the input."""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.calls = 0
+
+    def __call__(self, system_prompt, user_content, max_tokens, temperature, max_retries=2, cancel_check=None):
+        self.calls += 1
+        time.sleep(self.latency_s)
+        content = user_content[: max_tokens * 4]
+        return content, (len(system_prompt) + len(user_content) + len(content)) // 4
+
+
+def _synthesize(tts, chunks: List[str], work_dir: str, concurrency: int) -> dict:
+    def synthesize_one(item):
+        index, chunk = item
+        path = os.path.join(work_dir, f"chunk_{index:04d}.mp3")
+        with open(path, "wb") as f:
+            tts.text_to_file(chunk, "default", 1.0, f)
+        return path
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        paths = list(executor.map(synthesize_one, enumerate(chunks)))
+    elapsed = time.perf_counter() - started
+    chars = sum(len(chunk) for chunk in chunks)
+    return {
+        "paths": paths,
+        "result": {
+            "wall_s": round(elapsed, 4),
+            "chunks_per_s": round(len(chunks) / elapsed, 2) if elapsed else 0.0,
+            "chars_per_s": round(chars / elapsed, 1) if elapsed else 0.0,
+        },
+    }
+
+
+def run_case(kind: str, pages: int, args) -> dict:
+    from worker.pdf_pipeline import MockTTS, PDFToAudioPipeline
+    from worker.segments import TEXT, Segment
+    from worker.timings import StageTimings
+
+    pipeline = PDFToAudioPipeline()
+    stub_llm = StubLLM(args.llm_latency)
+    pipeline._call_llm_with_retry = stub_llm
+    tts = MockTTS(latency_s=args.tts_latency)
+    timings = StageTimings()
+    case = {"kind": kind, "pages": pages, "errors": {}}
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as work_dir:
+        pdf_bytes = make_pdf(kind, pages, seed=args.seed)
+        pdf_path = os.path.join(work_dir, "input.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(pdf_bytes)
+        case["pdf_bytes"] = len(pdf_bytes)
+
+        try:
+            raw_text = pipeline._extract_text(pdf_path, timings=timings)
+        except Exception as e:
+            case["errors"]["extract"] = str(e)
+            case["stages"] = timings.as_dict()["stages"]
+            return case
+
+        with timings.stage("cleanup") as stage:
+            cleaned = pipeline._advanced_text_cleanup(raw_text)
+            stage["bytes"] = len(cleaned.encode("utf-8"))
+
+        with timings.stage("llm") as stage:
+            segments, _ = pipeline._get_final_text(
+                [Segment(TEXT, cleaned)], args.include_summary, args.mode, None
+            )
+            stage["bytes"] = sum(len(segment.text.encode("utf-8")) for segment in segments)
+
+        with timings.stage("chunking") as stage:
+            chunks, _ = pipeline._chunk_segments(segments)
+            stage["bytes"] = sum(len(chunk.encode("utf-8")) for chunk in chunks)
+
+        case["llm_calls"] = stub_llm.calls
+        case["chunks_total"] = len(chunks)
+        chunks = chunks[: args.max_chunks] if args.max_chunks else chunks
+        case["chunks_synthesized"] = len(chunks)
+
+        chunk_paths: List[str] = []
+        case["synthesis"] = {}
+        for concurrency in args.concurrency:
+            synthesis_dir = os.path.join(work_dir, f"tts-{concurrency}")
+            os.makedirs(synthesis_dir)
+            run = _synthesize(tts, chunks, synthesis_dir, concurrency)
+            case["synthesis"][str(concurrency)] = run["result"]
+            chunk_paths = run["paths"]
+
+        if not shutil.which("ffmpeg"):
+            case["errors"]["assembly"] = "skipped: ffmpeg not found"
+        elif chunk_paths:
+            try:
+                with timings.stage("assembly") as stage:
+                    output = pipeline._assemble_audio_chapters(chunk_paths, work_dir)
+                    stage["bytes"] = os.path.getsize(output)
+            except Exception as e:
+                case["errors"]["assembly"] = str(e)
+
+    case["stages"] = timings.as_dict()["stages"]
+    return case
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=REPO_ROOT, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kinds", type=_csv, default=list(KINDS))
+    parser.add_argument("--pages", type=lambda v: [int(p) for p in _csv(v)], default=[5, 50, 200])
+    parser.add_argument("--mode", default="full", help="Conversion mode passed to the LLM step")
+    parser.add_argument("--include-summary", action="store_true")
+    parser.add_argument("--tts-latency", type=float, default=0.2, help="Seconds per MockTTS call")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Seconds per stub LLM call")
+    parser.add_argument("--concurrency", type=lambda v: [int(c) for c in _csv(v)], default=[1, 4, 8])
+    parser.add_argument("--max-chunks", type=int, default=40, help="Cap synthesized chunks per case (0 = all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    # MockTTS logs every call; keep the benchmark's own output readable
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mode": args.mode,
+            "include_summary": args.include_summary,
+            "tts_latency_s": args.tts_latency,
+            "llm_latency_s": args.llm_latency,
+            "max_chunks": args.max_chunks,
+            "seed": args.seed,
+        },
+        "results": [run_case(kind, pages, args) for kind in args.kinds for pages in args.pages],
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Deterministic synthetic PDFs for benchmarks and load tests.
+
+Three kinds are generated:
+- digital: text drawn with reportlab, extractable by PyMuPDF
+- scanned: each page is a rendered image of text, so only OCR recovers it
+- mixed:   alternating digital and scanned pages
+
+The same (kind, pages, seed) always produces the same text, so results are
+comparable between commits.
+"""
+
+import io
+import random
+from typing import List
+
+KINDS = ("digital", "scanned", "mixed")
+
+_WORDS = (
+    "audio book chapter narrative document section analysis result method "
+    "system model data value process signal method theory example figure "
+    "table evidence research study question answer summary concept detail "
+    "reader listener voice speech page paragraph sentence structure context"
+).split()
+
+_LINES_PER_PAGE = 40
+_WORDS_PER_LINE = 12
+
+
+def page_lines(rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(_LINES_PER_PAGE):
+        words = [rng.choice(_WORDS) for _ in range(_WORDS_PER_LINE)]
+        words[0] = words[0].capitalize()
+        # Roughly one sentence end every other line, like running prose
+        lines.append(" ".join(words) + ("." if rng.random() < 0.5 else ""))
+    return lines
+
+
+def _scanned_page_image(lines: List[str]):
+    from PIL import Image, ImageDraw
+
+    # 150 dpi A4-ish canvas; large enough for tesseract to read the default font
+    image = Image.new("L", (1240, 1754), color=255)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((80, 80 + i * 40), line, fill=0)
+    return image
+
+
+def make_pdf(kind: str, pages: int, seed: int = 0) -> bytes:
+    """Build a PDF of `kind` with `pages` pages and return its bytes."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    if kind not in KINDS:
+        raise ValueError(f"Unknown synthetic PDF kind: {kind}")
+
+    rng = random.Random(f"{kind}-{pages}-{seed}")
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+
+    for page in range(pages):
+        lines = page_lines(rng)
+        scanned = kind == "scanned" or (kind == "mixed" and page % 2 == 1)
+        if scanned:
+            pdf.drawImage(ImageReader(_scanned_page_image(lines)), 0, 0, width, height)
+        else:
+            text = pdf.beginText(40, height - 50)
+            text.setFont("Helvetica", 9)
+            for line in lines:
+                text.textLine(line)
+            pdf.drawText(text)
+        pdf.showPage()
+
+    pdf.save()
+    return buffer.getvalue()
@@ -51,6 +51,42 @@ celery_app = Celery(
 )
 
 from celery.schedules import crontab
+from kombu import Queue
+
+
+def _limit(name: str, default_minutes: int) -> int:
+    return int(os.getenv(name, default_minutes * 60))
+
+
+# Size tiers for process_pdf_task. The API estimates each upload's tier and
+# sends it to that queue with the tier's time limits, so small jobs never wait
+# behind large books. Run one worker per queue (-Q pdf_small, ...) to give each
+# tier its own concurrency; a worker started without -Q consumes every queue.
+PDF_QUEUE_TIERS = {
+    "small": {
+        "queue": "pdf_small",
+        "soft_time_limit": _limit("PDF_SMALL_SOFT_TIME_LIMIT", 5),
+        "time_limit": _limit("PDF_SMALL_TIME_LIMIT", 6),
+    },
+    "medium": {
+        "queue": "pdf_medium",
+        "soft_time_limit": _limit("PDF_MEDIUM_SOFT_TIME_LIMIT", 25),
+        "time_limit": _limit("PDF_MEDIUM_TIME_LIMIT", 30),
+    },
+    "large": {
+        "queue": "pdf_large",
+        "soft_time_limit": _limit("PDF_LARGE_SOFT_TIME_LIMIT", 110),
+        "time_limit": _limit("PDF_LARGE_TIME_LIMIT", 120),
+    },
+}
+DEFAULT_PDF_QUEUE_TIER = "medium"
+
+# Split stage queues (WORKER_STAGE_QUEUES): extraction/OCR/cleanup runs on the
+# CPU queue (prefork pool, one process per core) and LLM/TTS/assembly/upload
+# on the I/O queue (threads pool, many requests in flight per process). Tier
+# time limits still apply; the tier queues are unused in this mode.
+PDF_CPU_QUEUE = "pdf_cpu"
+PDF_IO_QUEUE = "pdf_io"
 
 # Configure Celery
 celery_app.conf.update(
@@ -60,8 +96,20 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
+    # Defaults for tasks sent without explicit limits (e.g. periodic cleanup);
+    # process_pdf_task gets its limits from its size tier.
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
+    task_default_queue="celery",
+    task_queues=[Queue("celery")]
+    + [Queue(tier["queue"]) for tier in PDF_QUEUE_TIERS.values()]
+    + [Queue(PDF_CPU_QUEUE), Queue(PDF_IO_QUEUE)],
+    task_routes={
+        "worker.tasks.process_pdf_task": {
+            "queue": PDF_QUEUE_TIERS[DEFAULT_PDF_QUEUE_TIER]["queue"]
+        },
+        "worker.tasks.extract_pdf_task": {"queue": PDF_CPU_QUEUE},
+    },
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
 )
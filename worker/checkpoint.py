@@ -0,0 +1,162 @@
+"""
+Checkpoints for time-sliced PDF tasks.
+
+A task that nears its soft time limit stops between chunks, uploads the
+chunk audio it produced and a small state file to storage under
+`checkpoints/{job_id}/`, and queues a continuation. The continuation loads
+that state, downloads the finished chunks and synthesizes only the rest, so
+a book is no longer bounded by one task's wall clock. The checkpoint is
+deleted once the job reaches a final state.
+
+With split stage queues the same mechanism hands a job from the CPU queue
+to the I/O queue: the extract task saves the cleaned text as a checkpoint
+and the synthesis task resumes from it.
+
+A streamed run (STREAMING_PIPELINE_ENABLED) can stop before the whole PDF
+has been read; its checkpoint also records the pages already chunked and the
+text carried over to the next chunk, and the continuation reads on from there.
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from .segments import TEXT, Segment
+
+# Chunk audio file name inside a job's work dir, by chunk index
+CHUNK_FILENAME = "chunk_{:04d}.mp3"
+# Per-chapter audio file name, by chapter number (from 1)
+CHAPTER_FILENAME = "chapter_{:03d}.mp3"
+
+
+class CheckpointReached(Exception):
+    """Raised when a run stops at its time-slice deadline with work left to do."""
+
+    def __init__(self, completed: int, total: int):
+        self.completed = completed
+        self.total = total
+        super().__init__(f"Time slice ended with {completed}/{total} chunks synthesized")
+
+
+def checkpoint_prefix(job_id: int) -> str:
+    return f"checkpoints/{job_id}/"
+
+
+class JobCheckpoint:
+    """
+    Synthesis progress for one job. `text` is the cleaned text handed from
+    the CPU stage to the I/O stage, until it is chunked into `chunks`;
+    `completed` holds the indices of chunks whose audio exists in the work
+    dir. `deadline` is a time.monotonic() value after which no new chunk is
+    started. While a streamed run is still reading the PDF, `pages_done`
+    counts the pages chunked so far and `pending_text` is the tail that has
+    not filled a chunk yet; `pages_done` is None once every page is chunked.
+    `segments` are the parts of `text` to read (its chapters, or the whole
+    text as one); once chunked, `sections` locates each segment's first
+    chunk (see worker/segments.py). `served_chars` counts the characters
+    each (provider, voice) route synthesized, so the job is priced by the
+    routes that actually served its chunks. `timings` is the StageTimings
+    state of the slices before this one.
+    """
+
+    def __init__(self, job_id: Optional[int] = None, deadline: Optional[float] = None):
+        self.job_id = job_id
+        self.deadline = deadline
+        self.text: Optional[str] = None
+        self.chunks: Optional[List[str]] = None
+        self.pages_done: Optional[int] = None
+        self.pending_text = ""
+        self.segments: Optional[List[Segment]] = None
+        self.sections: List[dict] = []
+        self.completed: Set[int] = set()
+        self.served_chars: Dict[Tuple[str, str], int] = {}
+        self.tokens = 0
+        self.slices = 0
+        self.timings: Optional[dict] = None
+        # Chunks already in storage, so a later checkpoint only uploads new ones
+        self.uploaded: Set[int] = set()
+
+    def chunk_done(self, index: int, provider: str, voice: str, chars: int) -> None:
+        """Mark chunk `index` synthesized by the (`provider`, `voice`) route."""
+        self.completed.add(index)
+        route = (str(getattr(provider, "value", provider)), voice)
+        self.served_chars[route] = self.served_chars.get(route, 0) + chars
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def progress_marker(self) -> Tuple[int, int]:
+        """Changes whenever a slice synthesizes a chunk or reads a page."""
+        return len(self.completed), self.pages_done or 0
+
+    @property
+    def state_key(self) -> str:
+        return checkpoint_prefix(self.job_id) + "state.json"
+
+    def chunk_key(self, index: int) -> str:
+        return checkpoint_prefix(self.job_id) + CHUNK_FILENAME.format(index)
+
+    def save(self, storage, work_dir: str) -> None:
+        """Upload chunks finished since the last save, then the state that points at them."""
+        for index in sorted(self.completed - self.uploaded):
+            storage.upload_large_file(
+                os.path.join(work_dir, CHUNK_FILENAME.format(index)), self.chunk_key(index), "audio/mpeg"
+            )
+            self.uploaded.add(index)
+
+        self.slices += 1
+        state = {
+            "text": self.text,
+            "chunks": self.chunks,
+            "pages_done": self.pages_done,
+            "pending_text": self.pending_text,
+            "segments": [segment.to_dict() for segment in self.segments or ()],
+            "sections": self.sections,
+            "completed": sorted(self.completed),
+            "served_chars": [[provider, voice, chars] for (provider, voice), chars in self.served_chars.items()],
+            "tokens": self.tokens,
+            "slices": self.slices,
+            "timings": self.timings,
+        }
+        storage.upload_file_data(json.dumps(state).encode("utf-8"), self.state_key, "application/json")
+
+    @classmethod
+    def load(
+        cls, storage, job_id: int, work_dir: Optional[str] = None, deadline: Optional[float] = None
+    ) -> "JobCheckpoint":
+        """
+        Fetch a job's saved state and download its finished chunks into
+        `work_dir` (without one, only the state is read, e.g. to delete it).
+        """
+        checkpoint = cls(job_id, deadline)
+        state = json.loads(storage.download_file(checkpoint.state_key))
+        checkpoint.text = state.get("text")
+        checkpoint.chunks = state["chunks"]
+        checkpoint.pages_done = state.get("pages_done")
+        checkpoint.pending_text = state.get("pending_text") or ""
+        if checkpoint.text is not None:
+            checkpoint.segments = [
+                Segment.from_dict(segment, checkpoint.text) for segment in state.get("segments") or ()
+            ] or [Segment(TEXT, checkpoint.text)]
+        checkpoint.sections = state.get("sections") or []
+        checkpoint.tokens = state["tokens"]
+        checkpoint.slices = state["slices"]
+        checkpoint.timings = state.get("timings")
+
+        for index in state["completed"] if work_dir else ():
+            with open(os.path.join(work_dir, CHUNK_FILENAME.format(index)), "wb") as f:
+                f.write(storage.download_file(checkpoint.chunk_key(index)))
+        checkpoint.completed = set(state["completed"])
+        checkpoint.uploaded = set(state["completed"])
+        checkpoint.served_chars = {
+            (provider, voice): chars for provider, voice, chars in state.get("served_chars") or ()
+        }
+        return checkpoint
+
+    def delete(self, storage) -> None:
+        """Remove the saved state and chunks, if anything was saved."""
+        if not self.uploaded and not self.slices:
+            return
+        keys = [self.state_key] + [self.chunk_key(index) for index in sorted(self.uploaded)]
+        storage.delete_files(keys)
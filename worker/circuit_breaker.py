@@ -0,0 +1,83 @@
+"""
+Per-provider circuit breaker for TTS requests.
+
+Each provider keeps a window of its most recent request outcomes. When the
+failure rate over that window crosses TTS_CIRCUIT_FAILURE_RATE (with at least
+TTS_CIRCUIT_MIN_REQUESTS recorded), the circuit opens and the provider is
+skipped for TTS_CIRCUIT_COOLDOWN_SECONDS. After the cooldown a single trial
+request is let through: success closes the circuit, failure reopens it.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque
+
+from app.core.config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=max(1, settings.TTS_CIRCUIT_WINDOW))
+        self._opened_at = 0.0
+        self._trial_started_at = None
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < settings.TTS_CIRCUIT_COOLDOWN_SECONDS:
+                    return False
+                self.state = HALF_OPEN
+                self._trial_started_at = None
+            # Half-open: one trial request at a time. A trial that never
+            # reported back (e.g. its job was cancelled) is replaced after a cooldown.
+            now = time.monotonic()
+            if (
+                self._trial_started_at is not None
+                and now - self._trial_started_at < settings.TTS_CIRCUIT_COOLDOWN_SECONDS
+            ):
+                return False
+            self._trial_started_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._outcomes.append(True)
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self._outcomes.clear()
+                self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._outcomes.append(False)
+            if self.state == HALF_OPEN:
+                self._open()
+                return
+            failures = self._outcomes.count(False)
+            if (
+                self.state == CLOSED
+                and len(self._outcomes) >= settings.TTS_CIRCUIT_MIN_REQUESTS
+                and failures / len(self._outcomes) >= settings.TTS_CIRCUIT_FAILURE_RATE
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        from loguru import logger
+
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._trial_started_at = None
+        logger.warning(
+            f"Circuit opened for TTS provider '{self.name}' for "
+            f"{settings.TTS_CIRCUIT_COOLDOWN_SECONDS:.0f}s"
+        )
@@ -0,0 +1,111 @@
+"""
+Hedged TTS requests.
+
+A chunk whose request outlives the provider's recent p95 latency gets a
+duplicate request; whichever finishes first is used and the other is
+cancelled. Duplicates are capped per job, across all its providers, at
+TTS_HEDGE_MAX_FRACTION of its chunks (rounded down, so a small job may get
+none), and no hedging happens until enough latencies have been observed to
+make the p95 meaningful.
+"""
+
+import asyncio
+import math
+import threading
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Recent request latencies per provider, shared by every job in the process."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[provider].append(seconds)
+
+    def percentile(self, provider: str, fraction: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(round(fraction * (len(samples) - 1))))]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+latency_tracker = LatencyTracker()
+
+
+class HedgeBudget:
+    """
+    How many duplicate requests one job may still send, shared by every
+    provider it fails over to, and how many each provider sent and won.
+    """
+
+    def __init__(self, total_requests: int, tracker: Optional[LatencyTracker] = None):
+        self.tracker = tracker or latency_tracker
+        self.remaining = math.floor(settings.TTS_HEDGE_MAX_FRACTION * total_requests)
+        self.sent: Dict[str, int] = defaultdict(int)
+        self.won: Dict[str, int] = defaultdict(int)
+
+    def delay(self, provider: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None when there is no budget or history."""
+        if self.remaining <= 0:
+            return None
+        p95 = self.tracker.percentile(provider, 0.95, settings.TTS_HEDGE_MIN_SAMPLES)
+        if p95 is None:
+            return None
+        return max(p95, settings.TTS_HEDGE_MIN_DELAY_SECONDS)
+
+    def spend(self, provider: str) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        self.sent[provider] += 1
+        return True
+
+
+async def hedged(
+    attempt: Callable[[int], Awaitable[T]], budget: Optional[HedgeBudget], provider: str
+) -> T:
+    """
+    Run `attempt(0)` against `provider`; if it is still running after the
+    budget's delay for that provider, also run `attempt(1)`. Returns the
+    first successful result and cancels the other attempt. If every attempt
+    fails, the primary's error is raised.
+    """
+    primary = asyncio.create_task(attempt(0))
+    delay = budget.delay(provider) if budget else None
+    if delay is None:
+        return await primary
+
+    done, _ = await asyncio.wait({primary}, timeout=delay)
+    if done or not budget.spend(provider):
+        return await primary
+
+    backup = asyncio.create_task(attempt(1))
+    pending = {primary, backup}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is backup:
+                        budget.won[provider] += 1
+                    return task.result()
+        # Both attempts failed
+        return primary.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,171 @@
+"""
+Prometheus metrics for the Celery worker.
+
+The exporter is started in the worker's main process (worker_init). With the
+prefork pool, tasks run in child processes, so set PROMETHEUS_MULTIPROC_DIR
+to a writable directory: children write their samples there and the exporter
+aggregates them. Without it only the main process's own samples are served.
+The directory is created (and emptied) at worker start even when the exporter
+is off, since every metric update writes into it once the variable is set.
+
+Useful queries:
+- chars/sec per provider: rate(tts_characters_total[5m]) / rate(tts_request_duration_seconds_sum[5m])
+- ffmpeg time: pipeline_stage_duration_seconds{stage="assembly"}
+"""
+
+import os
+import shutil
+import time
+from typing import Dict, Iterable, Optional
+
+import redis
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_shutdown
+from loguru import logger
+from prometheus_client import CollectorRegistry, Counter, Histogram, start_http_server
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+
+from .timings import StageTimings
+
+TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Task run time by task name and final state",
+    ["task", "state"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200),
+)
+
+STAGE_DURATION = Histogram(
+    "pipeline_stage_duration_seconds",
+    "Wall time per job spent in each pipeline stage",
+    ["stage"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+
+TTS_REQUEST_DURATION = Histogram(
+    "tts_request_duration_seconds",
+    "Latency of a single TTS synthesis call",
+    ["provider"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 60),
+)
+
+TTS_CHARACTERS = Counter(
+    "tts_characters_total", "Characters sent for synthesis", ["provider"]
+)
+
+TTS_ERRORS = Counter("tts_errors_total", "Failed TTS synthesis calls", ["provider"])
+
+TTS_HEDGES = Counter(
+    "tts_hedged_requests_total",
+    "Duplicate requests sent for slow TTS chunks (sent) and those that finished first (won)",
+    ["provider", "outcome"],
+)
+
+_task_started: Dict[str, float] = {}
+
+
+def _label(value) -> str:
+    return str(getattr(value, "value", value))
+
+
+def observe_tts_request(provider, seconds: float, chars: int) -> None:
+    provider = _label(provider)
+    TTS_REQUEST_DURATION.labels(provider).observe(seconds)
+    TTS_CHARACTERS.labels(provider).inc(chars)
+
+
+def record_tts_error(provider) -> None:
+    TTS_ERRORS.labels(_label(provider)).inc()
+
+
+def record_tts_hedges(provider, sent: int, won: int) -> None:
+    provider = _label(provider)
+    TTS_HEDGES.labels(provider, "sent").inc(sent)
+    TTS_HEDGES.labels(provider, "won").inc(won)
+
+
+def observe_timings(timings: StageTimings) -> None:
+    for stage, entry in timings.stages.items():
+        STAGE_DURATION.labels(stage).observe(entry["wall_s"])
+
+
+class QueueDepthCollector:
+    """Reports the length of each broker queue at scrape time (Redis broker only)."""
+
+    def __init__(self, broker_url: str, queues: Iterable[str]):
+        self.broker_url = broker_url
+        self.queues = list(queues)
+        self._client: Optional[redis.Redis] = None
+
+    def collect(self):
+        gauge = GaugeMetricFamily(
+            "celery_queue_length", "Messages waiting in each broker queue", labels=["queue"]
+        )
+        try:
+            if self._client is None:
+                self._client = redis.from_url(self.broker_url, socket_timeout=1)
+            for queue in self.queues:
+                gauge.add_metric([queue], self._client.llen(queue))
+        except redis.RedisError as e:
+            logger.debug(f"Could not read queue lengths from the broker: {e}")
+        yield gauge
+
+
+def prepare_multiproc_dir() -> Optional[str]:
+    """Create an empty PROMETHEUS_MULTIPROC_DIR, if one is set, and return it."""
+    multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        # Samples from previous runs would be aggregated as if they were live
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+    return multiproc_dir
+
+
+def start_metrics_server(port: int, broker_url: str, queues: Iterable[str]) -> None:
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    if broker_url.startswith(("redis://", "rediss://")):
+        registry.register(QueueDepthCollector(broker_url, queues))
+
+    start_http_server(port, registry=registry)
+    logger.info(f"Worker metrics exporter listening on :{port}")
+
+
+@task_prerun.connect
+def _task_started_handler(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_finished_handler(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None and task is not None:
+        TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+@worker_init.connect
+def _start_exporter(sender=None, **kwargs):
+    from app.core.config import settings
+    from .celery_app import celery_app
+
+    prepare_multiproc_dir()
+    if not settings.WORKER_METRICS_PORT:
+        return
+    queues = [queue.name for queue in celery_app.conf.task_queues or []]
+    try:
+        start_metrics_server(settings.WORKER_METRICS_PORT, celery_app.conf.broker_url, queues)
+    except OSError as e:
+        # e.g. several workers on one host sharing the default port
+        logger.warning(f"Worker metrics exporter not started: {e}")
+
+
+@worker_process_shutdown.connect
+def _mark_process_dead(pid=None, **kwargs):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid or os.getpid())
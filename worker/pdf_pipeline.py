@@ -1,41 +1,158 @@
+import asyncio
+import functools
+import itertools
 import os
+import queue
 import sys
+import threading
 import tempfile
-from typing import Optional, Callable, List
+from typing import Awaitable, BinaryIO, Dict, Iterable, Iterator, Optional, Callable, List, Tuple
 
 # Add backend to path for settings access
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
 from app.core.config import settings
-import fitz  # PyMuPDF
-from pdf2image import convert_from_path
-import pytesseract
-from PIL import Image
-import openai
-from pydub import AudioSegment
-import io
+import html
 import re
 import random
 from abc import ABC, abstractmethod
-import base64
+from loguru import logger
 
-# TTS Provider Imports
-from google.cloud import texttospeech
-import boto3
-from botocore.exceptions import NoCredentialsError
-from azure.cognitiveservices.speech import SpeechConfig, SpeechSynthesizer, ResultReason
-from elevenlabs.client import ElevenLabs
+from .checkpoint import CHAPTER_FILENAME, CHUNK_FILENAME, CheckpointReached, JobCheckpoint
+from .segments import EXPLANATION, SUMMARY, TEXT, Segment, chapter_sections, section, section_at, source_text
+from .circuit_breaker import CircuitBreaker
+from .hedging import HedgeBudget, hedged, latency_tracker
+from .metrics import observe_tts_request, record_tts_error, record_tts_hedges
+from .timings import StageTimings
+
+class JobCancelledError(Exception):
+    """Raised inside the pipeline when the job's cancellation flag is seen."""
+
+
+# Read size when copying streamed audio into a chunk file
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+_blocking_executor = None
+
+
+# Tasks one worker process runs at once: 1 for a prefork child, the worker's
+# concurrency on a threads (or green) pool. Set at worker start by worker/tasks.py.
+_tasks_per_process = 1
+
+
+def set_tasks_per_process(count: int) -> None:
+    global _tasks_per_process
+    _tasks_per_process = max(1, count)
+
+
+def _run_blocking(func, *args):
+    """
+    Run a blocking provider call from the event loop on a process-wide thread
+    pool. Unlike the loop's default executor, it is not joined when a run's
+    event loop closes, so an abandoned (e.g. out-hedged) call can't hold up
+    the end of a job.
+    """
+    global _blocking_executor
+    if _blocking_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _blocking_executor = ThreadPoolExecutor(
+            max_workers=max(4, settings.TTS_ASYNC_CONCURRENCY), thread_name_prefix="tts-blocking"
+        )
+    return asyncio.get_running_loop().run_in_executor(_blocking_executor, functools.partial(func, *args))
+
+
+class TTSUnavailableError(Exception):
+    """Raised when every TTS route for a chunk is open-circuit."""
+
+    def __init__(self, routes: List[Tuple[str, str]]):
+        providers = ", ".join(str(getattr(name, "value", name)) for name, _ in routes)
+        super().__init__(f"No healthy TTS provider available (circuit open for: {providers})")
+
+
+def _is_soft_time_limit(error: BaseException) -> bool:
+    """True for Celery's SoftTimeLimitExceeded (imported lazily; the pipeline also runs outside Celery)."""
+    from celery.exceptions import SoftTimeLimitExceeded
+
+    return isinstance(error, SoftTimeLimitExceeded)
+
+
+def _raise_if_cancelled(cancel_check: Optional[Callable[[], bool]]) -> None:
+    if cancel_check and cancel_check():
+        raise JobCancelledError("Job was cancelled")
+
+
+# Heavy SDKs (TTS providers, openai, PyMuPDF, OCR) are imported where they are
+# used, so a process only pays for the providers and stages it actually runs.
+# The API imports this module indirectly and never needs any of them.
 
 
 # --- TTS PROVIDER INTERFACE ---
+class _LoopClients:
+    """
+    Async clients keyed by the event loop that opened them. Each synthesis
+    run has its own loop, and on the threads pool several runs share one
+    provider instance at once, so a run only uses and closes its own client.
+    """
+
+    def __init__(self):
+        self._clients: Dict[asyncio.AbstractEventLoop, object] = {}
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            return self._clients.get(asyncio.get_running_loop())
+
+    def set(self, client):
+        with self._lock:
+            self._clients[asyncio.get_running_loop()] = client
+        return client
+
+    def pop(self):
+        with self._lock:
+            return self._clients.pop(asyncio.get_running_loop(), None)
+
+
 class TTSProvider(ABC):
     @abstractmethod
     def text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
         pass
 
+    def text_to_file(self, text: str, voice_id: str, speed: float, sink: BinaryIO) -> int:
+        """
+        Write the synthesized audio to `sink` and return the bytes written.
+        Providers with a streaming API override this to copy the response as
+        it arrives, so a chunk is never held in memory whole.
+        """
+        return sink.write(self.text_to_audio(text, voice_id, speed))
+
+    async def async_text_to_file(self, text: str, voice_id: str, speed: float, sink: BinaryIO) -> int:
+        """Async counterpart of `text_to_file`."""
+        if type(self).async_text_to_audio is TTSProvider.async_text_to_audio:
+            # No native async client: stream from a pool thread
+            return await _run_blocking(self.text_to_file, text, voice_id, speed, sink)
+        return sink.write(await self.async_text_to_audio(text, voice_id, speed))
+
+    async def async_text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
+        """
+        Non-blocking synthesis for the async chunk scheduler. Providers with a
+        native async client override this; the default runs the blocking call
+        in a thread pool.
+        """
+        return await _run_blocking(self.text_to_audio, text, voice_id, speed)
+
+    async def aclose(self) -> None:
+        """Close the async clients opened on the running event loop, which they are bound to."""
+
+    def prewarm(self) -> None:
+        """Open connections ahead of the first request; called by `TTSManager.warm_up`."""
+
 
 # --- CONCRETE TTS IMPLEMENTATIONS ---
 class OpenAITTS(TTSProvider):
     def __init__(self):
+        import openai
+
         self.base_url = os.getenv("OPENAI_BASE_URL")
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
@@ -61,6 +178,8 @@ class OpenAITTS(TTSProvider):
         else:
              self.voice_mapping = {"default": "alloy", "female": "nova", "male": "onyx"}
 
+        self._async_clients = _LoopClients()
+
     def text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
         voice = self.voice_mapping.get(voice_id, self.voice_mapping.get("default"))
         try:
@@ -77,9 +196,63 @@ class OpenAITTS(TTSProvider):
             )
             return response.content
 
+    def text_to_file(self, text: str, voice_id: str, speed: float, sink: BinaryIO) -> int:
+        voice = self.voice_mapping.get(voice_id, self.voice_mapping.get("default"))
+        written = 0
+        try:
+            with self.client.audio.speech.with_streaming_response.create(
+                model=self.model, voice=voice, input=text, speed=speed
+            ) as response:
+                for data in response.iter_bytes(_STREAM_CHUNK_BYTES):
+                    written += sink.write(data)
+            return written
+        except Exception as e:
+            from loguru import logger
+            logger.warning(f"Streaming TTS failed, falling back to standard: {e}")
+            # Drop whatever part of the stream arrived before the failure
+            sink.seek(0)
+            sink.truncate()
+            response = self.client.audio.speech.create(
+                model=self.model, voice=voice, input=text, speed=speed
+            )
+            return sink.write(response.content)
+
+    def _get_async_client(self):
+        import openai
+
+        client = self._async_clients.get()
+        if client is None:
+            client = self._async_clients.set(openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url))
+        return client
+
+    async def async_text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
+        voice = self.voice_mapping.get(voice_id, self.voice_mapping.get("default"))
+        async with self._get_async_client().audio.speech.with_streaming_response.create(
+            model=self.model, voice=voice, input=text, speed=speed
+        ) as response:
+            return await response.read()
+
+    async def async_text_to_file(self, text: str, voice_id: str, speed: float, sink: BinaryIO) -> int:
+        voice = self.voice_mapping.get(voice_id, self.voice_mapping.get("default"))
+        written = 0
+        async with self._get_async_client().audio.speech.with_streaming_response.create(
+            model=self.model, voice=voice, input=text, speed=speed
+        ) as response:
+            async for data in response.iter_bytes(_STREAM_CHUNK_BYTES):
+                written += sink.write(data)
+        return written
+
+    async def aclose(self) -> None:
+        client = self._async_clients.pop()
+        if client is not None:
+            await client.close()
+
 
 class GoogleTTS(TTSProvider):
     def __init__(self):
+        from google.cloud import texttospeech
+
+        self.texttospeech = texttospeech
         self.client = texttospeech.TextToSpeechClient()
         self.voice_mapping = {
             "us_female_std": (settings.GOOGLE_VOICE_US_FEMALE_STD, "en-US"),
@@ -93,8 +266,10 @@ class GoogleTTS(TTSProvider):
         }
         from loguru import logger
         logger.info(f"🎤 GoogleTTS initialized with voice mapping: {self.voice_mapping}")
+        self._async_clients = _LoopClients()
 
-    def text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
+    def _synthesis_request(self, text: str, voice_id: str, speed: float) -> dict:
+        texttospeech = self.texttospeech
         synthesis_input = texttospeech.SynthesisInput(text=text)
         
         voice_name, lang_code = self.voice_mapping.get(
@@ -110,64 +285,282 @@ class GoogleTTS(TTSProvider):
         audio_config = texttospeech.AudioConfig(
             audio_encoding=texttospeech.AudioEncoding.MP3, speaking_rate=speed
         )
+        return {"input": synthesis_input, "voice": voice, "audio_config": audio_config}
+
+    def text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
         response = self.client.synthesize_speech(
-            input=synthesis_input, voice=voice, audio_config=audio_config
+            **self._synthesis_request(text, voice_id, speed)
+        )
+        return response.audio_content
+
+    async def async_text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
+        client = self._async_clients.get()
+        if client is None:
+            client = self._async_clients.set(self.texttospeech.TextToSpeechAsyncClient())
+        response = await client.synthesize_speech(
+            **self._synthesis_request(text, voice_id, speed)
         )
         return response.audio_content
 
+    async def aclose(self) -> None:
+        client = self._async_clients.pop()
+        if client is not None:
+            await client.transport.close()
+
 
 class AWSPollyTTS(TTSProvider):
     def __init__(self):
-        self.client = boto3.client(
-            "polly",
-            region_name=os.getenv("AWS_REGION", "us-east-1"),
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        )
+        import boto3
 
-    import html
+        self.client_kwargs = {
+            "region_name": os.getenv("AWS_REGION", "us-east-1"),
+            "aws_access_key_id": os.getenv("AWS_ACCESS_KEY_ID"),
+            "aws_secret_access_key": os.getenv("AWS_SECRET_ACCESS_KEY"),
+        }
+        self.client = boto3.client("polly", **self.client_kwargs)
+        # Per event loop: {"lock", "context", "client"}
+        self._async_clients = _LoopClients()
 
-    def text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
+    def _synthesis_request(self, text: str, voice_id: str, speed: float) -> dict:
         # Polly uses SSML for speed control
         rate = f"{int(speed * 100)}%"
         escaped_text = html.escape(text)
         ssml_text = f'<speak><prosody rate="{rate}">{escaped_text}</prosody></speak>'
-        response = self.client.synthesize_speech(
-            Text=ssml_text,
-            OutputFormat="mp3",
-            VoiceId=voice_id or "Joanna",
-            TextType="ssml",
-        )
+        return {
+            "Text": ssml_text,
+            "OutputFormat": "mp3",
+            "VoiceId": voice_id or "Joanna",
+            "TextType": "ssml",
+        }
+
+    def text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
+        response = self.client.synthesize_speech(**self._synthesis_request(text, voice_id, speed))
         return response["AudioStream"].read()
 
+    def text_to_file(self, text: str, voice_id: str, speed: float, sink: BinaryIO) -> int:
+        response = self.client.synthesize_speech(**self._synthesis_request(text, voice_id, speed))
+        written = 0
+        for data in response["AudioStream"].iter_chunks(_STREAM_CHUNK_BYTES):
+            written += sink.write(data)
+        return written
+
+    async def _get_async_client(self):
+        state = self._async_clients.get()
+        if state is None:
+            state = self._async_clients.set({"lock": asyncio.Lock(), "context": None, "client": None})
+        async with state["lock"]:
+            if state["client"] is None:
+                from aiobotocore.session import get_session
+
+                context = get_session().create_client("polly", **self.client_kwargs)
+                state["client"] = await context.__aenter__()
+                state["context"] = context
+        return state["client"]
+
+    async def async_text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
+        try:
+            client = await self._get_async_client()
+        except ImportError:
+            # aiobotocore is optional; without it Polly runs in the thread pool
+            return await super().async_text_to_audio(text, voice_id, speed)
+        response = await client.synthesize_speech(**self._synthesis_request(text, voice_id, speed))
+        async with response["AudioStream"] as stream:
+            return await stream.read()
+
+    async def async_text_to_file(self, text: str, voice_id: str, speed: float, sink: BinaryIO) -> int:
+        try:
+            client = await self._get_async_client()
+        except ImportError:
+            return await super().async_text_to_file(text, voice_id, speed, sink)
+        response = await client.synthesize_speech(**self._synthesis_request(text, voice_id, speed))
+        written = 0
+        async with response["AudioStream"] as stream:
+            while data := await stream.read(_STREAM_CHUNK_BYTES):
+                written += sink.write(data)
+        return written
+
+    async def aclose(self) -> None:
+        state = self._async_clients.pop()
+        if state is not None and state["context"] is not None:
+            await state["context"].__aexit__(None, None, None)
+
+
+class _PooledSynthesizer:
+    """An Azure synthesizer with its connection held open, serving one request at a time."""
+
+    def __init__(self, speech_config):
+        from azure.cognitiveservices.speech import Connection, SpeechSynthesizer
+
+        self.synthesizer = SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+        self.connection = Connection.from_speech_synthesizer(self.synthesizer)
+        # Connect now so requests skip the websocket handshake
+        self.connection.open(True)
+        self._waiter = None
+        # Handlers are connected once; the SDK fires them on its own threads
+        self.synthesizer.synthesis_completed.connect(self._resolve)
+        self.synthesizer.synthesis_canceled.connect(self._resolve)
+
+    def _resolve(self, evt) -> None:
+        waiter, self._waiter = self._waiter, None
+        if waiter is not None:
+            loop, future = waiter
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(evt.result))
+
+    def speak(self, ssml: str):
+        return self.synthesizer.speak_ssml_async(ssml).get()
+
+    async def async_speak(self, ssml: str):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiter = (loop, future)
+        self.synthesizer.speak_ssml_async(ssml)
+        return await future
+
+    def close(self) -> None:
+        try:
+            self.connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing Azure synthesizer connection: {e}")
+
+
+class _AzureSynthesizerPool:
+    """
+    Up to `size` pre-connected synthesizers, created on demand and reused.
+    A synthesizer whose request failed is closed rather than returned, so a
+    broken connection is replaced on the next acquire.
+    """
+
+    def __init__(self, speech_config, size: int):
+        self.speech_config = speech_config
+        self.size = max(1, size)
+        # Used as a stack: reusing the most recently active, still-warm connections
+        self._idle: List[_PooledSynthesizer] = []
+        self._created = 0
+        # Notified whenever a synthesizer is returned or a failed one frees its slot
+        self._available = threading.Condition()
+
+    def _take(self) -> Optional[_PooledSynthesizer]:
+        """An idle synthesizer, or None after claiming a free slot. Hold `_available`."""
+        if self._idle:
+            return self._idle.pop()
+        self._created += 1
+        return None
+
+    def _create(self) -> _PooledSynthesizer:
+        try:
+            return _PooledSynthesizer(self.speech_config)
+        except Exception:
+            self._free_slot()
+            raise
+
+    def _free_slot(self) -> None:
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    def _try_acquire(self) -> Optional[_PooledSynthesizer]:
+        with self._available:
+            if not self._idle and self._created >= self.size:
+                return None
+            synthesizer = self._take()
+        return synthesizer or self._create()
+
+    def acquire(self) -> _PooledSynthesizer:
+        with self._available:
+            self._available.wait_for(lambda: self._idle or self._created < self.size)
+            synthesizer = self._take()
+        # Connecting happens outside the lock
+        return synthesizer or self._create()
+
+    async def async_acquire(self) -> _PooledSynthesizer:
+        # Poll rather than park a thread on the condition, so cancellation can't strand one
+        while (synthesizer := self._try_acquire()) is None:
+            await asyncio.sleep(0.01)
+        return synthesizer
+
+    def release(self, synthesizer: _PooledSynthesizer, healthy: bool) -> None:
+        if not healthy:
+            synthesizer.close()
+            self._free_slot()
+            return
+        with self._available:
+            self._idle.append(synthesizer)
+            self._available.notify()
+
+    def fill(self) -> None:
+        """Connect every slot up front, then make them all available."""
+        taken = []
+        while (synthesizer := self._try_acquire()) is not None:
+            taken.append(synthesizer)
+        with self._available:
+            self._idle.extend(taken)
+            self._available.notify_all()
+
 
 class AzureTTS(TTSProvider):
     def __init__(self):
+        from azure.cognitiveservices.speech import SpeechConfig
+
         self.speech_config = SpeechConfig(
             subscription=os.getenv("AZURE_SPEECH_KEY"),
             region=os.getenv("AZURE_SPEECH_REGION"),
         )
-
-    import html
-
-    def text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
-        self.speech_config.speech_synthesis_voice_name = voice_id or "en-US-JennyNeural"
-        synthesizer = SpeechSynthesizer(
-            speech_config=self.speech_config, audio_config=None
+        # One synthesizer per concurrent request the process can make
+        pool_size = settings.AZURE_SYNTHESIZER_POOL_SIZE or _tasks_per_process * (
+            settings.TTS_ASYNC_CONCURRENCY if settings.TTS_ASYNC_SYNTHESIS else 1
         )
-        # Azure uses SSML for speed control
+        self._pool = _AzureSynthesizerPool(self.speech_config, pool_size)
+
+    @staticmethod
+    def _ssml(text: str, voice_name: str, speed: float) -> str:
+        # Azure uses SSML for speed control. The voice is set here only: the
+        # speech config is shared by every pooled synthesizer.
         rate = f"{speed:.2f}"
         escaped_text = html.escape(text)
-        ssml_text = f'<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="en-US"><voice name="{self.speech_config.speech_synthesis_voice_name}"><prosody rate="{rate}">{escaped_text}</prosody></voice></speak>'
-        result = synthesizer.speak_ssml_async(ssml_text).get()
+        return f'<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="en-US"><voice name="{html.escape(voice_name)}"><prosody rate="{rate}">{escaped_text}</prosody></voice></speak>'
+
+    @staticmethod
+    def _audio_from_result(result) -> bytes:
+        from azure.cognitiveservices.speech import ResultReason
+
         if result.reason == ResultReason.SynthesizingAudioCompleted:
             return result.audio_data
         else:
             raise Exception(f"Azure TTS failed: {result.reason}")
 
+    def prewarm(self) -> None:
+        self._pool.fill()
+
+    def text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
+        synthesizer = self._pool.acquire()
+        healthy = False
+        try:
+            audio = self._audio_from_result(
+                synthesizer.speak(self._ssml(text, voice_id or "en-US-JennyNeural", speed))
+            )
+            healthy = True
+            return audio
+        finally:
+            self._pool.release(synthesizer, healthy)
+
+    async def async_text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
+        # Completion is signalled from the SDK's threads instead of blocking on `.get()`
+        synthesizer = await self._pool.async_acquire()
+        healthy = False
+        try:
+            audio = self._audio_from_result(
+                await synthesizer.async_speak(self._ssml(text, voice_id or "en-US-JennyNeural", speed))
+            )
+            healthy = True
+            return audio
+        finally:
+            self._pool.release(synthesizer, healthy)
+
 
 class ElevenLabsTTS(TTSProvider):
     def __init__(self):
+        from elevenlabs.client import ElevenLabs
+
         self.client = ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
 
     def text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
@@ -176,22 +569,54 @@ class ElevenLabsTTS(TTSProvider):
         audio = self.client.generate(
             text=text, voice=voice_id or "Rachel", model="eleven_multilingual_v2"
         )
-        return audio
+        # The SDK streams: `generate` returns an iterator of byte chunks
+        return audio if isinstance(audio, bytes) else b"".join(audio)
+
+    def text_to_file(self, text: str, voice_id: str, speed: float, sink: BinaryIO) -> int:
+        audio = self.client.generate(
+            text=text, voice=voice_id or "Rachel", model="eleven_multilingual_v2"
+        )
+        if isinstance(audio, bytes):
+            return sink.write(audio)
+        written = 0
+        for data in audio:
+            written += sink.write(data)
+        return written
 
 
 class MockTTS(TTSProvider):
     """A mock TTS provider for testing and development."""
 
-    def __init__(self):
-        # A small, silent 1-second MP3 file content
-        self.silent_audio = base64.b64decode(
-            "//MkxAAgEAAAAEAYFMYXNtZQAACAAADhQCAAACgAAAABVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVax-p.t"
-        )
+    def __init__(self, latency_s: Optional[float] = None):
+        # Simulated provider round-trip, so benchmarks see realistic synthesis time
+        self.latency_s = settings.MOCK_TTS_LATENCY_SECONDS if latency_s is None else latency_s
+        # About one second of silence: 38 MPEG-1 Layer III frames (128 kbps,
+        # 44.1 kHz, 417 bytes each) with empty payloads
+        self.silent_audio = (bytes.fromhex("fffb9064") + bytes(413)) * 38
 
     def text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
         logger.info(f"--- MOCK TTS: Generating audio for text (voice: {voice_id}, speed: {speed}) ---")
+        if self.latency_s > 0:
+            import time
+
+            time.sleep(self.latency_s)
+        return self.silent_audio
+
+    async def async_text_to_audio(self, text: str, voice_id: str, speed: float) -> bytes:
+        if self.latency_s > 0:
+            await asyncio.sleep(self.latency_s)
         return self.silent_audio
 
+# SDK module behind each provider, imported ahead of time by `TTSManager.preload`
+_PROVIDER_SDK_MODULES = {
+    "openai": "openai",
+    "google": "google.cloud.texttospeech",
+    "aws_polly": "boto3",
+    "azure": "azure.cognitiveservices.speech",
+    "eleven_labs": "elevenlabs.client",
+}
+
+
 # --- TTS MANAGER ---
 class TTSManager:
     def __init__(self):
@@ -203,10 +628,29 @@ class TTSManager:
             "eleven_labs": ElevenLabsTTS,
         }
         self._instances = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        # Tasks share this manager across threads on a threads worker pool
+        self._lock = threading.Lock()
+
+    def breaker(self, provider_name: str) -> CircuitBreaker:
+        """This process's circuit breaker for `provider_name`."""
+        key = str(getattr(provider_name, "value", provider_name))
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(key)
+            return self._breakers[key]
+
+    def available_routes(self, routes: List[Tuple[str, str]]):
+        """Yield the (provider, voice) routes whose circuit currently allows a request."""
+        for provider_name, voice in routes:
+            if self.breaker(provider_name).allow_request():
+                yield provider_name, voice
+            else:
+                logger.info(f"Skipping TTS provider '{provider_name}': circuit open")
 
     def get_provider(self, provider_name: str) -> TTSProvider:
-        # If testing mode is enabled, always return the mock provider
-        if os.getenv("TESTING_MODE", "False").lower() == "true":
+        # In testing mode (or with MOCK_TTS_ENABLED), always return the mock provider
+        if settings.MOCK_TTS_ENABLED or os.getenv("TESTING_MODE", "False").lower() == "true":
             provider_name = "mock"
             self._provider_map["mock"] = MockTTS
 
@@ -220,12 +664,227 @@ class TTSManager:
         # Instantiate the provider on first request.
         # Credential or other instantiation errors will be raised here
         # and handled by the calling Celery task.
-        instance = provider_class()
-        self._instances[provider_name] = instance
-        return instance
+        with self._lock:
+            if provider_name not in self._instances:
+                self._instances[provider_name] = provider_class()
+            return self._instances[provider_name]
+
+    def preload(self, provider_names: List[str]) -> None:
+        """
+        Import the SDKs for `provider_names` without creating any clients.
+        Safe to call before forking: module code is shared copy-on-write,
+        while sockets and gRPC channels are left for the child processes.
+        """
+        import importlib
+
+        for name in provider_names:
+            module = _PROVIDER_SDK_MODULES.get(name)
+            if not module:
+                continue
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                logger.warning(f"Could not preload SDK for TTS provider '{name}': {e}")
+
+    def warm_up(self, provider_names: List[str]) -> None:
+        """
+        Instantiate providers up front so the first task doesn't pay for
+        client and channel setup. Failures are logged and left to surface
+        on first use, as they would without warm-up.
+        """
+        for name in provider_names:
+            try:
+                self.get_provider(name).prewarm()
+                logger.info(f"Warmed up TTS provider '{name}'")
+            except Exception as e:
+                logger.warning(f"Could not warm up TTS provider '{name}': {e}")
+
+    def reset(self) -> None:
+        """Drop cached provider instances, e.g. clients inherited across a fork."""
+        self._instances.clear()
 
 
 # --- PDF PIPELINE ---
+# Pages with less text than this are OCR'd when read page by page
+_OCR_PAGE_MIN_CHARS = 20
+
+# Without an outline, a page starts a chapter when its first line is short
+# and set at least this much larger than the body text, whose size is
+# measured over the first pages only
+_HEADING_SIZE_RATIO = 1.4
+_HEADING_MAX_CHARS = 80
+_HEADING_SAMPLE_PAGES = 20
+
+
+
+def _text_lines(page) -> List[dict]:
+    """The text lines of a PyMuPDF page, in document order, from its "dict" extraction."""
+    import fitz  # PyMuPDF
+
+    blocks = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)["blocks"]
+    return [line for block in blocks for line in block.get("lines", ())]
+
+
+# End-of-stream markers on a page stream's queue
+_STREAM_END = object()
+_STREAM_CLOSED = object()
+
+
+class _PageChunkStream:
+    """
+    TTS chunks produced page by page on a background thread, for
+    STREAMING_PIPELINE_ENABLED runs. `pages` yields (index, page_count,
+    cleaned_text); each page's text is chunked as soon as it is read and the
+    finished chunks go through a bounded queue, so extraction of later pages
+    overlaps synthesis of earlier ones without running far ahead of it.
+
+    Iterating yields the chunks already on `checkpoint` (from an earlier
+    slice), then the new ones in order. Every chunk is recorded on
+    `checkpoint.chunks` together with `pages_done` and `pending_text` before
+    it is queued, so after `close()` the checkpoint can be saved and the
+    continuation reads on from the next page. A page in `chapter_starts`
+    (page index -> title, which `pages` may add to as it reads) starts a new
+    chunk and a new section in `checkpoint.sections`; the first one titles
+    the front matter instead.
+    """
+
+    def __init__(
+        self,
+        pages: Iterator[Tuple[int, int, str]],
+        checkpoint: JobCheckpoint,
+        split: Callable[[str], Tuple[List[str], str]],
+        timings: StageTimings,
+        max_queued: int,
+        chapter_starts: Optional[Dict[int, str]] = None,
+    ):
+        self.checkpoint = checkpoint
+        self.exhausted = False
+        self.page_count: Optional[int] = None
+        self._pages = pages
+        self._split = split
+        self._timings = timings
+        self._chapter_starts = chapter_starts or {}
+        self._resumed = list(checkpoint.chunks)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_queued))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name="pdf-page-stream", daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        # Wait for room, but give up once the consumer has closed the stream
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self) -> None:
+        checkpoint = self.checkpoint
+        try:
+            for index, page_count, text in self._pages:
+                self.page_count = page_count
+                if self._stop.is_set():
+                    return
+                chunks = []
+                title = self._chapter_starts.get(index)
+                if title and checkpoint.sections == [section(TEXT, None, 0)]:
+                    # Front matter is read with the first chapter
+                    checkpoint.sections[0]["title"] = title
+                elif title:
+                    # No chunk spans two chapters
+                    if checkpoint.pending_text:
+                        chunks.append(checkpoint.pending_text)
+                        checkpoint.pending_text = ""
+                    self._start_section(title, len(checkpoint.chunks) + len(chunks))
+                buffer = f"{checkpoint.pending_text} {text}".strip()
+                with self._timings.stage("chunking") as stage:
+                    split_chunks, checkpoint.pending_text = self._split(buffer)
+                    stage["bytes"] = sum(len(chunk.encode("utf-8")) for chunk in split_chunks)
+                chunks.extend(split_chunks)
+                checkpoint.chunks.extend(chunks)
+                checkpoint.pages_done = index + 1
+                for chunk in chunks:
+                    if not self._put(chunk):
+                        return
+
+            # Every page is read: the carried-over text is the last chunk
+            tail, checkpoint.pending_text = checkpoint.pending_text, ""
+            if tail:
+                checkpoint.chunks.append(tail)
+            self._drop_empty_section(len(checkpoint.chunks))
+            checkpoint.pages_done = None
+            if not checkpoint.chunks:
+                raise ValueError("No text could be extracted from the PDF.")
+            if not tail or self._put(tail):
+                self._put(_STREAM_END)
+        except BaseException as e:
+            self._put(e)
+        finally:
+            self._pages.close()
+
+    def _start_section(self, title: str, first_chunk: int) -> None:
+        self._drop_empty_section(first_chunk)
+        self.checkpoint.sections.append(section(TEXT, title, first_chunk))
+
+    def _drop_empty_section(self, next_chunk: int) -> None:
+        """Forget the last section if no chunk was made after it started."""
+        sections = self.checkpoint.sections
+        if sections and sections[-1]["first_chunk"] == next_chunk:
+            sections.pop()
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._resumed
+        while True:
+            item = self._queue.get()
+            if item is _STREAM_END:
+                self.exhausted = True
+                return
+            if item is _STREAM_CLOSED:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def estimated_total(self) -> int:
+        """Chunks the whole document will make, extrapolated from the pages read so far."""
+        done = len(self.checkpoint.chunks)
+        pages_done = self.checkpoint.pages_done
+        if pages_done is None or not self.page_count:
+            return done
+        if not pages_done:
+            return done + 1
+        return max(done + 1, (done * self.page_count + pages_done - 1) // pages_done)
+
+    def close(self) -> None:
+        """Stop reading pages and wait for the producer, leaving the checkpoint consistent."""
+        self._stop.set()
+        self._thread.join()
+        # Wake a consumer still waiting on the queue
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._queue.put_nowait(_STREAM_CLOSED)
+
+
+def _chunk_total(chunks) -> int:
+    """Chunk count for progress and limits; a stream's is an estimate until it ends."""
+    if isinstance(chunks, _PageChunkStream):
+        return chunks.estimated_total()
+    return len(chunks)
+
+
+def _chunk_routes(routes: List[Tuple[str, str]], sections: List[dict], index: int) -> List[Tuple[str, str]]:
+    """`routes` for chunk `index`: its section's voice, if it has one, replaces the requested voice."""
+    chunk_section = section_at(sections, index)
+    if chunk_section is None or not chunk_section.get("voice"):
+        return routes
+    return [(routes[0][0], chunk_section["voice"])] + routes[1:]
+
+
 class PDFToAudioPipeline:
     def __init__(self):
         self.tts_manager = TTSManager()
@@ -239,37 +898,62 @@ class PDFToAudioPipeline:
         include_summary: bool = False,
         conversion_mode: str = "full",
         progress_callback: Optional[Callable[[int], None]] = None,
-        work_dir: Optional[str] = None
+        work_dir: Optional[str] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        timings: Optional[StageTimings] = None,
+        tts_fallbacks: Optional[List[dict]] = None,
+        checkpoint: Optional[JobCheckpoint] = None,
     ) -> tuple[str, float, dict]:
+        """
+        `cancel_check` is polled between chunks, OCR pages and LLM calls; when it
+        returns True the run stops with JobCancelledError.
+        Stage timings are recorded into `timings` when one is given.
+        `tts_fallbacks` ({"provider", "voice_type"} dicts) take over chunks,
+        in order, while the requested provider fails or is open-circuit.
+        `checkpoint` carries synthesis state across time-sliced tasks: one that
+        already has chunks skips straight to synthesizing the missing ones, and
+        past its deadline (or on Celery's soft time limit) the run stops with
+        CheckpointReached instead of finishing. With STREAMING_PIPELINE_ENABLED,
+        full conversions synthesize chunks as pages are read instead of after
+        the whole PDF is extracted.
+        """
         from loguru import logger
         logger.info(f"🚀 Starting PDF processing: provider='{voice_provider}', voice='{voice_type}', mode='{conversion_mode}', summary='{include_summary}'")
         
         usage_stats = {"chars": 0, "tokens": 0}
+        if timings is None:
+            timings = StageTimings()
+        if checkpoint is None:
+            checkpoint = JobCheckpoint()
+        stream = None
         
         try:
-            if progress_callback:
-                progress_callback(5)
-            raw_text = self._extract_text(pdf_path)
-
-            if not raw_text.strip():
-                raise ValueError("No text could be extracted from the PDF.")
-
-            if progress_callback:
-                progress_callback(15)
-            cleaned_text = self._advanced_text_cleanup(raw_text)
-
-            final_text, tokens_used = self._get_final_text(
-                cleaned_text, include_summary, conversion_mode, progress_callback
-            )
-            usage_stats["tokens"] += tokens_used
-
-            if progress_callback:
-                progress_callback(35)
-            
-            # Smart chunking for TTS safety (Google has 5000 char limit)
-            chunks = self._chunk_text_for_tts(final_text)
+            if self._streams_pages(include_summary, conversion_mode, checkpoint):
+                stream = self._open_page_stream(
+                    pdf_path, progress_callback, cancel_check, timings, checkpoint
+                )
+            elif checkpoint.chunks is None:
+                if checkpoint.text is None:
+                    checkpoint.text, checkpoint.segments = self.extract_clean_text(
+                        pdf_path, progress_callback, cancel_check, timings
+                    )
+                checkpoint.tokens = self._prepare_chunks(
+                    include_summary, conversion_mode,
+                    progress_callback, cancel_check, timings, checkpoint,
+                )
+            else:
+                # A continuation: extraction and the LLM step ran in an earlier slice
+                logger.info(
+                    f"Resuming synthesis at {len(checkpoint.completed)}/{len(checkpoint.chunks)} chunks"
+                )
+            chunks = stream if stream is not None else checkpoint.chunks
+            usage_stats["tokens"] += checkpoint.tokens
 
-            tts_provider = self.tts_manager.get_provider(voice_provider)
+            # The requested voice first, then the job's fallbacks in order
+            routes = [(voice_provider, voice_type)] + [
+                (fallback["provider"], fallback.get("voice_type") or "default")
+                for fallback in tts_fallbacks or []
+            ]
 
             # Create a localized temporary directory if not provided
             local_temp_dir = None
@@ -277,38 +961,31 @@ class PDFToAudioPipeline:
                 local_temp_dir = tempfile.TemporaryDirectory()
                 work_dir = local_temp_dir.name
             
-            chunk_files = []
-            
-            # Process chunks and save to disk immediately
-            char_count = 0
-            import time
-            for i, chunk in enumerate(chunks):
-                progress = 40 + int((i / len(chunks)) * 55)
-                logger.info(f"Processing chunk {i+1}/{len(chunks)} - Progress: {progress}%")
-                if progress_callback:
-                    progress_callback(progress)
-                
-                char_count += len(chunk)
-
-                audio_data = tts_provider.text_to_audio(
-                    chunk, voice_type, reading_speed
+            synthesize = (
+                self._synthesize_chunks_async if settings.TTS_ASYNC_SYNTHESIS
+                else self._synthesize_chunks
+            )
+            try:
+                chunk_files = synthesize(
+                    routes, chunks, reading_speed,
+                    work_dir, progress_callback, cancel_check, timings, checkpoint,
                 )
-                
-                chunk_path = os.path.join(work_dir, f"chunk_{i:04d}.mp3")
-                with open(chunk_path, "wb") as f:
-                    f.write(audio_data)
-                
-                chunk_files.append(chunk_path)
-                
-                # Add a small delay to prevent overloading the local TTS server (which caused a crash)
-                time.sleep(1.0)
-            
-            usage_stats["chars"] = char_count
+            except Exception as e:
+                if _is_soft_time_limit(e):
+                    # The task is about to be stopped; hand back what is done so far
+                    raise CheckpointReached(len(checkpoint.completed), _chunk_total(chunks)) from e
+                raise
+            usage_stats["chars"] = sum(len(chunk) for chunk in checkpoint.chunks)
 
+            _raise_if_cancelled(cancel_check)
             if progress_callback:
                 progress_callback(95)
             
-            final_audio_path = self._assemble_audio_chapters(chunk_files, work_dir)
+            with timings.stage("assembly") as stage:
+                final_audio_path = self._assemble_audio_chapters(
+                    chunk_files, work_dir, chapter_sections(checkpoint.sections)
+                )
+                stage["bytes"] = os.path.getsize(final_audio_path)
             
             # If we created a local temp dir, we need to ensure the final file 
             # is moved out or persisted before the dir is cleaned up.
@@ -334,21 +1011,530 @@ class PDFToAudioPipeline:
 
             full_audio_data_path = final_audio_path
 
-            # Calculate estimated cost
-            estimated_cost = self._calculate_cost(
-                voice_provider, voice_type, final_text, usage_stats["tokens"]
-            )
+            # Calculate estimated cost, pricing each chunk by the route that served it
+            served_chars = dict(checkpoint.served_chars)
+            # Chunks from a checkpoint saved before routes were recorded go to the requested voice
+            unattributed = usage_stats["chars"] - sum(served_chars.values())
+            if unattributed > 0:
+                route = (str(getattr(voice_provider, "value", voice_provider)), voice_type)
+                served_chars[route] = served_chars.get(route, 0) + unattributed
+            estimated_cost = self._calculate_cost(served_chars, usage_stats["tokens"])
 
             if progress_callback:
                 progress_callback(100)
             return full_audio_data_path, estimated_cost, usage_stats
 
+        except (JobCancelledError, CheckpointReached):
+            raise
         except Exception as e:
+            if _is_soft_time_limit(e):
+                raise
             raise Exception(f"PDF processing failed: {str(e)}")
+        finally:
+            if stream is not None:
+                stream.close()
+
+    def extract_clean_text(
+        self,
+        pdf_path: str,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        timings: Optional[StageTimings] = None,
+    ) -> Tuple[str, List[Segment]]:
+        """
+        The CPU-bound front of the pipeline: extract (with OCR where needed)
+        and clean up the PDF's text. Run on its own by the split-stage worker
+        queues (see worker/tasks.py). Returns the text and its segments: one
+        titled segment per chapter, or the whole text as one segment when the
+        PDF has neither an outline nor recognisable headings.
+        """
+        if timings is None:
+            timings = StageTimings()
+        if progress_callback:
+            progress_callback(5)
+        chapters = self._read_chapters(pdf_path, cancel_check, timings)
+        if chapters is not None:
+            if progress_callback:
+                progress_callback(15)
+            return self._join_chapters(chapters)
+
+        raw_text = self._extract_text(pdf_path, cancel_check, timings)
+
+        if not raw_text.strip():
+            raise ValueError("No text could be extracted from the PDF.")
+
+        if progress_callback:
+            progress_callback(15)
+        with timings.stage("cleanup") as stage:
+            cleaned_text = self._advanced_text_cleanup(raw_text)
+            stage["bytes"] = len(cleaned_text.encode("utf-8"))
+        return cleaned_text, [Segment(TEXT, cleaned_text)]
+
+    def _read_chapters(
+        self,
+        pdf_path: str,
+        cancel_check: Optional[Callable[[], bool]],
+        timings: StageTimings,
+    ) -> Optional[List[Tuple[Optional[str], str]]]:
+        """
+        (title, cleaned text) per chapter, read page by page, or None when the
+        PDF has neither an outline nor text to find headings in and is
+        extracted as a whole. Front matter is read with the first chapter.
+        """
+        with timings.stage("extract"):
+            starts, body_size = self._chapter_plan(pdf_path)
+        if not starts and body_size is None:
+            return None
+
+        chapters: List[List] = [[None, []]]
+        pages = self._stream_pages(pdf_path, 0, cancel_check, timings, starts, body_size)
+        for index, _, text in pages:
+            if index in starts:
+                if chapters[-1][0] is None:
+                    chapters[-1][0] = starts[index]
+                else:
+                    chapters.append([starts[index], []])
+            if text:
+                chapters[-1][1].append(text)
+        return [(title, " ".join(texts)) for title, texts in chapters]
+
+    @staticmethod
+    def _join_chapters(chapters: List[Tuple[str, str]]) -> Tuple[str, List[Segment]]:
+        """Join chapter texts into one text with a segment over each, dropping empty chapters."""
+        bounds, parts, offset = [], [], 0
+        for title, text in chapters:
+            if not text:
+                continue
+            bounds.append((title, offset, offset + len(text)))
+            parts.append(text)
+            offset += len(text) + 1
+        if not parts:
+            raise ValueError("No text could be extracted from the PDF.")
+        joined = " ".join(parts)
+        if len(bounds) < 2:
+            return joined, [Segment(TEXT, joined)]
+        return joined, [Segment(TEXT, joined, start, end, title) for title, start, end in bounds]
+
+    def _chapter_plan(self, pdf_path: str) -> Tuple[Dict[int, str], Optional[float]]:
+        """
+        How to find the chapters of the PDF at `pdf_path`: the start pages of
+        its outline when it has one, otherwise the body font size that
+        `_stream_pages` needs to spot headings as it reads each page (None
+        when there is no text to measure it from).
+        """
+        import fitz  # PyMuPDF
+
+        try:
+            with fitz.open(pdf_path) as doc:
+                starts = self._outline_chapters(doc)
+                return starts, None if starts else self._body_font_size(doc)
+        except Exception as e:
+            # Unreadable here means unreadable for extraction too, which falls back to OCR
+            logger.warning(f"Could not detect chapters: {e}")
+            return {}, None
+
+    @staticmethod
+    def _outline_chapters(doc) -> Dict[int, str]:
+        """Title by start page for the top level of an open PyMuPDF document's outline."""
+        toc = [entry for entry in doc.get_toc(simple=True) if 1 <= entry[2] <= doc.page_count]
+        if not toc:
+            return {}
+        top = min(level for level, _, _ in toc)
+        starts: Dict[int, str] = {}
+        for level, title, page in toc:
+            if level == top:
+                starts.setdefault(page - 1, title.strip())
+        return starts
+
+    @staticmethod
+    def _body_font_size(doc) -> Optional[float]:
+        """
+        The size most text is set in, measured over the first
+        _HEADING_SAMPLE_PAGES pages so it is known before any page is read.
+        """
+        from collections import Counter
+
+        sizes: Counter = Counter()
+        for index in range(min(doc.page_count, _HEADING_SAMPLE_PAGES)):
+            for line in _text_lines(doc[index]):
+                for span in line["spans"]:
+                    sizes[round(span["size"], 1)] += len(span["text"])
+        return sizes.most_common(1)[0][0] if sizes else None
+
+    @staticmethod
+    def _page_heading(lines: List[dict], body_size: float) -> Optional[str]:
+        """
+        The page's first line if it is short and at least
+        _HEADING_SIZE_RATIO times `body_size`, else None.
+        """
+        spans = [
+            [span for span in line["spans"] if span["text"].strip()]
+            for line in sorted(lines, key=lambda line: (line["bbox"][1], line["bbox"][0]))
+        ]
+        first = next((line for line in spans if line), None)
+        if not first:
+            return None
+        title = "".join(span["text"] for span in first).strip()
+        size = max(span["size"] for span in first)
+        if size >= body_size * _HEADING_SIZE_RATIO and len(title) <= _HEADING_MAX_CHARS:
+            return title
+        return None
+
+    def _streams_pages(self, include_summary: bool, conversion_mode: str, checkpoint: JobCheckpoint) -> bool:
+        """
+        Whether this run streams pages into synthesis. Only plain full
+        conversions qualify, since the LLM modes need the whole text first; a
+        continuation streams only if an earlier slice stopped mid-PDF.
+        """
+        mode = str(getattr(conversion_mode, "value", conversion_mode)).lower()
+        if not settings.STREAMING_PIPELINE_ENABLED or mode != "full" or include_summary:
+            return False
+        return checkpoint.text is None and (
+            checkpoint.chunks is None or checkpoint.pages_done is not None
+        )
+
+    def _open_page_stream(
+        self,
+        pdf_path: str,
+        progress_callback: Optional[Callable[[int], None]],
+        cancel_check: Optional[Callable[[], bool]],
+        timings: StageTimings,
+        checkpoint: JobCheckpoint,
+    ) -> _PageChunkStream:
+        if checkpoint.chunks is None:
+            checkpoint.chunks = []
+            checkpoint.sections = [section(TEXT, None, 0)]
+            checkpoint.pages_done = 0
+            checkpoint.pending_text = ""
+            if progress_callback:
+                progress_callback(5)
+        else:
+            logger.info(
+                f"Resuming streamed extraction at page {checkpoint.pages_done + 1}, "
+                f"{len(checkpoint.completed)}/{len(checkpoint.chunks)} chunks synthesized"
+            )
+        with timings.stage("extract"):
+            chapter_starts, body_size = self._chapter_plan(pdf_path)
+        pages = self._stream_pages(
+            pdf_path, checkpoint.pages_done, cancel_check, timings, chapter_starts, body_size
+        )
+        return _PageChunkStream(
+            pages, checkpoint, self._split_complete_chunks, timings,
+            settings.STREAMING_QUEUE_CHUNKS, chapter_starts,
+        )
+
+    def _prepare_chunks(
+        self,
+        include_summary: bool,
+        conversion_mode: str,
+        progress_callback: Optional[Callable[[int], None]],
+        cancel_check: Optional[Callable[[], bool]],
+        timings: StageTimings,
+        checkpoint: JobCheckpoint,
+    ) -> int:
+        """
+        Run the LLM step on `checkpoint.segments` and chunk the result,
+        storing the chunks and their sections on `checkpoint` in place of the
+        text. Returns the tokens used.
+        """
+        segments = checkpoint.segments or [Segment(TEXT, checkpoint.text)]
+        with timings.stage("llm") as stage:
+            segments, tokens_used = self._get_final_text(
+                segments, include_summary, conversion_mode, progress_callback, cancel_check
+            )
+            stage["bytes"] = sum(len(segment) for segment in segments)
+
+        if progress_callback:
+            progress_callback(35)
+
+        # Smart chunking for TTS safety (Google has 5000 char limit)
+        with timings.stage("chunking") as stage:
+            checkpoint.chunks, checkpoint.sections = self._chunk_segments(segments)
+            stage["bytes"] = sum(len(chunk.encode("utf-8")) for chunk in checkpoint.chunks)
+        checkpoint.text, checkpoint.segments = None, None
+
+        return tokens_used
+
+    def _synthesize_chunks(
+        self,
+        routes: List[Tuple[str, str]],
+        chunks: Iterable[str],
+        reading_speed: float,
+        work_dir: str,
+        progress_callback: Optional[Callable[[int], None]],
+        cancel_check: Optional[Callable[[], bool]],
+        timings: StageTimings,
+        checkpoint: Optional[JobCheckpoint] = None,
+    ) -> List[str]:
+        """
+        Synthesize chunks one at a time, writing each to `chunk_{i}.mp3` in
+        `work_dir`. `routes` are (provider, voice) pairs in preference order;
+        each chunk goes to the first whose circuit is closed and falls through
+        to the next one if that request fails; a section with its own voice
+        replaces the first route's voice for its chunks. Chunks already in
+        `checkpoint.completed` are skipped; past its deadline the run stops
+        with CheckpointReached. `chunks` may be a page stream, read as it fills.
+        """
+        import time
+
+        checkpoint = checkpoint or JobCheckpoint()
+        chunk_files = []
+        for i, chunk in enumerate(chunks):
+            chunk_path = os.path.join(work_dir, CHUNK_FILENAME.format(i))
+            chunk_files.append(chunk_path)
+            if i in checkpoint.completed:
+                continue
+
+            # Stop before spending another provider call on a cancelled job
+            _raise_if_cancelled(cancel_check)
+            if checkpoint.expired():
+                raise CheckpointReached(len(checkpoint.completed), _chunk_total(chunks))
+
+            total = _chunk_total(chunks)
+            progress = 40 + int((i / total) * 55)
+            logger.info(f"Processing chunk {i+1}/{total} - Progress: {progress}%")
+            if progress_callback:
+                progress_callback(progress)
+
+            with timings.stage("tts") as stage:
+                last_error = None
+                for provider_name, voice in self.tts_manager.available_routes(
+                    _chunk_routes(routes, checkpoint.sections, i)
+                ):
+                    breaker = self.tts_manager.breaker(provider_name)
+                    started = time.perf_counter()
+                    try:
+                        tts_provider = self.tts_manager.get_provider(provider_name)
+                        # Audio is streamed into the chunk file as it arrives
+                        with open(chunk_path, "wb") as f:
+                            stage["bytes"] = tts_provider.text_to_file(
+                                chunk, voice, reading_speed, f
+                            )
+                    except Exception as e:
+                        if isinstance(e, JobCancelledError) or _is_soft_time_limit(e):
+                            # Not the provider's failure: stop the run instead of failing over
+                            raise
+                        breaker.record_failure()
+                        record_tts_error(provider_name)
+                        logger.warning(f"TTS provider '{provider_name}' failed on chunk {i+1}: {e}")
+                        last_error = e
+                        continue
+                    breaker.record_success()
+                    elapsed = time.perf_counter() - started
+                    latency_tracker.record(provider_name, elapsed)
+                    timings.record_tts_chunk(elapsed, len(chunk), provider_name)
+                    observe_tts_request(provider_name, elapsed, len(chunk))
+                    break
+                else:
+                    raise last_error or TTSUnavailableError(routes)
+            checkpoint.chunk_done(i, provider_name, voice, len(chunk))
+
+            # Add a small delay to prevent overloading the local TTS server (which caused a crash)
+            time.sleep(1.0)
 
-    def _get_final_text(self, cleaned_text, include_summary, conversion_mode, progress_callback) -> tuple[str, int]:
+        return chunk_files
+
+    def _synthesize_chunks_async(
+        self,
+        routes: List[Tuple[str, str]],
+        chunks: Iterable[str],
+        reading_speed: float,
+        work_dir: str,
+        progress_callback: Optional[Callable[[int], None]],
+        cancel_check: Optional[Callable[[], bool]],
+        timings: StageTimings,
+        checkpoint: Optional[JobCheckpoint] = None,
+    ) -> List[str]:
+        """
+        Synthesize chunks concurrently on an event loop, at most
+        TTS_ASYNC_CONCURRENCY requests in flight, with the same per-chunk
+        failover and checkpointing as `_synthesize_chunks`. The whole run is
+        timed as one "tts" stage; per-chunk latencies are still recorded.
+        """
+        with timings.stage("tts") as stage:
+            chunk_files = asyncio.run(
+                self._schedule_chunks(
+                    routes, chunks, reading_speed,
+                    work_dir, progress_callback, cancel_check, timings,
+                    checkpoint or JobCheckpoint(),
+                )
+            )
+            stage["bytes"] = sum(os.path.getsize(path) for path in chunk_files)
+        return chunk_files
+
+    async def _schedule_chunks(
+        self,
+        routes: List[Tuple[str, str]],
+        chunks: Iterable[str],
+        reading_speed: float,
+        work_dir: str,
+        progress_callback: Optional[Callable[[int], None]],
+        cancel_check: Optional[Callable[[], bool]],
+        timings: StageTimings,
+        checkpoint: JobCheckpoint,
+    ) -> List[str]:
+        import time
+
+        semaphore = asyncio.Semaphore(max(1, settings.TTS_ASYNC_CONCURRENCY))
+        # One hedging budget for the job, whichever providers serve its chunks
+        budgets: List[HedgeBudget] = []
+        used_providers: Dict[str, TTSProvider] = {}
+        completed = len(checkpoint.completed)
+
+        def job_budget() -> Optional[HedgeBudget]:
+            if not settings.TTS_HEDGE_ENABLED:
+                return None
+            # Sized on first use, once a streamed document's chunk estimate has a page behind it
+            if not budgets:
+                budgets.append(HedgeBudget(_chunk_total(chunks)))
+            return budgets[0]
+
+        async def synthesize_with(
+            provider_name: str, tts_provider: TTSProvider, voice: str, chunk: str, chunk_path: str
+        ) -> None:
+            budget = job_budget()
+
+            async def attempt(n: int) -> str:
+                # Each attempt streams into its own file; the winner is renamed into place
+                path = chunk_path if budget is None else f"{chunk_path}.{n}.part"
+                attempt_started = time.perf_counter()
+                try:
+                    with open(path, "wb") as f:
+                        await tts_provider.async_text_to_file(chunk, voice, reading_speed, f)
+                except BaseException:
+                    if budget is not None and os.path.exists(path):
+                        os.remove(path)
+                    raise
+                latency_tracker.record(provider_name, time.perf_counter() - attempt_started)
+                return path
+
+            winner = await hedged(attempt, budget, provider_name)
+            if winner != chunk_path:
+                os.replace(winner, chunk_path)
+                for n in (0, 1):
+                    loser = f"{chunk_path}.{n}.part"
+                    if os.path.exists(loser):
+                        os.remove(loser)
+
+        async def synthesize(i: int, chunk: str) -> Optional[str]:
+            nonlocal completed
+            chunk_path = os.path.join(work_dir, CHUNK_FILENAME.format(i))
+            if i in checkpoint.completed:
+                return chunk_path
+
+            async with semaphore:
+                _raise_if_cancelled(cancel_check)
+                # Past the deadline no new chunk starts; those in flight finish
+                if checkpoint.expired():
+                    return None
+                last_error = None
+                for provider_name, voice in self.tts_manager.available_routes(
+                    _chunk_routes(routes, checkpoint.sections, i)
+                ):
+                    breaker = self.tts_manager.breaker(provider_name)
+                    started = time.perf_counter()
+                    try:
+                        tts_provider = self.tts_manager.get_provider(provider_name)
+                        used_providers[provider_name] = tts_provider
+                        await synthesize_with(provider_name, tts_provider, voice, chunk, chunk_path)
+                    except Exception as e:
+                        if isinstance(e, JobCancelledError) or _is_soft_time_limit(e):
+                            # Not the provider's failure: stop the run instead of failing over
+                            raise
+                        breaker.record_failure()
+                        record_tts_error(provider_name)
+                        logger.warning(f"TTS provider '{provider_name}' failed on chunk {i+1}: {e}")
+                        last_error = e
+                        continue
+                    breaker.record_success()
+                    elapsed = time.perf_counter() - started
+                    timings.record_tts_chunk(elapsed, len(chunk), provider_name)
+                    observe_tts_request(provider_name, elapsed, len(chunk))
+                    break
+                else:
+                    raise last_error or TTSUnavailableError(routes)
+            checkpoint.chunk_done(i, provider_name, voice, len(chunk))
+
+            completed += 1
+            if progress_callback:
+                progress_callback(40 + int((completed / _chunk_total(chunks)) * 55))
+            return chunk_path
+
+        tasks: List[asyncio.Task] = []
+        try:
+            if isinstance(chunks, _PageChunkStream):
+                await self._feed_stream(chunks, synthesize, tasks, checkpoint)
+            else:
+                tasks.extend(asyncio.create_task(synthesize(i, chunk)) for i, chunk in enumerate(chunks))
+            # Results keep chunk order regardless of completion order
+            chunk_files = list(await asyncio.gather(*tasks))
+            if None in chunk_files or not getattr(chunks, "exhausted", True):
+                raise CheckpointReached(len(checkpoint.completed), _chunk_total(chunks))
+            return chunk_files
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            for tts_provider in used_providers.values():
+                await tts_provider.aclose()
+            for budget in budgets:
+                for provider_name, sent in budget.sent.items():
+                    timings.record_tts_hedges(sent, budget.won[provider_name])
+                    record_tts_hedges(provider_name, sent, budget.won[provider_name])
+
+    async def _feed_stream(
+        self,
+        stream: _PageChunkStream,
+        synthesize: Callable[[int, str], Awaitable[Optional[str]]],
+        tasks: List[asyncio.Task],
+        checkpoint: JobCheckpoint,
+    ) -> None:
+        """
+        Start a synthesis task per chunk as the stream produces them, keeping
+        at most twice TTS_ASYNC_CONCURRENCY unfinished so chunks wait in the
+        stream's bounded queue rather than as tasks. Stops taking chunks at
+        the deadline or once a chunk has failed.
+        """
+        window = asyncio.Semaphore(2 * max(1, settings.TTS_ASYNC_CONCURRENCY))
+        failed = False
+
+        def on_done(task: asyncio.Task) -> None:
+            nonlocal failed
+            window.release()
+            if not task.cancelled() and task.exception() is not None:
+                failed = True
+
+        iterator = iter(stream)
+        for i in itertools.count():
+            await window.acquire()
+            if failed or checkpoint.expired():
+                return
+            # The next chunk may still be being read; wait for it off the loop
+            chunk = await _run_blocking(next, iterator, None)
+            if chunk is None:
+                return
+            task = asyncio.create_task(synthesize(i, chunk))
+            task.add_done_callback(on_done)
+            tasks.append(task)
+
+    def _get_final_text(
+        self,
+        segments: List[Segment],
+        include_summary: bool,
+        conversion_mode: str,
+        progress_callback: Optional[Callable[[int], None]],
+        cancel_check: Optional[Callable[[], bool]] = None,
+    ) -> Tuple[List[Segment], int]:
+        """
+        The segments to read for `conversion_mode`: the LLM's summary or
+        explanation in place of the text, or put in front of it. The text's
+        own segments are reused as they are, so its chapters are kept.
+        Returns the segments and the tokens used.
+        """
         from loguru import logger
-        mode = str(conversion_mode).lower()
+        mode = str(getattr(conversion_mode, "value", conversion_mode)).lower()
         logger.info(f"🔍 Determining final text for mode: '{mode}' (original: '{conversion_mode}')")
         
         tokens = 0
@@ -356,15 +1542,15 @@ class PDFToAudioPipeline:
         if mode == "summary":
             if progress_callback:
                 progress_callback(25)
-            content, t = self._generate_summary(cleaned_text)
+            content, t = self._generate_summary(source_text(segments), cancel_check)
             tokens += t
-            return content, tokens
+            return [Segment(SUMMARY, content, title="Summary")], tokens
         elif mode in ["explanation", "summary_explanation"]:
             if progress_callback:
                 progress_callback(25)
-            content, t = self._generate_concept_explanation(cleaned_text)
+            content, t = self._generate_concept_explanation(source_text(segments), cancel_check)
             tokens += t
-            return content, tokens
+            return [Segment(EXPLANATION, content, title="Concept Explanation")], tokens
         
         # Custom logic for "Full + Explanation" mode or standard Full
         if mode == "full_explanation":
@@ -372,49 +1558,42 @@ class PDFToAudioPipeline:
                 progress_callback(25)
             
             # Generate explanation
-            explanation, t = self._generate_concept_explanation(cleaned_text)
+            cleaned_text = source_text(segments)
+            explanation, t = self._generate_concept_explanation(cleaned_text, cancel_check)
             tokens += t
             
-            final_content = f"Concept Explanation:\n{explanation}\n\nFull Text:\n{cleaned_text}"
+            final_segments = [
+                Segment(EXPLANATION, explanation, title="Concept Explanation", intro="Concept Explanation:\n"),
+                segments[0].with_intro("Full Text:\n"),
+            ] + segments[1:]
 
             # Check if summary is ALSO requested
             if include_summary:
-                summary, t2 = self._generate_summary(cleaned_text)
+                summary, t2 = self._generate_summary(cleaned_text, cancel_check)
                 tokens += t2
-                final_content = f"Summary:\n{summary}\n\n{final_content}"
+                final_segments.insert(0, Segment(SUMMARY, summary, title="Summary", intro="Summary:\n"))
            
-            return final_content, tokens
+            return final_segments, tokens
 
         if include_summary:
             if progress_callback:
                 progress_callback(25)
-            summary, t = self._generate_summary(cleaned_text)
+            summary, t = self._generate_summary(source_text(segments), cancel_check)
             tokens += t
-            return f"Summary of the document: {summary}\n\n{cleaned_text}", tokens
+            return [Segment(SUMMARY, summary, title="Summary", intro="Summary of the document: ")] + segments, tokens
             
-        return cleaned_text, tokens
-
-    def _calculate_cost(self, provider: str, voice_type: str, text: str, tokens_used: int = 0) -> float:
-        char_count = len(text)
-        cost = 0.0
+        return segments, tokens
+
+    def _calculate_cost(self, served_chars: Dict[Tuple[str, str], int], tokens_used: int = 0) -> float:
+        """Cost of the characters each (provider, voice) route synthesized, plus the LLM tokens."""
+        cost = sum(
+            (
+                self._tts_cost(provider, voice_type, char_count)
+                for (provider, voice_type), char_count in served_chars.items()
+            ),
+            0.0,
+        )
 
-        # TTS Cost
-        if provider == "google":
-            if "premium" in voice_type.lower():
-                cost = (char_count / 1_000_000) * settings.GOOGLE_TTS_COST_PREMIUM
-            else:
-                cost = (char_count / 1_000_000) * settings.GOOGLE_TTS_COST_STANDARD
-        elif provider == "openai":
-            # Check if using local OpenAI-compatible endpoint (e.g. Kokoro)
-            base_url = os.getenv("OPENAI_BASE_URL", "").lower()
-            api_key = os.getenv("OPENAI_API_KEY", "")
-            
-            if "localhost" in base_url or "0.0.0.0" in base_url or api_key == "not-needed":
-                cost = 0.0
-            else:
-                # Actual OpenAI is flat $15 per 1M characters for tts-1
-                cost = (char_count / 1_000_000) * 15.0
-        
         # LLM Cost (Approximate using average of input/output rates)
         if tokens_used > 0:
             avg_llm_rate = (settings.LLM_COST_INPUT_PER_1K + settings.LLM_COST_OUTPUT_PER_1K) / 2
@@ -423,25 +1602,119 @@ class PDFToAudioPipeline:
         
         return round(cost, 6)
 
-    def _extract_text(self, pdf_path: str) -> str:
+    def _tts_cost(self, provider: str, voice_type: str, char_count: int) -> float:
+        if provider == "google":
+            if "premium" in voice_type.lower():
+                return (char_count / 1_000_000) * settings.GOOGLE_TTS_COST_PREMIUM
+            return (char_count / 1_000_000) * settings.GOOGLE_TTS_COST_STANDARD
+        if provider == "openai":
+            # Check if using local OpenAI-compatible endpoint (e.g. Kokoro)
+            base_url = os.getenv("OPENAI_BASE_URL", "").lower()
+            api_key = os.getenv("OPENAI_API_KEY", "")
+
+            if "localhost" in base_url or "0.0.0.0" in base_url or api_key == "not-needed":
+                return 0.0
+            # Actual OpenAI is flat $15 per 1M characters for tts-1
+            return (char_count / 1_000_000) * 15.0
+        return 0.0
+
+    def _extract_text(
+        self,
+        pdf_path: str,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        timings: Optional[StageTimings] = None,
+    ) -> str:
+        import fitz  # PyMuPDF
+
+        timings = timings or StageTimings()
         text = ""
         try:
-            with fitz.open(pdf_path) as doc:
-                for page in doc:
-                    text += page.get_text()
+            with timings.stage("extract") as stage:
+                with fitz.open(pdf_path) as doc:
+                    for page in doc:
+                        text += page.get_text()
+                stage["bytes"] = len(text.encode("utf-8"))
             if len(text.strip()) < 100:  # Threshold for considering OCR
-                return self._ocr_pdf(pdf_path)
+                return self._ocr_pdf_timed(pdf_path, cancel_check, timings)
             return text
+        except JobCancelledError:
+            raise
         except Exception:
-            return self._ocr_pdf(pdf_path)
+            return self._ocr_pdf_timed(pdf_path, cancel_check, timings)
+
+    def _ocr_pdf_timed(self, pdf_path: str, cancel_check, timings: StageTimings) -> str:
+        with timings.stage("ocr") as stage:
+            text = self._ocr_pdf(pdf_path, cancel_check)
+            stage["bytes"] = len(text.encode("utf-8"))
+        return text
+
+    def _ocr_pdf(self, pdf_path: str, cancel_check: Optional[Callable[[], bool]] = None) -> str:
+        from pdf2image import convert_from_path
+        import pytesseract
 
-    def _ocr_pdf(self, pdf_path: str) -> str:
         text = ""
         try:
             images = convert_from_path(pdf_path, dpi=300)
             for image in images:
+                _raise_if_cancelled(cancel_check)
                 text += pytesseract.image_to_string(image, lang="eng") + "\n"
             return text
+        except JobCancelledError:
+            raise
+        except Exception as e:
+            raise Exception(f"OCR extraction failed: {str(e)}")
+
+    def _stream_pages(
+        self,
+        pdf_path: str,
+        start_page: int = 0,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        timings: Optional[StageTimings] = None,
+        chapter_starts: Optional[Dict[int, str]] = None,
+        body_size: Optional[float] = None,
+    ) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield (index, page_count, cleaned_text) for each page from
+        `start_page` on. Unlike `_extract_text`, OCR is decided per page, so
+        a scanned page in an otherwise digital PDF is still read. Given a
+        `body_size`, a page that opens with a heading is added to
+        `chapter_starts` before it is yielded.
+        """
+        import fitz  # PyMuPDF
+
+        timings = timings or StageTimings()
+        with fitz.open(pdf_path) as doc:
+            for index in range(start_page, doc.page_count):
+                _raise_if_cancelled(cancel_check)
+                page = doc[index]
+                with timings.stage("extract") as stage:
+                    if body_size is None:
+                        text = page.get_text()
+                    else:
+                        lines = _text_lines(page)
+                        text = "\n".join("".join(span["text"] for span in line["spans"]) for line in lines)
+                        heading = self._page_heading(lines, body_size)
+                        if heading:
+                            chapter_starts[index] = heading
+                    stage["bytes"] = len(text.encode("utf-8"))
+                if len(text.strip()) < _OCR_PAGE_MIN_CHARS:
+                    with timings.stage("ocr") as stage:
+                        text = self._ocr_page(page)
+                        stage["bytes"] = len(text.encode("utf-8"))
+                with timings.stage("cleanup") as stage:
+                    text = self._advanced_text_cleanup(text)
+                    stage["bytes"] = len(text.encode("utf-8"))
+                yield index, doc.page_count, text
+
+    def _ocr_page(self, page) -> str:
+        """OCR one PyMuPDF page, rendered at the same 300 dpi as `_ocr_pdf`."""
+        from PIL import Image
+        import pytesseract
+
+        try:
+            pixmap = page.get_pixmap(dpi=300)
+            image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+            return pytesseract.image_to_string(image, lang="eng") + "\n"
         except Exception as e:
             raise Exception(f"OCR extraction failed: {str(e)}")
 
@@ -466,7 +1739,7 @@ class PDFToAudioPipeline:
         text = re.sub(r"\s{2,}", " ", text)
         return text.strip()
 
-    def _generate_summary(self, text: str) -> tuple[str, int]:
+    def _generate_summary(self, text: str, cancel_check: Optional[Callable[[], bool]] = None) -> tuple[str, int]:
         """Generate a concise summary of the text."""
         from loguru import logger
         try:
@@ -481,17 +1754,20 @@ class PDFToAudioPipeline:
                 system_prompt=system_prompt,
                 user_content=user_content,
                 max_tokens=1000,
-                temperature=0.3
+                temperature=0.3,
+                cancel_check=cancel_check,
             )
             logger.info(f"✅ Summary generated: {len(summary)} chars, {tokens} tokens")
             return summary, tokens
+        except JobCancelledError:
+            raise
         except Exception as e:
             logger.warning(f"⚠️ Summary generation error: {e}")
             if "api_key" in str(e).lower() or "401" in str(e):
                 logger.error("❌ CRITICAL: LLM API key is missing or invalid. Check your environment variables.")
             return text[:500] + "...", 0
 
-    def _generate_concept_explanation(self, text: str) -> tuple[str, int]:
+    def _generate_concept_explanation(self, text: str, cancel_check: Optional[Callable[[], bool]] = None) -> tuple[str, int]:
         """Generate a comprehensive explanation of core concepts from the text."""
         from loguru import logger
         try:
@@ -509,10 +1785,13 @@ class PDFToAudioPipeline:
                 system_prompt=system_prompt,
                 user_content=user_content,
                 max_tokens=4000,
-                temperature=0.2
+                temperature=0.2,
+                cancel_check=cancel_check,
             )
             logger.info(f"✅ Concept explanation generated: {len(explanation)} chars, {tokens} tokens")
             return explanation, tokens
+        except JobCancelledError:
+            raise
         except Exception as e:
             logger.warning(f"⚠️ Concept explanation error: {e}")
             if "api_key" in str(e).lower() or "401" in str(e):
@@ -520,9 +1799,10 @@ class PDFToAudioPipeline:
             # Fallback: generate a basic summary-style explanation
             return f"This document explores key concepts and ideas. {text[:1000]}... The main themes and conclusions are presented in a structured format suitable for understanding the core content.", 0
 
-    def _call_llm_with_retry(self, system_prompt: str, user_content: str, max_tokens: int, temperature: float, max_retries: int = 2) -> tuple[str, int]:
+    def _call_llm_with_retry(self, system_prompt: str, user_content: str, max_tokens: int, temperature: float, max_retries: int = 2, cancel_check: Optional[Callable[[], bool]] = None) -> tuple[str, int]:
         """Call LLM with exponential backoff to handle rate limits."""
         import time
+        import openai
         from loguru import logger
         
         openrouter_key = settings.OPENROUTER_API_KEY
@@ -545,6 +1825,7 @@ class PDFToAudioPipeline:
 
         logger.info(f"🤖 Calling LLM ({model}) for {system_prompt[:50]}...")
         for i in range(max_retries):
+            _raise_if_cancelled(cancel_check)
             try:
                 response = client.chat.completions.create(
                     model=model,
@@ -591,55 +1872,82 @@ class PDFToAudioPipeline:
         if len(text) <= max_chars:
             return [text]
 
-        chunks = []
-        while text:
-            if len(text) <= max_chars:
-                chunks.append(text)
-                break
-
-            # Find the best split point within the max_chars limit
-            sub_text = text[:max_chars]
-            
-            # 1. Look for a sentence boundary within the last 500 chars of the limit
-            split_match = list(re.finditer(r'[.!?]\s+', sub_text))
-            if split_match:
-                split_point = split_match[-1].end()
-            else:
-                # 2. Look for ANY whitespace to avoid splitting words
-                split_match = list(re.finditer(r'\s+', sub_text))
-                if split_match:
-                    split_point = split_match[-1].end()
-                else:
-                    # 3. Hard cut if necessary
-                    split_point = max_chars
+        chunks, rest = self._split_complete_chunks(text, max_chars)
+        if rest:
+            chunks.append(rest)
+        return chunks
 
+    def _split_complete_chunks(self, text: str, max_chars: int = 4500) -> Tuple[List[str], str]:
+        """
+        Cut as many chunks off the front of `text` as `_chunk_text_for_tts`
+        would, leaving the last `max_chars` or fewer as the rest. Each cut
+        only looks at the next `max_chars` characters, so chunking text as it
+        grows (page by page) gives the same chunks as chunking it at once.
+        """
+        chunks = []
+        while len(text) > max_chars:
+            split_point = self._split_point(text[:max_chars])
             chunks.append(text[:split_point].strip())
             text = text[split_point:].strip()
-
-        return chunks
-
-    def _chapterize_text(self, text: str, min_chapter_length_sentences=20) -> List[str]:
-        # Legacy: keeping for backward compatibility if needed, but processing now uses _chunk_text_for_tts
-        sentences = re.split(r"(?<=[.!?])\s+", text)
+        return chunks, text
+
+    @staticmethod
+    def _split_point(sub_text: str) -> int:
+        # 1. Look for a sentence boundary within the limit
+        split_match = list(re.finditer(r'[.!?]\s+', sub_text))
+        if split_match:
+            return split_match[-1].end()
+        # 2. Look for ANY whitespace to avoid splitting words
+        split_match = list(re.finditer(r'\s+', sub_text))
+        if split_match:
+            return split_match[-1].end()
+        # 3. Hard cut if necessary
+        return len(sub_text)
+
+    def _chunk_segments(self, segments: List[Segment]) -> Tuple[List[str], List[dict]]:
+        """
+        Chunk each segment on its own, so no chunk spans two segments.
+        Returns the chunks and a section per segment that made any.
+        """
+        chunks: List[str] = []
+        sections = []
+        for segment in segments:
+            segment_chunks = self._chunk_text_for_tts(segment.text.strip())
+            if segment_chunks:
+                sections.append(section(segment.kind, segment.title, len(chunks), segment.voice))
+                chunks.extend(segment_chunks)
+        return chunks, sections
 
     def _assemble_audio_chapters(
-        self, chunk_files: List[str], work_dir: str
+        self, chunk_files: List[str], work_dir: str, chapters: Optional[List[dict]] = None
     ) -> str:
         """
         Assemble audio chapters using ffmpeg concat demuxer to avoid OOM.
-        Returns the path to the final assembled mp3 file.
+        Returns the path to the final assembled mp3 file. With `chapters`
+        ({"title", "first_chunk"}), each chapter's chunks are also joined into
+        CHAPTER_FILENAME in `work_dir`, numbered from 1.
         """
+        output_path = self._concat_audio(chunk_files, os.path.join(work_dir, "final_output.mp3"))
+
+        ends = [chapter["first_chunk"] for chapter in (chapters or [])[1:]] + [len(chunk_files)]
+        for number, (chapter, end) in enumerate(zip(chapters or [], ends), start=1):
+            self._concat_audio(
+                chunk_files[chapter["first_chunk"]:end],
+                os.path.join(work_dir, CHAPTER_FILENAME.format(number)),
+            )
+        return output_path
+
+    def _concat_audio(self, audio_files: List[str], output_path: str) -> str:
         import subprocess
-        
-        output_path = os.path.join(work_dir, "final_output.mp3")
-        list_file_path = os.path.join(work_dir, "file_list.txt")
+
+        list_file_path = f"{os.path.splitext(output_path)[0]}_list.txt"
 
         # Create ffmpeg concat list file
         with open(list_file_path, "w") as f:
-            for chunk_file in chunk_files:
+            for audio_file in audio_files:
                 # ffmpeg requires absolute paths or relative to list file. 
                 # Absolute is safest.
-                abs_path = os.path.abspath(chunk_file)
+                abs_path = os.path.abspath(audio_file)
                 # Escape single quotes in filename for ffmpeg
                 safe_path = abs_path.replace("'", "'\\''")
                 f.write(f"file '{safe_path}'\n")
@@ -673,4 +1981,3 @@ class PDFToAudioPipeline:
             # If it fails, capturing stderr is critical.
             stderr_output = e.stderr.decode() if e.stderr else "No stderr"
             raise Exception(f"FFmpeg assembly failed: {stderr_output}")
-
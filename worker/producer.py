@@ -0,0 +1,71 @@
+"""
+Producer-side helpers for enqueueing worker tasks.
+
+Tasks are sent by name through the Celery app, so importing this module only
+loads `celery_app` and never the PDF pipeline or TTS SDKs behind `worker.tasks`.
+The API uses this instead of importing the task functions directly.
+"""
+
+from .celery_app import (
+    celery_app,
+    PDF_QUEUE_TIERS,
+    DEFAULT_PDF_QUEUE_TIER,
+    PDF_CPU_QUEUE,
+    PDF_IO_QUEUE,
+)
+
+# celery_app puts backend/ on the path
+from app.core.config import settings  # noqa: E402
+
+PROCESS_PDF_TASK = "worker.tasks.process_pdf_task"
+EXTRACT_PDF_TASK = "worker.tasks.extract_pdf_task"
+
+
+def pdf_task_id(job_id: int) -> str:
+    """Deterministic Celery task id for a job, so it can be revoked by job id."""
+    return f"process_pdf-{job_id}"
+
+
+def size_tier_for_queue(queue: str) -> str:
+    """The size tier whose queue is `queue`, or the default tier."""
+    for name, tier in PDF_QUEUE_TIERS.items():
+        if tier["queue"] == queue:
+            return name
+    return DEFAULT_PDF_QUEUE_TIER
+
+
+def enqueue_pdf_processing(job_id: int, size_tier: str = DEFAULT_PDF_QUEUE_TIER, resume: bool = False):
+    """
+    Queue a job for conversion on its size tier's queue, with that tier's
+    time limits. With `resume`, the task continues from the job's saved
+    checkpoint. With WORKER_STAGE_QUEUES, a new job starts with the extract
+    task on the CPU queue and everything after it runs on the I/O queue.
+    Returns the Celery AsyncResult.
+    """
+    if size_tier not in PDF_QUEUE_TIERS:
+        size_tier = DEFAULT_PDF_QUEUE_TIER
+    tier = PDF_QUEUE_TIERS[size_tier]
+    task_name, queue = PROCESS_PDF_TASK, tier["queue"]
+    options = {"kwargs": {"resume": True}} if resume else {}
+    if settings.WORKER_STAGE_QUEUES:
+        # The stage queues do not identify the tier, so it travels with the task
+        task_name, queue = (PROCESS_PDF_TASK, PDF_IO_QUEUE) if resume else (EXTRACT_PDF_TASK, PDF_CPU_QUEUE)
+        options["kwargs"] = {**options.get("kwargs", {}), "size_tier": size_tier}
+    return celery_app.send_task(
+        task_name,
+        args=[job_id],
+        # Every stage and continuation keeps the id, so revoking the job still reaches it
+        task_id=pdf_task_id(job_id),
+        queue=queue,
+        soft_time_limit=tier["soft_time_limit"],
+        time_limit=tier["time_limit"],
+        **options,
+    )
+
+
+def revoke_pdf_processing(job_id: int) -> None:
+    """
+    Revoke the job's task if it is still queued or waiting on a retry countdown.
+    A task that is already running stops on its cancellation flag instead.
+    """
+    celery_app.control.revoke(pdf_task_id(job_id))
@@ -0,0 +1,112 @@
+"""
+Document segments.
+
+A document on its way to audio is a short list of segments rather than one
+string. Each segment is a kind (summary, explanation or the document text),
+a slice of a source string by offsets, and optionally a title, a spoken
+intro and its own voice. The extracted text is stored once and every
+chapter's segment points into it, so putting a summary or explanation in
+front adds a segment instead of copying the book, and where each part
+starts survives the LLM step.
+
+Chunking turns segments into sections: {"kind", "title", "voice",
+"first_chunk"} dicts that locate each segment's first TTS chunk. Sections
+pick the voice a chunk is read in and, when every one has a title, split the
+audio into per-chapter files.
+"""
+
+from typing import List, Optional
+
+SUMMARY = "summary"
+EXPLANATION = "explanation"
+TEXT = "text"
+
+
+class Segment:
+    """
+    `source[start:end]`, read after `intro`. `voice` overrides the job's
+    voice for the requested provider; None reads it in the job's voice.
+    """
+
+    __slots__ = ("kind", "source", "start", "end", "title", "intro", "voice")
+
+    def __init__(
+        self,
+        kind: str,
+        source: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        title: Optional[str] = None,
+        intro: str = "",
+        voice: Optional[str] = None,
+    ):
+        self.kind = kind
+        self.source = source
+        self.start = start
+        self.end = len(source) if end is None else end
+        self.title = title
+        self.intro = intro
+        self.voice = voice
+
+    @property
+    def text(self) -> str:
+        """The spoken text. A segment covering its whole source returns it uncopied."""
+        return self.intro + self.source[self.start:self.end]
+
+    def __len__(self) -> int:
+        return len(self.intro) + self.end - self.start
+
+    def with_intro(self, intro: str) -> "Segment":
+        return Segment(self.kind, self.source, self.start, self.end, self.title, intro, self.voice)
+
+    def to_dict(self) -> dict:
+        """JSON-ready form without the source, which is saved once for all segments."""
+        return {
+            "kind": self.kind, "start": self.start, "end": self.end,
+            "title": self.title, "intro": self.intro, "voice": self.voice,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, source: str) -> "Segment":
+        return cls(
+            data["kind"], source, data["start"], data["end"],
+            data.get("title"), data.get("intro") or "", data.get("voice"),
+        )
+
+
+def source_text(segments: List[Segment]) -> str:
+    """
+    The text the segments read, as one string for the LLM prompts. Segments
+    covering a single source in order are sliced from it, so the usual case
+    (the whole extracted text) is not copied.
+    """
+    if not segments:
+        return ""
+    first, last = segments[0], segments[-1]
+    if all(segment.source is first.source and not segment.intro for segment in segments):
+        return first.source[first.start:last.end]
+    return " ".join(segment.text for segment in segments)
+
+
+def section(kind: str, title: Optional[str], first_chunk: int, voice: Optional[str] = None) -> dict:
+    return {"kind": kind, "title": title, "voice": voice, "first_chunk": first_chunk}
+
+
+def section_at(sections: List[dict], index: int) -> Optional[dict]:
+    """The section holding chunk `index`, or None when there are no sections."""
+    found = None
+    for candidate in sections:
+        if candidate["first_chunk"] > index:
+            break
+        found = candidate
+    return found
+
+
+def chapter_sections(sections: List[dict]) -> List[dict]:
+    """
+    The sections that get their own audio file: all of them when there are
+    at least two and each has a title, otherwise none.
+    """
+    if len(sections) < 2 or any(not candidate["title"] for candidate in sections):
+        return []
+    return sections
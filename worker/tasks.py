@@ -1,10 +1,14 @@
 from celery import Celery
+from celery.signals import worker_init, worker_process_init
 from .celery_app import celery_app
 import os
 import sys
 import tempfile
+import time
 from typing import Optional
 
+from celery.exceptions import SoftTimeLimitExceeded
+
 # Add backend to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
 
@@ -12,11 +16,18 @@ from app.core.database import SessionLocal, engine
 from app.models import Job, JobStatus
 from app.services.storage import StorageService
 from app.services.job import JobService
+from app.services.progress import ProgressTracker
+from app.services.cancellation import cancellation_store
 from app.core.config import settings
 
 # Import PDF processing pipeline
 
-from .pdf_pipeline import PDFToAudioPipeline
+from .pdf_pipeline import PDFToAudioPipeline, JobCancelledError, set_tasks_per_process
+from .checkpoint import CHAPTER_FILENAME, CheckpointReached, JobCheckpoint
+from .segments import chapter_sections
+from .producer import DEFAULT_PDF_QUEUE_TIER, enqueue_pdf_processing, size_tier_for_queue
+from .timings import StageTimings
+from .metrics import observe_timings
 
 pipeline = PDFToAudioPipeline()
 
@@ -36,34 +47,203 @@ for var in voice_vars:
     logger.info(f"  {var} = '{val}'")
 
 
+def _tasks_per_process(worker) -> int:
+    """Each prefork child runs one task at a time; a threads or green pool runs all of them in one process."""
+    pool = getattr(worker, "pool_cls", None)
+    name = pool if isinstance(pool, str) else getattr(pool, "__module__", "")
+    if any(kind in str(name) for kind in ("thread", "gevent", "eventlet")):
+        return getattr(worker, "concurrency", None) or 1
+    return 1
+
+
+@worker_init.connect
+def preload_provider_sdks(sender=None, **kwargs):
+    """Import the configured providers' SDKs once in the parent, before the pool forks."""
+    set_tasks_per_process(_tasks_per_process(sender))
+    pipeline.tts_manager.preload(settings.WORKER_WARM_TTS_PROVIDERS)
+
+
+@worker_process_init.connect
+def warm_worker_process(**kwargs):
+    """
+    Build fresh clients in each pool child right after fork.
+    Connections inherited from the parent (DB pool, gRPC channels) are not
+    fork-safe, so they are discarded rather than reused.
+    """
+    if engine is not None:
+        engine.dispose(close=False)
+    pipeline.tts_manager.reset()
+    pipeline.tts_manager.warm_up(settings.WORKER_WARM_TTS_PROVIDERS)
+
+
+def _slice_deadline(task, started: float) -> Optional[float]:
+    """
+    When this run should stop and checkpoint: its soft time limit minus
+    TASK_CHECKPOINT_MARGIN_SECONDS for saving, but never before half the slice.
+    """
+    soft_limit = (task.request.timelimit or (None, None))[1] or task.soft_time_limit
+    soft_limit = soft_limit or celery_app.conf.task_soft_time_limit
+    if not soft_limit:
+        return None
+    return started + max(soft_limit / 2, soft_limit - settings.TASK_CHECKPOINT_MARGIN_SECONDS)
+
+
+def _download_pdf(storage_service: StorageService, job: Job, work_dir: str, timings: StageTimings) -> str:
+    with timings.stage("download") as stage:
+        pdf_data = storage_service.download_file(job.pdf_s3_key)
+        stage["bytes"] = len(pdf_data)
+
+    pdf_path = os.path.join(work_dir, "input.pdf")
+    with open(pdf_path, "wb") as pdf_file:
+        pdf_file.write(pdf_data)
+    return pdf_path
+
+
+def _job_timings(timings: StageTimings, checkpoint: Optional[JobCheckpoint]) -> StageTimings:
+    """This slice's timings plus those of the job's earlier slices, as stored on the job."""
+    return timings.merged(checkpoint.timings if checkpoint is not None else None)
+
+
+def _save_checkpoint(
+    checkpoint: JobCheckpoint, storage_service: StorageService, work_dir: str, timings: StageTimings
+) -> None:
+    checkpoint.timings = _job_timings(timings, checkpoint).state()
+    checkpoint.save(storage_service, work_dir)
+
+
 @celery_app.task(bind=True)
-def process_pdf_task(self, job_id: int):
+def extract_pdf_task(self, job_id: int, size_tier: Optional[str] = None):
     """
-    Process a PDF file and convert it to audio
+    CPU stage of a split run (WORKER_STAGE_QUEUES): download the PDF,
+    extract and clean its text, save the text as the job's checkpoint and
+    hand the rest of the job to process_pdf_task on the I/O queue.
     """
     db = SessionLocal()
     storage_service = StorageService()
     job_service = JobService(db)
+    progress_tracker = ProgressTracker(job_service, job_id)
+    timings = StageTimings()
+    handed_off = False
+
+    try:
+        logger.info(f"Starting text extraction for job {job_id}")
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise ValueError(f"Job {job_id} not found")
+
+        if job.status == JobStatus.cancelled or cancellation_store.is_requested(job_id):
+            logger.info(f"Job {job_id} was cancelled before processing started")
+            return {"status": "cancelled", "job_id": job_id}
+
+        job_service.update_job_status(job_id, JobStatus.processing, 0)
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            pdf_path = _download_pdf(storage_service, job, work_dir, timings)
+
+            checkpoint = JobCheckpoint(job_id)
+            checkpoint.text, checkpoint.segments = pipeline.extract_clean_text(
+                pdf_path,
+                progress_callback=progress_tracker,
+                cancel_check=lambda: cancellation_store.is_requested(job_id),
+                timings=timings,
+            )
+            # The I/O stage adds these to its own timings when it loads the checkpoint
+            _save_checkpoint(checkpoint, storage_service, work_dir, timings)
+
+        enqueue_pdf_processing(job_id, size_tier or DEFAULT_PDF_QUEUE_TIER, resume=True)
+        handed_off = True
+        return {"status": "extracted", "job_id": job_id}
+
+    except JobCancelledError:
+        logger.info(f"Job {job_id} cancelled; stopped processing")
+        job_service.update_job_status(job_id, JobStatus.cancelled, timings=timings.as_dict())
+        return {"status": "cancelled", "job_id": job_id}
+
+    except (ValueError, SoftTimeLimitExceeded) as e:
+        error_message = (
+            "Text extraction did not finish within the task time limit."
+            if isinstance(e, SoftTimeLimitExceeded) else str(e)
+        )
+        logger.warning(f"Text extraction failed for job {job_id}: {error_message}")
+        job_service.update_job_status(
+            job_id, JobStatus.failed, error_message=error_message, timings=timings.as_dict()
+        )
+
+    except Exception as e:
+        logger.error(f"System error extracting job {job_id}: {e}", exc_info=True)
+        job_service.update_job_status(
+            job_id,
+            JobStatus.failed,
+            error_message=f"An unexpected error occurred: {str(e)}",
+            timings=timings.as_dict(),
+        )
+        raise self.retry(exc=e, countdown=60, max_retries=3)
+
+    finally:
+        progress_tracker.close(final=not handed_off)
+        if not handed_off:
+            cancellation_store.clear(job_id)
+        if timings.stages:
+            observe_timings(timings)
+        db.close()
+
+
+@celery_app.task(bind=True)
+def process_pdf_task(self, job_id: int, resume: bool = False, size_tier: Optional[str] = None):
+    """
+    Process a PDF file and convert it to audio.
+
+    The run is time-sliced: near its soft time limit (or when the limit
+    fires) it saves a checkpoint and queues a continuation with `resume`,
+    which picks up at the first chunk without audio. With split stage
+    queues it always starts from the extract task's checkpoint.
+    """
+    started = time.monotonic()
+    db = SessionLocal()
+    storage_service = StorageService()
+    job_service = JobService(db)
+    progress_tracker = ProgressTracker(job_service, job_id)
+    timings = StageTimings()
     pdf_path = None
     temp_dir = None
+    checkpoint = None
+    progress_before = None
+    checkpointed = False
 
     try:
-        logger.info(f"Starting PDF processing for job {job_id}")
+        logger.info(f"Starting PDF processing for job {job_id}" + (" (continuation)" if resume else ""))
         job = db.query(Job).filter(Job.id == job_id).first()
         if not job:
             raise ValueError(f"Job {job_id} not found")
 
-        job_service.update_job_status(job_id, JobStatus.processing, 0)
+        if job.status == JobStatus.cancelled or cancellation_store.is_requested(job_id):
+            logger.info(f"Job {job_id} was cancelled before processing started")
+            if resume:
+                JobCheckpoint.load(storage_service, job_id).delete(storage_service)
+            return {"status": "cancelled", "job_id": job_id}
 
         # Create a temporary directory for this specific job
         temp_dir = tempfile.TemporaryDirectory()
         work_dir = temp_dir.name
 
-        pdf_data = storage_service.download_file(job.pdf_s3_key)
-        
-        pdf_path = os.path.join(work_dir, "input.pdf")
-        with open(pdf_path, "wb") as pdf_file:
-            pdf_file.write(pdf_data)
+        deadline = _slice_deadline(self, started)
+        if resume:
+            with timings.stage("download") as stage:
+                checkpoint = JobCheckpoint.load(storage_service, job_id, work_dir, deadline)
+                stage["bytes"] = sum(
+                    os.path.getsize(os.path.join(work_dir, name)) for name in os.listdir(work_dir)
+                )
+            if checkpoint.pages_done is not None:
+                # A streamed slice stopped mid-PDF; the rest of the pages are read from it
+                pdf_path = _download_pdf(storage_service, job, work_dir, timings)
+            if job.status == JobStatus.failed:
+                # A retry after a system error, picking up from the failed run's checkpoint
+                job_service.update_job_status(job_id, JobStatus.processing)
+        else:
+            job_service.update_job_status(job_id, JobStatus.processing, 0)
+            checkpoint = JobCheckpoint(job_id, deadline)
+            pdf_path = _download_pdf(storage_service, job, work_dir, timings)
+        progress_before = checkpoint.progress_marker()
 
         # process_pdf now returns (file_path, cost, usage_stats) and uses work_dir
         audio_file_path, tts_cost, usage_stats = pipeline.process_pdf(
@@ -73,10 +253,12 @@ def process_pdf_task(self, job_id: int):
             reading_speed=float(job.reading_speed),
             include_summary=job.include_summary,
             conversion_mode=job.conversion_mode,
-            progress_callback=lambda progress: job_service.update_job_status(
-                job_id, JobStatus.processing, progress
-            ),
-            work_dir=work_dir
+            progress_callback=progress_tracker,
+            work_dir=work_dir,
+            cancel_check=lambda: cancellation_store.is_requested(job_id),
+            timings=timings,
+            tts_fallbacks=job.tts_fallbacks,
+            checkpoint=checkpoint,
         )
 
         # Calculate final cost (TTS + LLM)
@@ -87,12 +269,23 @@ def process_pdf_task(self, job_id: int):
         
         # Upload the audio file to S3
         audio_key = f"audio/{job.user_id}/{job.id}.mp3"
-        audio_url = storage_service.upload_large_file(
-            audio_file_path, audio_key, "audio/mpeg"
-        )
+        with timings.stage("upload") as stage:
+            audio_url = storage_service.upload_large_file(
+                audio_file_path, audio_key, "audio/mpeg"
+            )
+            if os.path.exists(audio_file_path):
+                stage["bytes"] = os.path.getsize(audio_file_path)
+            chapters = []
+            for number, chapter in enumerate(chapter_sections(checkpoint.sections), start=1):
+                chapter_path = os.path.join(work_dir, CHAPTER_FILENAME.format(number))
+                chapter_key = f"audio/{job.user_id}/{job.id}/" + CHAPTER_FILENAME.format(number)
+                storage_service.upload_large_file(chapter_path, chapter_key, "audio/mpeg")
+                stage["bytes"] += os.path.getsize(chapter_path)
+                chapters.append({"title": chapter["title"], "audio_s3_key": chapter_key})
         
         job.audio_s3_key = audio_key
         job.audio_s3_url = audio_url
+        job.chapters = chapters or None
         
         # job_service.deduct_credits(job.user_id, final_cost) # Removed credit system
         
@@ -102,28 +295,96 @@ def process_pdf_task(self, job_id: int):
             100, 
             estimated_cost=final_cost,
             chars_processed=usage_stats.get("chars", 0),
-            tokens_used=usage_stats.get("tokens", 0)
+            tokens_used=usage_stats.get("tokens", 0),
+            timings=_job_timings(timings, checkpoint).as_dict(),
         )
 
+        checkpoint.delete(storage_service)
+
         logger.info(f"Successfully processed job {job_id}")
         return {"status": "completed", "job_id": job_id, "audio_url": audio_url}
 
+    except (CheckpointReached, SoftTimeLimitExceeded) as e:
+        # The time slice is over: save what is done and continue in a new task
+        if checkpoint is None or checkpoint.chunks is None:
+            error_message = "Text processing did not finish within the task time limit."
+        elif progress_before is None or checkpoint.progress_marker() == progress_before:
+            # A slice that finishes no chunk and reads no page (or runs out while
+            # still downloading its inputs) would be continued forever
+            error_message = "The job made no progress within the task time limit."
+        else:
+            _save_checkpoint(checkpoint, storage_service, work_dir, timings)
+            queue = (self.request.delivery_info or {}).get("routing_key")
+            enqueue_pdf_processing(job_id, size_tier or size_tier_for_queue(queue), resume=True)
+            checkpointed = True
+            logger.info(
+                f"Job {job_id} checkpointed after slice {checkpoint.slices}: "
+                f"{len(checkpoint.completed)}/{len(checkpoint.chunks)} chunks synthesized"
+            )
+            return {
+                "status": "checkpointed",
+                "job_id": job_id,
+                "completed": len(checkpoint.completed),
+                "total": len(checkpoint.chunks),
+            }
+
+        logger.error(f"Job {job_id} ran out of time: {error_message} ({e!r})")
+        if checkpoint:
+            checkpoint.delete(storage_service)
+        job_service.update_job_status(
+            job_id, JobStatus.failed, error_message=error_message, timings=_job_timings(timings, checkpoint).as_dict()
+        )
+        return {"status": "failed", "job_id": job_id}
+
+    except JobCancelledError:
+        logger.info(f"Job {job_id} cancelled; stopped processing")
+        checkpoint.delete(storage_service)
+        job_service.update_job_status(job_id, JobStatus.cancelled, timings=_job_timings(timings, checkpoint).as_dict())
+        return {"status": "cancelled", "job_id": job_id}
+
     except ValueError as e:
         logger.warning(f"User error processing job {job_id}: {e}")
-        job_service.update_job_status(job_id, JobStatus.failed, error_message=str(e))
+        if checkpoint:
+            checkpoint.delete(storage_service)
+        job_service.update_job_status(
+            job_id, JobStatus.failed, error_message=str(e), timings=_job_timings(timings, checkpoint).as_dict()
+        )
         # Do not retry for user errors
 
     except Exception as e:
         logger.error(f"System error processing job {job_id}: {e}", exc_info=True)
         job_service.update_job_status(
-            job_id, JobStatus.failed, error_message=f"An unexpected error occurred: {str(e)}"
+            job_id,
+            JobStatus.failed,
+            error_message=f"An unexpected error occurred: {str(e)}",
+            timings=_job_timings(timings, checkpoint).as_dict(),
         )
-        # Retry for system errors
+        # Retry for system errors. Chunks (and so chapters) finished before the
+        # error are saved first, so the retry synthesizes only what is missing.
+        if checkpoint is not None and checkpoint.completed and self.request.retries < 3:
+            _save_checkpoint(checkpoint, storage_service, work_dir, timings)
+            checkpointed = True
+            raise self.retry(
+                exc=e, countdown=60, max_retries=3, kwargs=dict(self.request.kwargs or {}, resume=True)
+            )
+        if checkpoint is not None and self.request.retries >= 3:
+            checkpoint.delete(storage_service)
         raise self.retry(exc=e, countdown=60, max_retries=3)
 
     finally:
         # cleanup happens automatically when temp_dir object is garbage collected or explicitly cleaned
         # but explicit cleanup is good practice
+        progress_tracker.close(final=not checkpointed)
+        if not checkpointed:
+            cancellation_store.clear(job_id)
+        if timings.stages:
+            observe_timings(timings)
+            # One structured line per job, for log-based metrics
+            logger.bind(job_id=job_id, timings=_job_timings(timings, checkpoint).as_dict()).info(
+                f"Job {job_id} stage timings: "
+                + ", ".join(f"{name}={entry['wall_s']:.2f}s" for name, entry in timings.stages.items())
+            )
+
         if temp_dir:
             try:
                 temp_dir.cleanup()
@@ -151,30 +412,17 @@ def cleanup_old_files():
 
         cutoff_date = datetime.now() - timedelta(days=30)
 
-        old_jobs = (
-            db.query(Job)
-            .filter(Job.status == JobStatus.completed, Job.completed_at < cutoff_date)
-            .all()
+        job_service = JobService(db)
+        deleted = job_service.purge_jobs(
+            Job.status == JobStatus.completed, Job.completed_at < cutoff_date
         )
 
-        if not old_jobs:
+        if not deleted:
             logger.info("No old jobs to clean up.")
             return "No old jobs to clean up."
 
-        storage_service = StorageService()
-
-        for job in old_jobs:
-            logger.info(f"Deleting files for job {job.id}")
-            if job.pdf_s3_key:
-                storage_service.delete_file(job.pdf_s3_key)
-            if job.audio_s3_key:
-                storage_service.delete_file(job.audio_s3_key)
-
-            db.delete(job)
-
-        db.commit()
-        logger.info(f"Cleaned up {len(old_jobs)} old jobs.")
-        return f"Cleaned up {len(old_jobs)} old jobs"
+        logger.info(f"Cleaned up {deleted} old jobs.")
+        return f"Cleaned up {deleted} old jobs"
 
     except Exception as e:
         db.rollback()
@@ -0,0 +1,156 @@
+"""
+Per-stage timing for a single job.
+
+Each stage records wall time, CPU time (process-wide, so approximate when
+other threads are busy) and the size in bytes of what the stage produced.
+Per-chunk TTS latencies are kept separately and summarised, along with the
+time from the start of the job to its first synthesized chunk.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Canonical stage order, used when reporting
+STAGES = (
+    "download",
+    "extract",
+    "ocr",
+    "cleanup",
+    "llm",
+    "chunking",
+    "tts",
+    "assembly",
+    "upload",
+)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class StageTimings:
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.tts_latencies: List[float] = []
+        self.tts_chars = 0
+        self.tts_hedges_sent = 0
+        self.tts_hedges_won = 0
+        self.tts_providers: Dict[str, int] = {}
+        self.started = time.perf_counter()
+        self.first_chunk_s: Optional[float] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, int]]:
+        """
+        Time a block as `name`. Set `["bytes"]` on the yielded dict to record
+        the stage's output size. Repeated stages accumulate.
+        """
+        record = {"bytes": 0}
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            entry = self.stages.setdefault(
+                name, {"wall_s": 0.0, "cpu_s": 0.0, "bytes": 0, "count": 0}
+            )
+            entry["wall_s"] += time.perf_counter() - wall_start
+            entry["cpu_s"] += time.process_time() - cpu_start
+            entry["bytes"] += record["bytes"]
+            entry["count"] += 1
+
+    def record_tts_chunk(self, seconds: float, chars: int, provider: Optional[str] = None) -> None:
+        if self.first_chunk_s is None:
+            self.first_chunk_s = time.perf_counter() - self.started
+        self.tts_latencies.append(seconds)
+        self.tts_chars += chars
+        if provider is not None:
+            # Chunks served per provider; more than one key means failover happened
+            key = str(getattr(provider, "value", provider))
+            self.tts_providers[key] = self.tts_providers.get(key, 0) + 1
+
+    def record_tts_hedges(self, sent: int, won: int) -> None:
+        """Duplicate requests sent for slow chunks, and how many beat the original."""
+        self.tts_hedges_sent += sent
+        self.tts_hedges_won += won
+
+    def state(self) -> dict:
+        """Raw counters, for a time-sliced job to carry into its next slice (see `merged`)."""
+        return {
+            "stages": self.stages,
+            "tts_latencies": self.tts_latencies,
+            "tts_chars": self.tts_chars,
+            "tts_hedges_sent": self.tts_hedges_sent,
+            "tts_hedges_won": self.tts_hedges_won,
+            "tts_providers": self.tts_providers,
+            "first_chunk_s": self.first_chunk_s,
+        }
+
+    def merged(self, earlier: Optional[dict]) -> "StageTimings":
+        """
+        These timings added to the `state()` of the job's earlier slices, so
+        the job reports every stage it ran rather than only its last slice's.
+        """
+        if not earlier:
+            return self
+        combined = StageTimings()
+        combined.started = self.started
+        for state in (earlier, self.state()):
+            for name, entry in state.get("stages", {}).items():
+                target = combined.stages.setdefault(
+                    name, {"wall_s": 0.0, "cpu_s": 0.0, "bytes": 0, "count": 0}
+                )
+                for key in target:
+                    target[key] += entry.get(key, 0)
+            combined.tts_latencies += state.get("tts_latencies", [])
+            combined.tts_chars += state.get("tts_chars", 0)
+            combined.tts_hedges_sent += state.get("tts_hedges_sent", 0)
+            combined.tts_hedges_won += state.get("tts_hedges_won", 0)
+            for provider, count in state.get("tts_providers", {}).items():
+                combined.tts_providers[provider] = combined.tts_providers.get(provider, 0) + count
+
+        if earlier.get("first_chunk_s") is not None:
+            combined.first_chunk_s = earlier["first_chunk_s"]
+        elif self.first_chunk_s is not None:
+            # Offset by the time the earlier slices spent working
+            earlier_wall = sum(entry.get("wall_s", 0.0) for entry in earlier.get("stages", {}).values())
+            combined.first_chunk_s = earlier_wall + self.first_chunk_s
+        return combined
+
+    def as_dict(self) -> dict:
+        """JSON-serialisable summary, as stored in `jobs.timings`."""
+        stages = {
+            name: {
+                "wall_s": round(entry["wall_s"], 4),
+                "cpu_s": round(entry["cpu_s"], 4),
+                "bytes": int(entry["bytes"]),
+                "count": int(entry["count"]),
+            }
+            for name, entry in sorted(
+                self.stages.items(),
+                key=lambda item: STAGES.index(item[0]) if item[0] in STAGES else len(STAGES),
+            )
+        }
+
+        latencies = sorted(self.tts_latencies)
+        tts_wall = self.stages.get("tts", {}).get("wall_s", 0.0)
+        return {
+            "stages": stages,
+            "total_wall_s": round(sum(entry["wall_s"] for entry in self.stages.values()), 4),
+            "tts_chunks": {
+                "count": len(latencies),
+                "chars": self.tts_chars,
+                "p50_s": round(_percentile(latencies, 0.5), 4),
+                "p95_s": round(_percentile(latencies, 0.95), 4),
+                "max_s": round(latencies[-1], 4) if latencies else 0.0,
+                "first_chunk_s": round(self.first_chunk_s, 4) if self.first_chunk_s is not None else None,
+                "chars_per_s": round(self.tts_chars / tts_wall, 1) if tts_wall else 0.0,
+                "hedges_sent": self.tts_hedges_sent,
+                "hedges_won": self.tts_hedges_won,
+                "providers": dict(self.tts_providers),
+            },
+        }